@@ -1,31 +1,48 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List
+import asyncio
 import logging
+from utils.tracing import traced_process
 
 class BaseAgent(ABC):
     def __init__(self, name: str):
         self.name = name
         self.logger = logging.getLogger(name)
+    
+    def __init_subclass__(cls, **kwargs):
+        """하위 클래스가 정의한 process / process_async 는 호출마다 agent 지연 시간 히스토그램에 기록"""
+        super().__init_subclass__(**kwargs)
+        for method_name in ("process", "process_async"):
+            method = cls.__dict__.get(method_name)
+            if method is not None:
+                setattr(cls, method_name, traced_process(method))
         
     @abstractmethod
     def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """에이전트의 핵심 처리 로직"""
         pass
     
-    def log_info(self, message: str):
-        """정보 로그 출력"""
-        self.logger.info(f"[{self.name}] {message}")
-        print(f"[{self.name}] {message}")
+    async def process_async(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """비동기 처리 (기본: 동기 process 를 스레드에서 실행, 네이티브 구현은 재정의)"""
+        return await asyncio.to_thread(self.process, input_data)
+    
+    def log_debug(self, message: str, *args):
+        """디버그 로그 (레벨이 꺼져 있으면 args 포맷도 하지 않음)"""
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(message, *args, extra={"agent": self.name})
+    
+    def log_info(self, message: str, *args):
+        """정보 로그 (포맷과 출력은 utils.logger 의 리스너 스레드에서)"""
+        self.logger.info(message, *args, extra={"agent": self.name})
     
-    def log_error(self, message: str):
-        """에러 로그 출력"""
-        self.logger.error(f"[{self.name}] ERROR: {message}")
-        print(f"[{self.name}] ERROR: {message}")
+    def log_error(self, message: str, *args):
+        """에러 로그"""
+        self.logger.error(message, *args, extra={"agent": self.name})
     
     def validate_input(self, input_data: Dict[str, Any], required_keys: List[str]) -> bool:
         """입력 데이터 검증"""
         for key in required_keys:
             if key not in input_data:
-                self.log_error(f"Required key '{key}' not found in input data")
+                self.log_error("Required key '%s' not found in input data", key)
                 return False
         return True
\ No newline at end of file
@@ -0,0 +1,171 @@
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, List, Optional, Callable, Iterable, Tuple
+
+import numpy as np
+
+MARKET_AGGREGATES_FILE = os.getenv("MARKET_AGGREGATES_FILE", "market_aggregates.sqlite3")
+MARKETS = ("KOSPI", "KOSDAQ")
+ALL_MARKETS = "ALL"
+
+AGGREGATE_FIELDS = ("advancers", "decliners", "unchanged", "traded", "total_volume")
+
+
+def compute_daily_aggregates(quotes: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+    """하루치 종목 시세(market, change_rate, volume)로 시장별 집계 계산 (ALL 포함)"""
+    quotes = list(quotes)
+    markets = np.array([str(q.get("market") or "").upper() for q in quotes], dtype=object)
+    change_rates = np.array([float(q.get("change_rate") or 0) for q in quotes], dtype=np.float64)
+    volumes = np.array([int(q.get("volume") or 0) for q in quotes], dtype=np.int64)
+
+    def summarize(mask: np.ndarray) -> Dict[str, int]:
+        traded = mask & (volumes > 0)
+        return {
+            "advancers": int(np.count_nonzero(traded & (change_rates > 0))),
+            "decliners": int(np.count_nonzero(traded & (change_rates < 0))),
+            "unchanged": int(np.count_nonzero(traded & (change_rates == 0))),
+            "traded": int(np.count_nonzero(traded)),
+            "total_volume": int(volumes[mask].sum()),
+        }
+
+    aggregates = {market: summarize(markets == market) for market in MARKETS}
+    aggregates[ALL_MARKETS] = summarize(np.ones(len(quotes), dtype=bool))
+    return aggregates
+
+
+def _to_date(value) -> date:
+    return value if isinstance(value, date) else datetime.strptime(str(value), "%Y-%m-%d").date()
+
+
+def quotes_from_price_store(store, listings: Iterable[Tuple[str, str]], day) -> List[Dict[str, Any]]:
+    """PriceStore 일봉으로 하루치 시세 구성 (전 거래일 종가 대비 등락률, 그날 거래 없으면 제외)
+
+    listings: (ticker, market) 목록
+    """
+    day = _to_date(day)
+    key = day.year * 10000 + day.month * 100 + day.day
+    quotes = []
+    for ticker, market in listings:
+        rows = store.get_range(ticker, day - timedelta(days=14), day)
+        if len(rows) == 0 or int(rows["date"][-1]) != key:
+            continue
+        close = float(rows["close"][-1])
+        previous = float(rows["close"][-2]) if len(rows) > 1 else close
+        quotes.append({
+            "symbol": ticker,
+            "market": market,
+            "change_rate": (close - previous) / previous * 100 if previous else 0.0,
+            "volume": int(rows["volume"][-1]),
+        })
+    return quotes
+
+
+class MarketAggregateStore:
+    """거래일 × 시장별 집계 테이블 (상승/하락/보합/거래 종목 수, 거래량 합계)
+
+    (date, market) 기본키 조회라 시장 통계 질문은 원시 시세를 훑지 않고 색인 한 번으로 답한다.
+    """
+
+    def __init__(self, path: str = MARKET_AGGREGATES_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS daily_market_aggregates ("
+            "date TEXT NOT NULL, market TEXT NOT NULL, "
+            "advancers INTEGER NOT NULL, decliners INTEGER NOT NULL, unchanged INTEGER NOT NULL, "
+            "traded INTEGER NOT NULL, total_volume INTEGER NOT NULL, "
+            "PRIMARY KEY (date, market))"
+        )
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def record_day(self, day: str, quotes: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+        """하루치 시세를 집계해 저장 (같은 날짜는 덮어씀)"""
+        aggregates = compute_daily_aggregates(quotes)
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO daily_market_aggregates "
+                "(date, market, advancers, decliners, unchanged, traded, total_volume) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(day, market, *(values[field] for field in AGGREGATE_FIELDS)) for market, values in aggregates.items()],
+            )
+            self._conn.commit()
+        return aggregates
+
+    def get(self, day: str, market: str = ALL_MARKETS) -> Optional[Dict[str, Any]]:
+        """(날짜, 시장) 집계 한 건"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT advancers, decliners, unchanged, traded, total_volume FROM daily_market_aggregates "
+                "WHERE date = ? AND market = ?", (day, market.upper())).fetchone()
+        if row is None:
+            return None
+        return dict(zip(AGGREGATE_FIELDS, row), date=day, market=market.upper())
+
+    def recorded_dates(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT date FROM daily_market_aggregates ORDER BY date")]
+
+    def backfill(self, start, end, fetch_day: Callable[[str], Iterable[Dict[str, Any]]]) -> List[str]:
+        """[start, end] 평일 중 집계가 없는 날짜만 시세를 받아 채움 (채운 날짜 반환)"""
+        start, end = _to_date(start), _to_date(end)
+        recorded = set(self.recorded_dates())
+
+        filled = []
+        day = start
+        while day <= end:
+            iso = day.isoformat()
+            if day.weekday() < 5 and iso not in recorded:
+                quotes = list(fetch_day(iso))
+                if quotes:  # 휴장일은 시세가 없으므로 건너뜀
+                    self.record_day(iso, quotes)
+                    filled.append(iso)
+            day += timedelta(days=1)
+        return filled
+
+    def query(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """데이터 수집기 요청 형식의 market_statistics 조회"""
+        parameters = request.get("parameters", {})
+        day = parameters.get("date")
+        market = parameters.get("market") or ALL_MARKETS
+        aggregate = self.get(day, market) if day else None
+        if aggregate is None:
+            return {"status": "error", "message": f"{day} {market} 시장 집계가 없습니다."}
+        return {"status": "success", "data": aggregate}
+
+
+def build_market_aggregates(start, end, listings: Iterable[Tuple[str, str]], price_store=None,
+                            store: Optional[MarketAggregateStore] = None) -> List[str]:
+    """[start, end] 중 집계가 없는 거래일을 PriceStore 일봉으로 채움 (채운 날짜 반환)
+
+    listings: (yfinance 종목 코드, 시장) 목록. 종목마다 일봉을 구간 전체로 한 번에 받아 둔 뒤
+    날짜별로 quotes_from_price_store 로 시세를 구성한다. 당일 집계는 장 마감 후에 만든다.
+    """
+    if price_store is None:
+        from utils.price_store import get_price_store
+        price_store = get_price_store()
+    store = store or get_market_aggregates()
+    start, end = _to_date(start), _to_date(end)
+    listings = list(listings)
+
+    # 첫 날짜의 등락률 계산에 전 거래일 종가가 필요하므로 2주 앞부터
+    for ticker, _ in listings:
+        price_store.ensure(ticker, start - timedelta(days=14), end)
+    return store.backfill(start, end, lambda day: quotes_from_price_store(price_store, listings, day))
+
+
+_default_store: Optional[MarketAggregateStore] = None
+
+
+def get_market_aggregates() -> MarketAggregateStore:
+    """프로세스 전역에서 공유하는 시장 집계 테이블"""
+    global _default_store
+    if _default_store is None:
+        _default_store = MarketAggregateStore()
+    return _default_store
@@ -0,0 +1,316 @@
+import os
+import csv
+import time
+import bisect
+import logging
+import threading
+from typing import Dict, Any, List, Optional, Callable, Iterable, Tuple
+
+import numpy as np
+
+from utils.http_cassette import cassette_bars_download
+
+logger = logging.getLogger("MarketSnapshot")
+
+# 스냅샷이 이 시간(초)보다 오래되면 준비되지 않은 것으로 보고 데이터 수집기로 조회
+SNAPSHOT_MAX_AGE = 60.0
+REFRESH_INTERVAL = 5.0
+
+# 운영 환경 전 종목 시세 갱신 (MARKET_SNAPSHOT=0 이면 끄고 항상 데이터 수집기로 조회)
+MARKET_SNAPSHOT_ENABLED = os.getenv("MARKET_SNAPSHOT", "1") == "1"
+# 전 종목 일괄 다운로드는 수십 초가 걸리므로 갱신 간격과 허용 나이를 넉넉하게
+MARKET_SNAPSHOT_INTERVAL = float(os.getenv("MARKET_SNAPSHOT_INTERVAL", "60"))
+MARKET_SNAPSHOT_MAX_AGE = float(os.getenv("MARKET_SNAPSHOT_MAX_AGE", "180"))
+
+KIND_CSV_FILE = "KIND_corp_list.csv"
+# yfinance 종목 코드 접미사
+YF_SUFFIXES = {"KOSPI": ".KS", "KOSDAQ": ".KQ"}
+
+
+class MarketSnapshot:
+    """전 종목 현재 시세를 배열로 보관하고 등락률/거래량 순서 색인을 시세 변경마다 갱신
+
+    순서 색인은 (값, 슬롯) 정렬 리스트라서 상위/하위 k 개는 O(k), 임계값 이상 개수는
+    O(log n) 으로 읽는다. 읽기와 갱신은 하나의 락으로 보호한다.
+    """
+
+    def __init__(self, capacity: int = 4096, max_age: float = SNAPSHOT_MAX_AGE):
+        self._lock = threading.RLock()
+        self.max_age = max_age
+        self.symbols: List[str] = []
+        self._slots: Dict[str, int] = {}
+        self.prices = np.zeros(capacity, dtype=np.float64)
+        self.change_rates = np.zeros(capacity, dtype=np.float64)
+        self.volumes = np.zeros(capacity, dtype=np.int64)
+        self._by_change: List[Tuple[float, int]] = []
+        self._by_volume: List[Tuple[int, int]] = []
+        self.updated_at = 0.0
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def _slot(self, symbol: str) -> Tuple[int, bool]:
+        slot = self._slots.get(symbol)
+        if slot is not None:
+            return slot, False
+
+        slot = len(self.symbols)
+        if slot == len(self.prices):
+            self.prices = np.resize(self.prices, slot * 2)
+            self.change_rates = np.resize(self.change_rates, slot * 2)
+            self.volumes = np.resize(self.volumes, slot * 2)
+        self.symbols.append(symbol)
+        self._slots[symbol] = slot
+        return slot, True
+
+    @staticmethod
+    def _replace(index: list, old_key, new_key):
+        if old_key is not None:
+            del index[bisect.bisect_left(index, old_key)]
+        bisect.insort(index, new_key)
+
+    def _apply(self, quote: Dict[str, Any]):
+        slot, created = self._slot(quote["symbol"])
+        change_rate = float(quote.get("change_rate", 0) or 0)
+        if change_rate != change_rate:  # NaN 은 정렬 색인을 깨뜨리므로 0 으로
+            change_rate = 0.0
+        volume = int(quote.get("volume", 0) or 0)
+
+        old_change = None if created else (float(self.change_rates[slot]), slot)
+        old_volume = None if created else (int(self.volumes[slot]), slot)
+        if old_change != (change_rate, slot):
+            self._replace(self._by_change, old_change, (change_rate, slot))
+        if old_volume != (volume, slot):
+            self._replace(self._by_volume, old_volume, (volume, slot))
+
+        self.prices[slot] = float(quote.get("current_price", 0) or 0)
+        self.change_rates[slot] = change_rate
+        self.volumes[slot] = volume
+
+    def update(self, quote: Dict[str, Any]):
+        """한 종목 시세 반영 (symbol, current_price, change_rate, volume)"""
+        self.update_many([quote])
+
+    def update_many(self, quotes: Iterable[Dict[str, Any]]):
+        """여러 종목 시세를 한 번에 반영"""
+        with self._lock:
+            for quote in quotes:
+                self._apply(quote)
+            self.updated_at = time.time()
+            self.version += 1
+
+    def is_ready(self, max_age: Optional[float] = None) -> bool:
+        """시세가 있고 max_age 초(기본 self.max_age) 안에 갱신됐는지"""
+        max_age = self.max_age if max_age is None else max_age
+        return bool(self.symbols) and time.time() - self.updated_at <= max_age
+
+    def quote(self, slot: int) -> Dict[str, Any]:
+        price = float(self.prices[slot])
+        return {
+            "symbol": self.symbols[slot],
+            "current_price": int(price) if price.is_integer() else price,
+            "change_rate": float(self.change_rates[slot]),
+            "volume": int(self.volumes[slot]),
+        }
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            slot = self._slots.get(symbol)
+            return None if slot is None else self.quote(slot)
+
+    def top_gainers(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """등락률 상위 limit 개 (O(k))"""
+        with self._lock:
+            keys = self._by_change[len(self._by_change) - limit:] if limit > 0 else []
+            return [self.quote(slot) for _, slot in reversed(keys)]
+
+    def top_losers(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """등락률 하위(하락률 상위) limit 개 (O(k))"""
+        with self._lock:
+            return [self.quote(slot) for _, slot in self._by_change[:max(limit, 0)]]
+
+    def top_volume(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """거래량 상위 limit 개 (O(k))"""
+        with self._lock:
+            keys = self._by_volume[len(self._by_volume) - limit:] if limit > 0 else []
+            return [self.quote(slot) for _, slot in reversed(keys)]
+
+    def count_beyond(self, threshold: float, direction: str = "up") -> int:
+        """threshold% 이상 상승(또는 하락)한 종목 수 (O(log n))"""
+        with self._lock:
+            if direction == "up":
+                return len(self._by_change) - bisect.bisect_left(self._by_change, (threshold, -1))
+            return bisect.bisect_right(self._by_change, (-threshold, float("inf")))
+
+    def beyond_threshold(self, threshold: float, direction: str = "up",
+                         limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """threshold% 이상 상승(또는 하락)한 종목, 변동이 큰 순 (O(log n + k))"""
+        with self._lock:
+            count = self.count_beyond(threshold, direction)
+            if limit is not None:
+                count = min(count, limit)
+            if direction == "up":
+                keys = reversed(self._by_change[len(self._by_change) - count:]) if count else []
+            else:
+                keys = self._by_change[:count]
+            return [self.quote(slot) for _, slot in keys]
+
+    def query(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """데이터 수집기 요청 형식으로 조회 (스냅샷으로 답할 수 없는 유형은 None)"""
+        parameters = request.get("parameters", {})
+        request_type = request.get("type")
+
+        if request_type == "top_gainers":
+            data = self.top_gainers(parameters.get("limit", 10))
+        elif request_type == "top_losers":
+            data = self.top_losers(parameters.get("limit", 10))
+        elif request_type == "above_threshold":
+            data = self.beyond_threshold(parameters.get("threshold", 3.0), parameters.get("direction", "up"))
+        else:
+            return None
+        return {"status": "success", "data": data, "source": "market_snapshot"}
+
+
+class SnapshotRefresher:
+    """백그라운드 스레드에서 주기적으로 전 종목 시세를 받아 스냅샷에 반영"""
+
+    def __init__(self, snapshot: MarketSnapshot, fetch_quotes: Callable[[], Iterable[Dict[str, Any]]],
+                 interval: float = REFRESH_INTERVAL):
+        self.snapshot = snapshot
+        self.fetch_quotes = fetch_quotes
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.errors = 0
+
+    def refresh_once(self) -> bool:
+        try:
+            self.snapshot.update_many(self.fetch_quotes())
+            return True
+        except Exception as e:
+            self.errors += 1
+            logger.error("[MarketSnapshot] 시세 갱신 실패: %s", e)
+            return False
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh_once()
+            self._stop.wait(self.interval)
+
+    def start(self) -> "SnapshotRefresher":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="market-snapshot", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def kind_listings(path: str = KIND_CSV_FILE) -> List[Tuple[str, str]]:
+    """KIND 상장 목록의 (종목코드, 회사명)"""
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return [(row["종목코드"].strip(), row["회사명"].strip())
+                for row in csv.DictReader(f) if row.get("종목코드", "").strip()]
+
+
+def yfinance_daily_bars(symbols: List[str]) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """yfinance 일괄 다운로드로 종목별 최근 일봉 (종가 배열, 거래량 배열), 시세가 없는 종목은 빠짐"""
+    import yfinance as yf
+
+    df = yf.download(symbols, period="5d", interval="1d", group_by="ticker",
+                     progress=False, auto_adjust=False, threads=True)
+    bars: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+    if df is None or df.empty:
+        return bars
+    downloaded = set(df.columns.get_level_values(0)) if getattr(df.columns, "nlevels", 1) > 1 else set()
+    for symbol in symbols:
+        if symbol not in downloaded:
+            continue
+        frame = df[symbol].dropna(subset=["Close"])
+        if not frame.empty:
+            bars[symbol] = (frame["Close"].to_numpy(dtype="f8"), frame["Volume"].fillna(0).to_numpy(dtype="i8"))
+    return bars
+
+
+class YFinanceQuoteSource:
+    """전 종목 현재 시세 (당일 일봉의 종가 = 장중 현재가, 전일 종가 대비 등락률)
+
+    KIND 상장 목록에는 시장 구분이 없어 처음에는 .KS/.KQ 를 모두 조회하고,
+    시세가 나온 쪽을 종목별 시장으로 기억해 다음 갱신부터는 그 코드만 조회한다.
+    기본 download 는 HTTP 카세트로 감싸 재생 모드에서는 Yahoo 에 접속하지 않는다.
+    """
+
+    def __init__(self, listings: Optional[Iterable[Tuple[str, str]]] = None,
+                 download: Optional[Callable[[List[str]], Dict[str, Tuple[np.ndarray, np.ndarray]]]] = None):
+        self._listings = None if listings is None else list(listings)
+        self.download = download or cassette_bars_download(yfinance_daily_bars)
+        self.markets: Dict[str, str] = {}
+
+    @property
+    def listings(self) -> List[Tuple[str, str]]:
+        if self._listings is None:
+            self._listings = kind_listings()
+        return self._listings
+
+    def yfinance_listings(self) -> List[Tuple[str, str]]:
+        """시장을 알아낸 종목의 (yfinance 종목 코드, 시장) 목록 (한 번 이상 조회한 뒤 사용)"""
+        return [(ticker + YF_SUFFIXES[market], market) for ticker, market in self.markets.items()]
+
+    def __call__(self) -> List[Dict[str, Any]]:
+        candidates: Dict[str, Tuple[str, str, str]] = {}
+        for ticker, name in self.listings:
+            markets = [self.markets[ticker]] if ticker in self.markets else list(YF_SUFFIXES)
+            for market in markets:
+                candidates[ticker + YF_SUFFIXES[market]] = (ticker, name, market)
+
+        bars = self.download(list(candidates))
+        quotes = []
+        for symbol, (ticker, name, market) in candidates.items():
+            if symbol not in bars or self.markets.get(ticker, market) != market:
+                continue
+            closes, volumes = bars[symbol]
+            self.markets[ticker] = market
+            close = float(closes[-1])
+            previous = float(closes[-2]) if len(closes) > 1 else close
+            quotes.append({
+                "symbol": name,
+                "ticker": ticker,
+                "market": market,
+                "current_price": close,
+                "change_rate": (close - previous) / previous * 100 if previous else 0.0,
+                "volume": int(volumes[-1]),
+            })
+        return quotes
+
+
+_market_snapshot: Optional[MarketSnapshot] = None
+_refresher: Optional[SnapshotRefresher] = None
+_snapshot_lock = threading.Lock()
+
+
+def start_market_snapshot(fetch_quotes: Optional[Callable[[], Iterable[Dict[str, Any]]]] = None,
+                          interval: float = MARKET_SNAPSHOT_INTERVAL) -> MarketSnapshot:
+    """프로세스 전역 스냅샷을 만들고 백그라운드 갱신 시작 (이미 시작했으면 그 스냅샷 반환)
+
+    첫 갱신이 끝나기 전에는 is_ready() 가 False 라서 오케스트레이터는 데이터 수집기로 조회한다.
+    """
+    global _market_snapshot, _refresher
+    with _snapshot_lock:
+        if _market_snapshot is None:
+            _market_snapshot = MarketSnapshot(max_age=MARKET_SNAPSHOT_MAX_AGE)
+            _refresher = SnapshotRefresher(_market_snapshot, fetch_quotes or YFinanceQuoteSource(), interval).start()
+        return _market_snapshot
+
+
+def stop_market_snapshot(timeout: Optional[float] = None):
+    """백그라운드 갱신 중지 후 전역 스냅샷 해제"""
+    global _market_snapshot, _refresher
+    with _snapshot_lock:
+        if _refresher is not None:
+            _refresher.stop(timeout)
+        _market_snapshot = _refresher = None
@@ -0,0 +1,186 @@
+from typing import Dict, Any, List, Optional, Tuple, Sequence
+
+import numpy as np
+
+DEFAULT_MA_PERIOD = 50
+DEFAULT_THRESHOLD = 10.0  # % (QueryUnderstander 기본값과 동일)
+
+
+class IndicatorEngine:
+    """종목 × 날짜 종가 행렬에 대한 이동평균/돌파/교차 시그널 계산기
+
+    누적합(prefix sum)을 유지해 어떤 기간의 이동평균이든 종목 수만큼의 연산으로 구하고,
+    결과는 (기간, 날짜) 단위로 캐시한다. 새 거래일 추가(append_day)도 O(종목 수)이다.
+    상장 전 등 값이 없는 칸은 NaN 으로 두며, 창 안에 NaN 이 있으면 이동평균도 NaN 이다.
+    """
+
+    def __init__(self, closes: np.ndarray, tickers: Sequence[str], dates: Sequence[str]):
+        closes = np.asarray(closes, dtype=np.float64)
+        if closes.shape != (len(dates), len(tickers)):
+            raise ValueError(f"종가 행렬 크기가 맞지 않습니다: {closes.shape} != ({len(dates)}, {len(tickers)})")
+
+        self.tickers = list(tickers)
+        self.dates: List[str] = list(dates)
+        self._date_index = {day: i for i, day in enumerate(self.dates)}
+
+        # 행 추가가 잦으므로 여유 용량을 둔 버퍼에 보관
+        capacity = max(len(self.dates) * 2, 16)
+        self._closes = np.full((capacity, len(self.tickers)), np.nan)
+        self._sums = np.zeros((capacity + 1, len(self.tickers)))
+        self._counts = np.zeros((capacity + 1, len(self.tickers)), dtype=np.int64)
+
+        size = len(self.dates)
+        self._closes[:size] = closes
+        valid = np.isfinite(closes)
+        np.cumsum(np.where(valid, closes, 0.0), axis=0, out=self._sums[1:size + 1])
+        np.cumsum(valid, axis=0, out=self._counts[1:size + 1])
+
+        self._cache: Dict[Tuple[int, str], np.ndarray] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @classmethod
+    def from_price_store(cls, store, tickers: Sequence[str], start, end) -> "IndicatorEngine":
+        """PriceStore 일봉으로 종가 행렬 구성 (날짜는 모든 종목의 합집합)"""
+        ranges = {ticker: store.get_range(ticker, start, end) for ticker in tickers}
+        keys = np.unique(np.concatenate([rows["date"] for rows in ranges.values()])) if ranges else np.empty(0, int)
+        closes = np.full((len(keys), len(tickers)), np.nan)
+        for column, ticker in enumerate(tickers):
+            rows = ranges[ticker]
+            closes[np.searchsorted(keys, rows["date"]), column] = rows["close"]
+        dates = [f"{key // 10000:04d}-{key // 100 % 100:02d}-{key % 100:02d}" for key in keys]
+        return cls(closes, tickers, dates)
+
+    @property
+    def closes(self) -> np.ndarray:
+        return self._closes[:len(self.dates)]
+
+    def _day(self, date: Optional[str]) -> int:
+        if date is None:
+            return len(self.dates) - 1
+        if date not in self._date_index:
+            raise KeyError(f"가격 데이터가 없는 날짜입니다: {date}")
+        return self._date_index[date]
+
+    def _grow(self):
+        capacity = self._closes.shape[0] * 2
+        closes = np.full((capacity, len(self.tickers)), np.nan)
+        sums = np.zeros((capacity + 1, len(self.tickers)))
+        counts = np.zeros((capacity + 1, len(self.tickers)), dtype=np.int64)
+        size = len(self.dates)
+        closes[:size] = self._closes[:size]
+        sums[:size + 1] = self._sums[:size + 1]
+        counts[:size + 1] = self._counts[:size + 1]
+        self._closes, self._sums, self._counts = closes, sums, counts
+
+    def _write_row(self, day: int, row: np.ndarray):
+        valid = np.isfinite(row)
+        self._closes[day] = row
+        self._sums[day + 1] = self._sums[day] + np.where(valid, row, 0.0)
+        self._counts[day + 1] = self._counts[day] + valid
+
+    def append_day(self, date: str, closes: Sequence[float]):
+        """새 거래일 종가 추가 (마지막 날짜와 같으면 장중 갱신으로 보고 교체)"""
+        row = np.asarray(closes, dtype=np.float64)
+        if row.shape != (len(self.tickers),):
+            raise ValueError(f"종목 수가 맞지 않습니다: {row.shape[0]} != {len(self.tickers)}")
+
+        if self.dates and date == self.dates[-1]:
+            self._write_row(len(self.dates) - 1, row)
+            self._cache = {key: value for key, value in self._cache.items() if key[1] != date}
+            return
+        if self.dates and date < self.dates[-1]:
+            raise ValueError(f"과거 날짜는 추가할 수 없습니다: {date} < {self.dates[-1]}")
+
+        if len(self.dates) == self._closes.shape[0]:
+            self._grow()
+        self._write_row(len(self.dates), row)
+        self._date_index[date] = len(self.dates)
+        self.dates.append(date)
+
+    def _window_mean(self, period: int, day: int) -> np.ndarray:
+        start = day + 1 - period
+        if start < 0:
+            return np.full(len(self.tickers), np.nan)
+        total = self._sums[day + 1] - self._sums[start]
+        count = self._counts[day + 1] - self._counts[start]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(count == period, total / period, np.nan)
+
+    def moving_average(self, period: int = DEFAULT_MA_PERIOD, date: Optional[str] = None) -> np.ndarray:
+        """date(기본: 최근 거래일) 기준 모든 종목의 period 일 이동평균"""
+        day = self._day(date)
+        key = (period, self.dates[day])
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+
+        self.cache_misses += 1
+        result = self._window_mean(period, day)
+        result.flags.writeable = False
+        self._cache[key] = result
+        return result
+
+    def moving_average_series(self, period: int = DEFAULT_MA_PERIOD) -> np.ndarray:
+        """전체 기간 이동평균 행렬 (날짜 × 종목, 앞쪽 period-1 일은 NaN)"""
+        size = len(self.dates)
+        result = np.full((size, len(self.tickers)), np.nan)
+        if size >= period:
+            total = self._sums[period:size + 1] - self._sums[:size + 1 - period]
+            count = self._counts[period:size + 1] - self._counts[:size + 1 - period]
+            result[period - 1:] = np.where(count == period, total / period, np.nan)
+        return result
+
+    def gap_ratio(self, period: int = DEFAULT_MA_PERIOD, date: Optional[str] = None) -> np.ndarray:
+        """(종가 - 이동평균) / 이동평균"""
+        moving_avg = self.moving_average(period, date)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (self.closes[self._day(date)] - moving_avg) / moving_avg
+
+    def breakout(self, period: int = DEFAULT_MA_PERIOD, threshold: float = DEFAULT_THRESHOLD,
+                 date: Optional[str] = None) -> np.ndarray:
+        """종가가 이동평균보다 threshold% 이상 높은 종목 마스크"""
+        with np.errstate(invalid="ignore"):
+            return self.gap_ratio(period, date) >= threshold / 100
+
+    def cross(self, period: int = DEFAULT_MA_PERIOD, date: Optional[str] = None) -> np.ndarray:
+        """전일 대비 이동평균 교차: 1 = 상향(골든), -1 = 하향(데드), 0 = 없음"""
+        day = self._day(date)
+        if day == 0:
+            return np.zeros(len(self.tickers), dtype=np.int8)
+
+        today = self.closes[day] - self.moving_average(period, self.dates[day])
+        yesterday = self.closes[day - 1] - self.moving_average(period, self.dates[day - 1])
+        with np.errstate(invalid="ignore"):
+            up = (yesterday <= 0) & (today > 0)
+            down = (yesterday >= 0) & (today < 0)
+        return up.astype(np.int8) - down.astype(np.int8)
+
+    def evaluate(self, ma_period: int = DEFAULT_MA_PERIOD, threshold: float = DEFAULT_THRESHOLD,
+                 signal_type: str = "breakout", date: Optional[str] = None) -> Dict[str, Any]:
+        """technical_signal 파라미터(ma_period/threshold/signal_type)로 전 종목 평가
+
+        결과 항목은 ReasonerAgent._handle_technical_signal 과 같은 키(target/signal/gap_ratio/judgement)를 쓴다.
+        """
+        gaps = self.gap_ratio(ma_period, date)
+        if signal_type == "cross":
+            crosses = self.cross(ma_period, date)
+            matched = np.flatnonzero(crosses != 0)
+            labels = {1: "상향 돌파", -1: "하향 이탈"}
+            signals = [labels[int(crosses[i])] for i in matched]
+        else:
+            matched = np.flatnonzero(self.breakout(ma_period, threshold, date))
+            signals = ["상향 돌파"] * len(matched)
+
+        order = np.argsort(-gaps[matched], kind="stable")
+        return {
+            "date": self.dates[self._day(date)],
+            "result": [{
+                "target": self.tickers[matched[i]],
+                "signal": signals[i],
+                "gap_ratio": round(float(gaps[matched[i]]) * 100, 2),
+                "judgement": True,
+            } for i in order],
+            "total_matched": int(len(matched)),
+        }
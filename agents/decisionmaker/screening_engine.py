@@ -0,0 +1,115 @@
+import operator
+from typing import Dict, Any, List, Optional, Tuple, Iterable
+
+import numpy as np
+
+# 숫자 컬럼 (없는 값은 NaN, 단 volume 은 기존 구현과 같이 0)
+NUMERIC_FIELDS = ("volume", "per", "pbr", "change_rate", "current_price", "market_cap")
+CATEGORY_FIELDS = ("sector", "market")
+
+# ReasonerAgent._handle_screening 과 같은 기본 조건: 거래량 100만 초과, 거래량 내림차순 상위 10개
+DEFAULT_FILTERS: List[Tuple[str, str, Any]] = [("volume", ">", 1_000_000)]
+DEFAULT_SORT_BY = "volume"
+DEFAULT_LIMIT = 10
+
+_COMPARATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+def top_k_indices(values: np.ndarray, k: int, descending: bool = True) -> np.ndarray:
+    """values 상위 k 개의 위치 (argpartition, 같은 값은 앞선 위치 우선 — sorted 의 안정 정렬과 동일)"""
+    n = len(values)
+    if n == 0 or k <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    keys = -values if descending else values
+    if k < n:
+        kth = np.partition(keys, k - 1)[k - 1]
+        # 경계값과 같은 항목까지 후보로 포함해야 동률 순서가 기존 정렬과 같아진다
+        candidates = np.flatnonzero(keys <= kth)
+    else:
+        candidates = np.arange(n)
+
+    order = np.lexsort((candidates, keys[candidates]))
+    return candidates[order[:k]]
+
+
+class ScreeningUniverse:
+    """종목 목록을 NumPy 컬럼으로 보관하고 복합 조건을 불리언 마스크로 평가하는 스크리너"""
+
+    def __init__(self, records: List[Dict[str, Any]]):
+        self.records = records
+        self.size = len(records)
+        self.tickers = np.array([record.get("ticker", "") for record in records], dtype=object)
+
+        self.numeric: Dict[str, np.ndarray] = {}
+        for field in NUMERIC_FIELDS:
+            default = 0 if field == "volume" else np.nan
+            values = [record.get(field, default) for record in records]
+            self.numeric[field] = np.array([default if value is None else value for value in values], dtype=np.float64)
+
+        # 범주형 컬럼은 코드 배열 + 코드표로 보관 (== / in 비교를 정수 비교로)
+        self.categories: Dict[str, Tuple[np.ndarray, Dict[str, int]]] = {}
+        for field in CATEGORY_FIELDS:
+            labels = [str(record.get(field) or "") for record in records]
+            vocabulary, codes = np.unique(np.array(labels, dtype=object), return_inverse=True)
+            self.categories[field] = (codes, {label: code for code, label in enumerate(vocabulary)})
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "ScreeningUniverse":
+        return cls(list(records))
+
+    def _field_mask(self, field: str, op: str, value: Any) -> np.ndarray:
+        if field in self.categories:
+            codes, vocabulary = self.categories[field]
+            if op == "in":
+                wanted = [vocabulary[label] for label in value if label in vocabulary]
+                return np.isin(codes, wanted)
+            code = vocabulary.get(value, -1)
+            return codes == code if op == "==" else codes != code
+
+        column = self.numeric.get(field)
+        if column is None:
+            raise KeyError(f"지원하지 않는 스크리닝 필드: {field}")
+        if op == "between":
+            low, high = value
+            return (column >= low) & (column <= high)
+        return _COMPARATORS[op](column, value)
+
+    def mask(self, filters: List[Tuple[str, str, Any]]) -> np.ndarray:
+        """모든 조건을 만족하는 행의 불리언 마스크 (NaN 은 비교에서 항상 탈락)"""
+        result = np.ones(self.size, dtype=bool)
+        for field, op, value in filters:
+            result &= self._field_mask(field, op, value)
+        return result
+
+    def screen(self, filters: Optional[List[Tuple[str, str, Any]]] = None, sort_by: str = DEFAULT_SORT_BY,
+               descending: bool = True, limit: int = DEFAULT_LIMIT) -> Dict[str, Any]:
+        """조건 필터 → 상위 limit 개 (ReasonerAgent._handle_screening 과 같은 반환 형식)"""
+        matched = np.flatnonzero(self.mask(DEFAULT_FILTERS if filters is None else filters))
+
+        values = self.numeric[sort_by][matched]
+        # 정렬 키가 NaN 인 종목은 맨 뒤로
+        values = np.where(np.isnan(values), -np.inf if descending else np.inf, values)
+        top = matched[top_k_indices(values, limit, descending)]
+
+        return {
+            "result": [self.records[i] for i in top],
+            "total_matched": int(len(matched)),
+        }
+
+
+def screen_records(data_list: List[Dict[str, Any]], filters: Optional[List[Tuple[str, str, Any]]] = None,
+                   sort_by: str = DEFAULT_SORT_BY, descending: bool = True,
+                   limit: int = DEFAULT_LIMIT) -> Dict[str, Any]:
+    """dict 목록을 한 번 스크리닝 (같은 목록을 여러 번 거른다면 ScreeningUniverse 를 재사용)"""
+    try:
+        return ScreeningUniverse(data_list).screen(filters, sort_by, descending, limit)
+    except Exception:
+        return {"error": "screening 처리 중 오류 발생"}
@@ -0,0 +1,473 @@
+import re
+from typing import Dict, Any, Optional
+from datetime import datetime, timedelta
+from utils.corp_resolver import get_company_resolver
+
+# QueryUnderstander 가 사용하는 의도별 패턴 (우선순위 순서)
+QUERY_PATTERNS = {
+    # 가격 조회 패턴들
+    "stock_price_inquiry": [
+        r"(.+?)의?\s*(\d{4}-\d{2}-\d{2})\s*(시가|종가|고가|저가)(?:은|는)?\?",
+        r"(.+?)\s*(\d{4}-\d{2}-\d{2})\s*(시가|종가|고가|저가)",
+        r"(.+?)(?:의)?\s*(현재가|주가|가격)(?:은|는)?\s*(?:얼마|어떻게)?",
+    ],
+
+    # 시장 통계 패턴들
+    "market_statistics": [
+        r"(\d{4}-\d{2}-\d{2})에?\s*(상승|하락)한?\s*종목(?:은|는)?\s*몇\s*개",
+        r"(\d{4}-\d{2}-\d{2})\s*(KOSPI|KOSDAQ|코스피|코스닥)?\s*시장에?\s*거래된?\s*종목\s*수",
+        r"(\d{4}-\d{2}-\d{2})\s*거래\s*종목\s*수",
+    ],
+
+    # 순위 조회 패턴들
+    "ranking_inquiry": [
+        r"(\d{4}-\d{2}-\d{2})(?:에서)?\s*(KOSPI|KOSDAQ|코스피|코스닥)(?:에서)?\s*(상승률|하락률|거래량)\s*(높은|많은)\s*종목\s*(\d+)개",
+        r"(상승률|하락률|거래량)\s*(상위|하위)\s*(\d+)(?:개)?(?:\s*종목)?",
+        r"(\d{4}-\d{2}-\d{2})\s*가장\s*(많이|적게)\s*(오른|떨어진|거래된)\s*종목",
+    ],
+
+    # 조건부 검색 패턴들
+    "conditional_search": [
+        r"(\d+(?:\.\d+)?)%\s*이상\s*(상승|하락|오른|떨어진)",
+        r"(\d+(?:\.\d+)?)%\s*(?:이상|초과|이하|미만)",
+        r"전날\s*대비\s*(\d+(?:\.\d+)?)%",
+    ],
+
+    # 시그널 감지 패턴들
+    "technical_signal": [
+        r"(\d+)일\s*(이동평균|이평선).*?(\d+(?:\.\d+)?)%.*?(돌파|상향|하향)",
+        r"이동평균(?:선)?\s*(돌파|상향|하향)",
+        r"기술적\s*(돌파|지지|저항)",
+    ],
+
+    # 특정 날짜 조회
+    "date_specific": [
+        r"(\d{4}-\d{2}-\d{2})",
+        r"(\d{1,2})월\s*(\d{1,2})일",
+        r"(오늘|어제|내일)",
+    ]
+}
+
+# OrchestratorAgent.analyze_query 가 사용하는 패턴들
+_ORCH_DATE_PRICE = re.compile(r'(.+?)의?\s*(\d{4}-\d{2}-\d{2})\s*(시가|종가|고가|저가)(?:은|는)?\?*')
+_ORCH_CURRENT_PRICE = re.compile(r'(.+?)\s*(?:의?\s*)?(현재가|주가|가격)(?:은|는)?\s*(?:얼마|어떻게)?')
+_ORCH_RANKING = re.compile(r'(상승률|하락률)\s*(상위|하위)\s*(\d+)(?:개)?(?:\s*종목)?')
+_ORCH_THRESHOLD = re.compile(r'(\d+(?:\.\d+)?)%\s*이상\s*(상승|하락|오른|떨어진)')
+
+_COMPILED_PATTERNS = {
+    category: [re.compile(pattern) for pattern in patterns]
+    for category, patterns in QUERY_PATTERNS.items()
+}
+
+_STOCK_NAME_PATTERNS = [
+    re.compile(r'([가-힣]+(?:전자|화학|건설|금융|통신|바이오|제약|식품|유통|물산|중공업|그룹|홀딩스|제철|카드|은행|보험|증권|자산|투자|개발|엔지니어링|에너지|소재|머티리얼|테크|시스템|솔루션)(?:우|우선주)?)'),
+    re.compile(r'([가-힣]{2,}(?:우|우선주)?)'),
+    re.compile(r'(\d{6})'),  # 종목코드
+]
+
+# 분류에 필요한 키워드 (긴 단어가 먼저 매칭되도록 길이 역순)
+_KEYWORDS = sorted([
+    "시가", "종가", "고가", "저가", "현재가", "주가", "가격", "날짜",
+    "상승률", "하락률", "거래량", "상승", "하락", "오른", "떨어진", "많이", "가장",
+    "상위", "하위", "이상", "전날", "종목", "수", "몇",
+    "KOSPI", "KOSDAQ", "코스피", "코스닥", "오늘", "어제",
+    "이동평균", "이평선", "기술적", "돌파", "%",
+], key=len, reverse=True)
+
+# 복합어 토큰이 포함하는 하위 키워드 (`"상승" in query` 와 같은 의미 유지)
+_KEYWORD_IMPLIES = {
+    "상승률": ("상승",),
+    "하락률": ("하락",),
+}
+
+# 한 번의 스캔으로 날짜, 숫자, 키워드를 모두 추출하는 토큰 패턴
+# (키워드는 전방탐색으로 매칭해 "저가격"처럼 겹치는 키워드도 모두 잡는다)
+_TOKEN_PATTERN = re.compile(
+    r'(?P<date>\d{4}-\d{2}-\d{2})'
+    r'|(?P<md>(?P<month>\d{1,2})월\s*(?P<day>\d{1,2})일)'
+    r'|(?P<num>\d+(?:\.\d+)?)'
+    r'|(?=(?P<kw>' + '|'.join(re.escape(keyword) for keyword in _KEYWORDS) + r'))'
+)
+
+_PRICE_TYPE_BY_WORD = {"시가": "open", "종가": "close", "고가": "high", "저가": "low"}
+_PRICE_TYPE_KEYWORDS = [("시가", "open"), ("종가", "close"), ("고가", "high"), ("저가", "low"),
+                        ("현재가", "current"), ("주가", "current")]
+_DATED_PRICE_KEYWORDS = ("시가", "종가", "고가", "저가")
+_CURRENT_PRICE_KEYWORDS = ("현재가", "주가", "가격")
+
+
+class QueryClassifier:
+    """사전 컴파일된 패턴으로 쿼리를 한 번만 스캔해 의도와 파라미터를 추출하는 분류기
+
+    OrchestratorAgent(analyze)와 QueryUnderstander(understand)가 함께 사용한다.
+    토큰 스캔 결과(날짜, 숫자, 키워드)로 해당 의도의 패턴만 평가하므로
+    매칭 가능성이 없는 정규식은 실행하지 않는다.
+    """
+
+    def scan(self, query: str) -> Dict[str, Any]:
+        """쿼리를 한 번 스캔해 날짜/숫자/키워드 특징을 수집"""
+        features = {
+            "date": None,
+            "month_day": None,
+            "numbers": [],
+            "keywords": set(),
+        }
+        numbers = features["numbers"]
+        keywords = features["keywords"]
+
+        for match in _TOKEN_PATTERN.finditer(query):
+            kind = match.lastgroup
+            if kind == "kw":
+                keyword = match.group("kw")
+                keywords.add(keyword)
+                keywords.update(_KEYWORD_IMPLIES.get(keyword, ()))
+            elif kind == "num":
+                numbers.append(float(match.group("num")))
+            elif kind == "date":
+                date = match.group("date")
+                if features["date"] is None:
+                    features["date"] = date
+                numbers.extend(float(part) for part in date.split("-"))
+            else:
+                month, day = int(match.group("month")), int(match.group("day"))
+                if features["month_day"] is None:
+                    features["month_day"] = (month, day)
+                numbers.extend((float(month), float(day)))
+
+        return features
+
+    def resolve_date(self, features: Dict[str, Any]) -> Optional[str]:
+        """스캔 결과에서 날짜 추출 (YYYY-MM-DD → MM월 DD일 → 오늘/어제 순)"""
+        if features["date"]:
+            return features["date"]
+
+        if features["month_day"]:
+            month, day = features["month_day"]
+            return f"{datetime.now().year}-{month:02d}-{day:02d}"
+
+        keywords = features["keywords"]
+        if "오늘" in keywords:
+            return datetime.now().strftime("%Y-%m-%d")
+        elif "어제" in keywords:
+            return (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+
+        return None
+
+    def resolve_price_type(self, features: Dict[str, Any]) -> str:
+        """스캔 결과에서 가격 유형 추출 (시가, 종가, 고가, 저가, 현재가)"""
+        keywords = features["keywords"]
+        for keyword, price_type in _PRICE_TYPE_KEYWORDS:
+            if keyword in keywords:
+                return price_type
+        return "current"
+
+    def resolve_market(self, features: Dict[str, Any]) -> str:
+        """스캔 결과에서 시장 구분 추출"""
+        keywords = features["keywords"]
+        if "KOSPI" in keywords or "코스피" in keywords:
+            return "KOSPI"
+        elif "KOSDAQ" in keywords or "코스닥" in keywords:
+            return "KOSDAQ"
+        return "ALL"
+
+    def resolve_company(self, text: str) -> Optional[Dict[str, Any]]:
+        """KIND/DART 회사 목록에서 가장 긴 회사 언급 조회"""
+        return get_company_resolver().find(text)
+
+    def company_parameters(self, text: str) -> Dict[str, Any]:
+        """인식된 회사의 종목코드/corp_code 파라미터 (없으면 빈 dict)"""
+        company = self.resolve_company(text)
+        if company is None:
+            return {}
+        return {
+            key: company[key]
+            for key in ("stock_code", "corp_code")
+            if company.get(key)
+        }
+
+    def extract_stock_name(self, text: str) -> Optional[str]:
+        """종목명 추출 (회사 목록에 있으면 정식 회사명)"""
+        company = self.resolve_company(text)
+        if company is not None:
+            return company["name"]
+
+        for pattern in _STOCK_NAME_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                return match.group(1)
+        return None
+
+    def analyze(self, query: str, features: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """OrchestratorAgent.analyze_query 형식의 분석 결과"""
+        if features is None:
+            features = self.scan(query)
+        keywords = features["keywords"]
+
+        # 1. 특정 날짜의 주식 가격 조회 (시가, 종가, 고가, 저가)
+        if features["date"] and any(k in keywords for k in _DATED_PRICE_KEYWORDS):
+            price_match = _ORCH_DATE_PRICE.search(query)
+            if price_match:
+                symbol = price_match.group(1).strip()
+                return {
+                    "type": "stock_price",
+                    "symbol": symbol,
+                    "date": price_match.group(2),
+                    "price_type": price_match.group(3),
+                    **self.company_parameters(symbol)
+                }
+
+        # 시장 통계 (특정 날짜 상승/하락/거래 종목 수) - understand 와 같은 패턴 사용
+        statistics = {"parameters": {}, "sub_type": None}
+        if self._match_market_statistics(query, features, statistics) and statistics["sub_type"]:
+            return {"type": "market_statistics", "sub_type": statistics["sub_type"], **statistics["parameters"]}
+
+        # 2. 현재 주가 조회
+        if (not features["date"] and "날짜" not in keywords
+                and any(k in keywords for k in _CURRENT_PRICE_KEYWORDS)):
+            current_price_match = _ORCH_CURRENT_PRICE.search(query)
+            if current_price_match:
+                symbol = current_price_match.group(1).strip()
+                return {
+                    "type": "stock_price",
+                    "symbol": symbol,
+                    **self.company_parameters(symbol)
+                }
+
+        # 3. 순위 조회 (상승률 상위)
+        if "상승률" in keywords or "하락률" in keywords:
+            ranking_match = _ORCH_RANKING.search(query)
+            if ranking_match:
+                return {
+                    "type": "top_gainers" if ranking_match.group(1) == "상승률" else "top_losers",
+                    "limit": int(ranking_match.group(3))
+                }
+
+        # 4. 조건부 검색 (% 이상 상승/하락)
+        if "%" in keywords and "이상" in keywords:
+            threshold_match = _ORCH_THRESHOLD.search(query)
+            if threshold_match:
+                return {
+                    "type": "above_threshold",
+                    "threshold": float(threshold_match.group(1)),
+                    "direction": "up" if threshold_match.group(2) in ["상승", "오른"] else "down"
+                }
+
+        # 5. 많이 오른 주식
+        if "많이" in keywords and ("오른" in keywords or "상승" in keywords):
+            return {
+                "type": "top_gainers",
+                "limit": 10
+            }
+
+        return {"type": "unknown"}
+
+    def understand(self, query: str, features: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """QueryUnderstander.process 형식의 분석 결과"""
+        if features is None:
+            features = self.scan(query)
+
+        result = {
+            "original_query": query,
+            "query_type": "unknown",
+            "parameters": {},
+            "confidence": 0.0,
+            "sub_type": None
+        }
+
+        # 가격 조회 → 시장 통계 → 순위 조회 → 조건부 검색 → 기술적 시그널 순서
+        if self._match_price_inquiry(query, features, result):
+            pass
+        elif self._match_market_statistics(query, features, result):
+            pass
+        elif self._match_ranking_inquiry(query, features, result):
+            pass
+        elif self._match_conditional_search(query, features, result):
+            pass
+        elif self._match_technical_signal(query, features, result):
+            pass
+
+        self._add_common_parameters(query, features, result)
+        return result
+
+    def _match_price_inquiry(self, query: str, features: Dict[str, Any], result: Dict[str, Any]) -> bool:
+        """가격 조회 분석"""
+        keywords = features["keywords"]
+        has_dated = features["date"] and any(k in keywords for k in _DATED_PRICE_KEYWORDS)
+        has_current = any(k in keywords for k in _CURRENT_PRICE_KEYWORDS)
+        if not (has_dated or has_current):
+            return False
+
+        for pattern in _COMPILED_PATTERNS["stock_price_inquiry"]:
+            if pattern.groups >= 3 and not has_dated:
+                continue
+            match = pattern.search(query)
+            if match:
+                result["query_type"] = "stock_price_inquiry"
+                result["confidence"] = 0.9
+
+                if pattern.groups >= 3:  # 종목명, 날짜, 가격타입
+                    result["parameters"] = {
+                        "symbol": match.group(1).strip(),
+                        "date": match.group(2),
+                        "price_type": _PRICE_TYPE_BY_WORD[match.group(3)]
+                    }
+                    result["sub_type"] = f"historical_{result['parameters']['price_type']}"
+                else:
+                    result["parameters"] = {
+                        "symbol": self.extract_stock_name(query),
+                        "price_type": self.resolve_price_type(features)
+                    }
+                    result["sub_type"] = f"current_{result['parameters']['price_type']}"
+
+                return True
+        return False
+
+    def _match_market_statistics(self, query: str, features: Dict[str, Any], result: Dict[str, Any]) -> bool:
+        """시장 통계 분석"""
+        keywords = features["keywords"]
+        if not features["date"] or "종목" not in keywords:
+            return False
+
+        for pattern in _COMPILED_PATTERNS["market_statistics"]:
+            match = pattern.search(query)
+            if match:
+                result["query_type"] = "market_statistics"
+                result["confidence"] = 0.85
+
+                if "상승" in keywords or "하락" in keywords:
+                    result["sub_type"] = "movement_count"
+                    result["parameters"] = {
+                        "date": match.group(1),
+                        "movement": "up" if "상승" in keywords else "down",
+                        "market": self.resolve_market(features)
+                    }
+                elif "수" in keywords:
+                    result["sub_type"] = "total_count"
+                    result["parameters"] = {
+                        "date": match.group(1),
+                        "market": self.resolve_market(features)
+                    }
+
+                return True
+        return False
+
+    def _match_ranking_inquiry(self, query: str, features: Dict[str, Any], result: Dict[str, Any]) -> bool:
+        """순위 조회 분석"""
+        keywords = features["keywords"]
+        if not ({"상승률", "하락률", "거래량", "가장"} & keywords):
+            return False
+
+        for pattern in _COMPILED_PATTERNS["ranking_inquiry"]:
+            match = pattern.search(query)
+            if match:
+                result["query_type"] = "ranking_inquiry"
+                result["confidence"] = 0.9
+
+                numbers = features["numbers"]
+                rank_count = int(numbers[-1]) if numbers else 5
+
+                if "상승률" in keywords:
+                    result["sub_type"] = "top_gainers"
+                elif "하락률" in keywords:
+                    result["sub_type"] = "top_losers"
+                elif "거래량" in keywords:
+                    result["sub_type"] = "top_volume"
+
+                result["parameters"] = {
+                    "limit": rank_count,
+                    "market": self.resolve_market(features),
+                    "date": self.resolve_date(features)
+                }
+
+                return True
+        return False
+
+    def _match_conditional_search(self, query: str, features: Dict[str, Any], result: Dict[str, Any]) -> bool:
+        """조건부 검색 분석"""
+        if "%" not in features["keywords"]:
+            return False
+
+        keywords = features["keywords"]
+        for pattern in _COMPILED_PATTERNS["conditional_search"]:
+            match = pattern.search(query)
+            if match:
+                result["query_type"] = "conditional_search"
+                result["confidence"] = 0.85
+
+                threshold = float(match.group(1))
+
+                if "상승" in keywords or "오른" in keywords:
+                    result["sub_type"] = "above_threshold"
+                    result["parameters"] = {
+                        "threshold": threshold,
+                        "direction": "up"
+                    }
+                elif "하락" in keywords or "떨어진" in keywords:
+                    result["sub_type"] = "below_threshold"
+                    result["parameters"] = {
+                        "threshold": threshold,
+                        "direction": "down"
+                    }
+
+                return True
+        return False
+
+    def _match_technical_signal(self, query: str, features: Dict[str, Any], result: Dict[str, Any]) -> bool:
+        """기술적 시그널 분석"""
+        keywords = features["keywords"]
+        if not ({"이동평균", "이평선", "기술적"} & keywords):
+            return False
+
+        for pattern in _COMPILED_PATTERNS["technical_signal"]:
+            match = pattern.search(query)
+            if match:
+                result["query_type"] = "technical_signal"
+                result["confidence"] = 0.8
+                result["sub_type"] = "moving_average_breakout"
+
+                numbers = features["numbers"]
+                ma_days = int(numbers[0]) if numbers else 50
+                threshold = numbers[1] if len(numbers) > 1 else 10.0
+
+                result["parameters"] = {
+                    "ma_period": ma_days,
+                    "threshold": threshold,
+                    "signal_type": "breakout" if "돌파" in keywords else "cross"
+                }
+
+                return True
+        return False
+
+    def _add_common_parameters(self, query: str, features: Dict[str, Any], result: Dict[str, Any]):
+        """공통 파라미터 추가"""
+        # 날짜가 아직 설정되지 않았다면 추출 시도
+        if "date" not in result["parameters"]:
+            extracted_date = self.resolve_date(features)
+            if extracted_date:
+                result["parameters"]["date"] = extracted_date
+
+        # 시장 구분이 설정되지 않았다면 추가
+        if "market" not in result["parameters"]:
+            result["parameters"]["market"] = self.resolve_market(features)
+
+        # 종목명이 설정되지 않았다면 추가
+        if "symbol" not in result["parameters"] and result["query_type"] in ["stock_price_inquiry"]:
+            extracted_symbol = self.extract_stock_name(query)
+            if extracted_symbol:
+                result["parameters"]["symbol"] = extracted_symbol
+
+        # 회사 목록에서 인식된 종목이면 종목코드/티커/corp_code 를 함께 전달
+        if result["query_type"] == "stock_price_inquiry" and result["parameters"].get("symbol"):
+            for key, value in self.company_parameters(result["parameters"]["symbol"]).items():
+                result["parameters"].setdefault(key, value)
+
+
+_default_classifier: Optional[QueryClassifier] = None
+
+
+def get_query_classifier() -> QueryClassifier:
+    """프로세스 전역에서 공유하는 분류기 반환"""
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = QueryClassifier()
+    return _default_classifier
@@ -1,102 +1,216 @@
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Iterator, Optional
 from agents.base_agent import BaseAgent
-from agents.datagatherer.DataGathererAgent import DataGathererAgent
-import re
+from agents.interpreter.query_classifier import get_query_classifier
+from utils.single_flight import get_single_flight, request_key
+from utils.tracing import span, tracer
+
+HELP_RESPONSE = """📚 **실시간 AI 금융 에이전트 사용 가이드**
+
+**🔴 실제 시장 데이터 연동 버전**
+
+**✨ 지원하는 질문들:**
+
+1️⃣ **주식 가격 조회**
+   • "삼성전자 현재가" (실시간)
+   • "삼성전자의 2024-12-01 종가는?" (과거 데이터)
+   • "카카오 주가"
+
+2️⃣ **순위 조회**
+   • "상승률 상위 10개 종목" (실시간)
+   • "하락률 상위 5개 종목"
+
+3️⃣ **조건부 검색**
+   • "3% 이상 상승한 종목" (실시간)
+   • "5% 이상 오른 주식"
+   • "많이 오른 주식"
+
+4️⃣ **시장 통계**
+   • "2024-08-08에 상승한 종목은 몇 개?"
+   • "2024-08-08 코스피 시장에 거래된 종목 수"
+
+📡 **데이터 소스:**
+• yfinance (글로벌 + 한국 주식)
+• 한국투자증권 API (한국 주식 실시간)
+
+⚠️ **주의사항:**
+• 실제 시장 데이터를 사용하므로 응답 시간이 약간 소요될 수 있습니다
+• 장 마감 시간에는 데이터가 지연될 수 있습니다
+• 투자 결정시 신중한 검토가 필요합니다"""
+
+RESPONSE_FOOTER = "\n\n---\n⚠️ *실제 시장 데이터 기반 - 투자 결정시 신중한 검토 필요*"
+
+# 컨텍스트에 남기는 최근 질문 수
+CONTEXT_HISTORY_LIMIT = 20
+
+def new_context() -> Dict[str, Any]:
+    """대화 컨텍스트 (세션마다 하나)"""
+    return {
+        "conversation_history": [],
+        "previous_queries": []
+    }
 
 class OrchestratorAgent(BaseAgent):
     def __init__(self):
         super().__init__("DataOrchestrator")
         
-        # 실제 데이터 수집기 사용
-        self.data_gatherer = DataGathererAgent()
+        # 실제 데이터 수집기 사용 (pandas/yfinance 등을 끌어오므로 첫 사용 시 생성)
+        self._data_gatherer = None
         
-        # 처리 컨텍스트
-        self.context = {
-            "conversation_history": [],
-            "previous_queries": []
-        }
-    
-    def analyze_query(self, query: str) -> Dict[str, Any]:
-        """향상된 쿼리 분석"""
-        # 1. 특정 날짜의 주식 가격 조회 (시가, 종가, 고가, 저가)
-        price_match = re.search(r'(.+?)의?\s*(\d{4}-\d{2}-\d{2})\s*(시가|종가|고가|저가)(?:은|는)?\?*', query)
-        if price_match:
-            return {
-                "type": "stock_price",
-                "symbol": price_match.group(1).strip(),
-                "date": price_match.group(2),
-                "price_type": price_match.group(3)
-            }
+        # 스트리밍 모드의 AI 분석용 요약기 (첫 스트리밍 요청 시 생성)
+        self._summarizer = None
         
-        # 2. 현재 주가 조회
-        current_price_match = re.search(r'(.+?)\s*(?:의?\s*)?(현재가|주가|가격)(?:은|는)?\s*(?:얼마|어떻게)?', query)
-        if current_price_match and "날짜" not in query and not re.search(r'\d{4}-\d{2}-\d{2}', query):
-            return {
-                "type": "stock_price",
-                "symbol": current_price_match.group(1).strip()
-            }
+        # 전 종목 시세 스냅샷 (연결되어 있고 최신이면 순위/조건 검색을 네트워크 없이 처리)
+        self.market_snapshot = None
         
-        # 3. 순위 조회 (상승률 상위)
-        ranking_match = re.search(r'(상승률|하락률)\s*(상위|하위)\s*(\d+)(?:개)?(?:\s*종목)?', query)
-        if ranking_match:
-            return {
-                "type": "top_gainers" if ranking_match.group(1) == "상승률" else "top_losers",
-                "limit": int(ranking_match.group(3))
-            }
+        # 거래일 × 시장별 집계 테이블 (시장 통계 질문은 여기서만 조회, 첫 사용 시 연결)
+        self._market_aggregates = None
         
-        # 4. 조건부 검색 (% 이상 상승/하락)  
-        threshold_match = re.search(r'(\d+(?:\.\d+)?)%\s*이상\s*(상승|하락|오른|떨어진)', query)
-        if threshold_match:
-            return {
-                "type": "above_threshold",
-                "threshold": float(threshold_match.group(1)),
-                "direction": "up" if threshold_match.group(2) in ["상승", "오른"] else "down"
-            }
+        # 동시에 들어온 같은 데이터 요청은 데이터 수집기 호출 하나로 합침
+        self.fetch_flight = get_single_flight("data_gatherer")
         
-        # 5. 많이 오른 주식
-        if "많이" in query and ("오른" in query or "상승" in query):
-            return {
-                "type": "top_gainers",
-                "limit": 10
-            }
+        # 쿼리 분류기 (QueryUnderstander 와 공유)
+        self.classifier = get_query_classifier()
         
-        return {"type": "unknown"}
+        # 처리 컨텍스트 (입력에 "context" 가 없을 때 쓰는 기본 컨텍스트, 서비스 모드는 세션별 컨텍스트 전달)
+        self.context = new_context()
+        
+        # 분석 유형별 (데이터 요청 생성, 응답 렌더링)
+        self.handlers = {
+            "stock_price": (self.build_stock_price_request, self.render_stock_price),
+            "top_gainers": (self.build_top_gainers_request, self.render_top_gainers),
+            "top_losers": (self.build_top_losers_request, self.render_top_losers),
+            "above_threshold": (self.build_above_threshold_request, self.render_above_threshold),
+            "market_statistics": (self.build_market_statistics_request, self.render_market_statistics),
+        }
+    
+    @property
+    def data_gatherer(self):
+        """데이터 수집기 (첫 데이터 조회 시 import 및 생성)"""
+        if self._data_gatherer is None:
+            from agents.datagatherer.DataGathererAgent import DataGathererAgent
+            self._data_gatherer = DataGathererAgent()
+        return self._data_gatherer
+    
+    @data_gatherer.setter
+    def data_gatherer(self, agent):
+        self._data_gatherer = agent
+    
+    @property
+    def summarizer(self):
+        """AI 분석 요약기 (스트리밍 모드에서 처음 쓸 때 import 및 생성)"""
+        if self._summarizer is None:
+            from agents.responder.summarizer_agent import SummarizerAgent
+            self._summarizer = SummarizerAgent()
+        return self._summarizer
+    
+    @summarizer.setter
+    def summarizer(self, agent):
+        self._summarizer = agent
+    
+    @property
+    def market_aggregates(self):
+        """시장 집계 테이블 (첫 시장 통계 질문 시 연결)"""
+        if self._market_aggregates is None:
+            from agents.datagatherer.market_aggregates import get_market_aggregates
+            self._market_aggregates = get_market_aggregates()
+        return self._market_aggregates
+    
+    @market_aggregates.setter
+    def market_aggregates(self, store):
+        self._market_aggregates = store
+    
+    def fetch_data(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """데이터 조회 (시장 통계는 집계 테이블, 스냅샷으로 답할 수 있으면 스냅샷, 아니면 데이터 수집기)"""
+        with span("stage", stage="gather"):
+            if request["type"] == "market_statistics":
+                return self.market_aggregates.query(request)
+            snapshot = self.market_snapshot
+            if snapshot is not None and snapshot.is_ready():
+                result = snapshot.query(request)
+                if result is not None:
+                    return result
+            return self.fetch_flight.do(request_key(request), lambda: self.data_gatherer.process(request))
+    
+    async def fetch_data_async(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """데이터 조회 (비동기)"""
+        with span("stage", stage="gather"):
+            if request["type"] == "market_statistics":
+                return self.market_aggregates.query(request)
+            snapshot = self.market_snapshot
+            if snapshot is not None and snapshot.is_ready():
+                result = snapshot.query(request)
+                if result is not None:
+                    return result
+            return await self.fetch_flight.do_async(request_key(request), lambda: self.data_gatherer.process_async(request))
+    
+    def analyze_query(self, query: str) -> Dict[str, Any]:
+        """향상된 쿼리 분석"""
+        with span("stage", stage="parse"):
+            return self.classifier.analyze(query)
+    
+    def unknown_response(self, original_query: str) -> str:
+        """이해하지 못한 질문 안내"""
+        return f"🤖 '{original_query}' 질문을 이해하지 못했습니다.\n\n💡 다음과 같은 형식으로 질문해보세요:\n• \"삼성전자의 2024-08-08 종가는?\"\n• \"삼성전자 현재가\"\n• \"상승률 상위 5개 종목\"\n• \"3% 이상 상승한 종목\""
     
     def get_response(self, analysis: Dict[str, Any], original_query: str) -> str:
         """실제 데이터 기반 응답 생성"""
         try:
-            if analysis["type"] == "stock_price":
-                return self.handle_stock_price(analysis)
-                
-            elif analysis["type"] == "top_gainers":
-                return self.handle_top_gainers(analysis)
-                
-            elif analysis["type"] == "above_threshold":
-                return self.handle_above_threshold(analysis)
-                
-            else:
-                return f"🤖 '{original_query}' 질문을 이해하지 못했습니다.\n\n💡 다음과 같은 형식으로 질문해보세요:\n• \"삼성전자의 2024-08-08 종가는?\"\n• \"삼성전자 현재가\"\n• \"상승률 상위 5개 종목\"\n• \"3% 이상 상승한 종목\""
+            handler = self.handlers.get(analysis["type"])
+            if handler is None:
+                return self.unknown_response(original_query)
+            
+            build_request, render = handler
+            result = self.fetch_data(build_request(analysis))
+            with span("stage", stage="format"):
+                return render(analysis, result)
+        
+        except Exception as e:
+            return f"❌ 처리 중 오류가 발생했습니다: {str(e)}"
+    
+    async def get_response_async(self, analysis: Dict[str, Any], original_query: str) -> str:
+        """실제 데이터 기반 응답 생성 (비동기)"""
+        try:
+            handler = self.handlers.get(analysis["type"])
+            if handler is None:
+                return self.unknown_response(original_query)
+            
+            build_request, render = handler
+            result = await self.fetch_data_async(build_request(analysis))
+            with span("stage", stage="format"):
+                return render(analysis, result)
         
         except Exception as e:
             return f"❌ 처리 중 오류가 발생했습니다: {str(e)}"
     
     def handle_stock_price(self, analysis: Dict[str, Any]) -> str:
         """주식 가격 조회 처리"""
-        symbol = analysis["symbol"]
-        date = analysis.get("date")
-        price_type = analysis.get("price_type", "current")
-        
+        return self.render_stock_price(analysis, self.fetch_data(self.build_stock_price_request(analysis)))
+    
+    def build_stock_price_request(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """주식 가격 조회 요청 생성"""
         # 실제 데이터 조회
         request_data = {
             "type": "stock_price",
             "parameters": {
-                "symbol": symbol,
-                "date": date,
-                "price_type": price_type
+                "symbol": analysis["symbol"],
+                "date": analysis.get("date"),
+                "price_type": analysis.get("price_type", "current")
             }
         }
         
-        result = self.data_gatherer.process(request_data)
+        # 회사 목록에서 확인된 종목코드/corp_code 가 있으면 함께 전달
+        for key in ("stock_code", "corp_code"):
+            if analysis.get(key):
+                request_data["parameters"][key] = analysis[key]
+        
+        return request_data
+    
+    def render_stock_price(self, analysis: Dict[str, Any], result: Dict[str, Any]) -> str:
+        """주식 가격 조회 응답 생성"""
+        symbol = analysis["symbol"]
+        date = analysis.get("date")
+        price_type = analysis.get("price_type", "current")
         
         if result["status"] == "success":
             data = result["data"]
@@ -131,6 +245,10 @@ class OrchestratorAgent(BaseAgent):
     
     def handle_top_gainers(self, analysis: Dict[str, Any]) -> str:
         """상승률 상위 종목 처리"""
+        return self.render_top_gainers(analysis, self.fetch_data(self.build_top_gainers_request(analysis)))
+    
+    def build_top_gainers_request(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """상승률 상위 종목 요청 생성"""
         limit = analysis.get("limit", 10)
         
         request_data = {
@@ -140,8 +258,10 @@ class OrchestratorAgent(BaseAgent):
             }
         }
         
-        result = self.data_gatherer.process(request_data)
-        
+        return request_data
+    
+    def render_top_gainers(self, analysis: Dict[str, Any], result: Dict[str, Any]) -> str:
+        """상승률 상위 종목 응답 생성"""
         if result["status"] == "success":
             data = result["data"]
             
@@ -164,8 +284,49 @@ class OrchestratorAgent(BaseAgent):
         else:
             return f"❌ 상승률 데이터 조회 실패: {result.get('message', '알 수 없는 오류')}"
     
+    def handle_top_losers(self, analysis: Dict[str, Any]) -> str:
+        """하락률 상위 종목 처리"""
+        return self.render_top_losers(analysis, self.fetch_data(self.build_top_losers_request(analysis)))
+    
+    def build_top_losers_request(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """하락률 상위 종목 요청 생성"""
+        return {
+            "type": "top_losers",
+            "parameters": {
+                "limit": analysis.get("limit", 10)
+            }
+        }
+    
+    def render_top_losers(self, analysis: Dict[str, Any], result: Dict[str, Any]) -> str:
+        """하락률 상위 종목 응답 생성"""
+        if result["status"] == "success":
+            data = result["data"]
+            
+            if not data:
+                return "❌ 하락률 데이터를 조회할 수 없습니다."
+            
+            response = f"📉 **실시간 하락률 상위 {len(data)}개 종목**\n\n"
+            
+            for i, stock in enumerate(data, 1):
+                symbol = stock.get("symbol", "")
+                price = stock.get("current_price", 0)
+                change_rate = stock.get("change_rate", 0)
+                volume = stock.get("volume", 0)
+                
+                response += f"🔻 {i}. **{symbol}**: {price:,}원 ({change_rate:+.2f}%)\n"
+                response += f"   └ 거래량: {volume:,}주\n\n"
+            
+            response += "📡 *실시간 시장 데이터*"
+            return response
+        else:
+            return f"❌ 하락률 데이터 조회 실패: {result.get('message', '알 수 없는 오류')}"
+    
     def handle_above_threshold(self, analysis: Dict[str, Any]) -> str:
         """임계값 이상 조회 처리"""
+        return self.render_above_threshold(analysis, self.fetch_data(self.build_above_threshold_request(analysis)))
+    
+    def build_above_threshold_request(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """임계값 이상 조회 요청 생성"""
         threshold = analysis.get("threshold", 3.0)
         direction = analysis.get("direction", "up")
         
@@ -177,7 +338,12 @@ class OrchestratorAgent(BaseAgent):
             }
         }
         
-        result = self.data_gatherer.process(request_data)
+        return request_data
+    
+    def render_above_threshold(self, analysis: Dict[str, Any], result: Dict[str, Any]) -> str:
+        """임계값 이상 조회 응답 생성"""
+        threshold = analysis.get("threshold", 3.0)
+        direction = analysis.get("direction", "up")
         
         if result["status"] == "success":
             data = result["data"]
@@ -205,8 +371,55 @@ class OrchestratorAgent(BaseAgent):
         else:
             return f"❌ 조건부 검색 실패: {result.get('message', '알 수 없는 오류')}"
     
+    def build_market_statistics_request(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """시장 통계 요청 생성"""
+        return {
+            "type": "market_statistics",
+            "parameters": {
+                "date": analysis["date"],
+                "market": analysis.get("market", "ALL")
+            }
+        }
+    
+    def render_market_statistics(self, analysis: Dict[str, Any], result: Dict[str, Any]) -> str:
+        """시장 통계 응답 생성"""
+        if result["status"] != "success":
+            return f"❌ 시장 통계 조회 실패: {result.get('message', '알 수 없는 오류')}"
+        
+        data = result["data"]
+        market = "전체 시장" if data["market"] == "ALL" else data["market"]
+        
+        if analysis.get("sub_type") == "movement_count":
+            if analysis.get("movement") == "down":
+                headline = f"📉 하락 종목: {data['decliners']:,}개"
+            else:
+                headline = f"📈 상승 종목: {data['advancers']:,}개"
+            response = f"📊 **{data['date']} {market} {'하락' if analysis.get('movement') == 'down' else '상승'} 종목 수**\n\n{headline}\n"
+        else:
+            response = f"📊 **{data['date']} {market} 거래 종목 수**\n\n🔢 거래된 종목: {data['traded']:,}개\n"
+        
+        response += f"   └ 상승 {data['advancers']:,} / 하락 {data['decliners']:,} / 보합 {data['unchanged']:,} (거래 {data['traded']:,}개)\n"
+        response += f"📊 거래량 합계: {data['total_volume']:,}주\n\n"
+        response += "📡 *일별 시장 집계 데이터*"
+        return response
+    
+    def is_help_query(self, query: str) -> bool:
+        """도움말 요청 여부"""
+        return any(word in query.lower() for word in ["도움말", "help", "사용법"])
+    
+    def record_turn(self, input_data: Dict[str, Any], query: str, analysis: Dict[str, Any]):
+        """질문과 분석 유형을 컨텍스트에 기록 (최근 CONTEXT_HISTORY_LIMIT 개만 유지)"""
+        context = input_data.get("context")
+        if context is None:
+            context = self.context
+        context["previous_queries"].append(query)
+        context["conversation_history"].append({"query": query, "type": analysis["type"]})
+        for key in ("previous_queries", "conversation_history"):
+            del context[key][:-CONTEXT_HISTORY_LIMIT]
+    
     def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """메인 처리 (실제 데이터 사용)"""
+        started = time.perf_counter()
         try:
             query = input_data.get("query", "").strip()
             
@@ -214,54 +427,106 @@ class OrchestratorAgent(BaseAgent):
                 return {"status": "error", "message": "쿼리가 비어있습니다."}
             
             # 도움말
-            if any(word in query.lower() for word in ["도움말", "help", "사용법"]):
-                return {
-                    "status": "success",
-                    "response": """📚 **실시간 AI 금융 에이전트 사용 가이드**
-
-**🔴 실제 시장 데이터 연동 버전**
-
-**✨ 지원하는 질문들:**
-
-1️⃣ **주식 가격 조회**
-   • "삼성전자 현재가" (실시간)
-   • "삼성전자의 2024-12-01 종가는?" (과거 데이터)
-   • "카카오 주가"
-
-2️⃣ **순위 조회**
-   • "상승률 상위 10개 종목" (실시간)
-   • "상승률 상위 5개 종목"
-
-3️⃣ **조건부 검색**
-   • "3% 이상 상승한 종목" (실시간)
-   • "5% 이상 오른 주식"
-   • "많이 오른 주식"
-
-📡 **데이터 소스:**
-• yfinance (글로벌 + 한국 주식)
-• 한국투자증권 API (한국 주식 실시간)
-
-⚠️ **주의사항:**
-• 실제 시장 데이터를 사용하므로 응답 시간이 약간 소요될 수 있습니다
-• 장 마감 시간에는 데이터가 지연될 수 있습니다
-• 투자 결정시 신중한 검토가 필요합니다"""
-                }
+            if self.is_help_query(query):
+                return {"status": "success", "response": HELP_RESPONSE}
             
             # 쿼리 분석
             analysis = self.analyze_query(query)
             
             # 응답 생성
             response = self.get_response(analysis, query)
-            response += "\n\n---\n⚠️ *실제 시장 데이터 기반 - 투자 결정시 신중한 검토 필요*"
+            self.record_turn(input_data, query, analysis)
+            tracer.observe("query", time.perf_counter() - started, type=analysis["type"])
             
             return {
                 "status": "success", 
-                "response": response
+                "response": response + RESPONSE_FOOTER
+            }
+            
+        except Exception as e:
+            self.log_error("실제 데이터 오케스트레이터 처리 실패: %s", e)
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+    
+    async def process_async(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """메인 처리 (비동기, 데이터 수집기의 process_async 사용)"""
+        started = time.perf_counter()
+        try:
+            query = input_data.get("query", "").strip()
+            
+            if not query:
+                return {"status": "error", "message": "쿼리가 비어있습니다."}
+            
+            if self.is_help_query(query):
+                return {"status": "success", "response": HELP_RESPONSE}
+            
+            analysis = self.analyze_query(query)
+            response = await self.get_response_async(analysis, query)
+            self.record_turn(input_data, query, analysis)
+            tracer.observe("query", time.perf_counter() - started, type=analysis["type"])
+            
+            return {
+                "status": "success",
+                "response": response + RESPONSE_FOOTER
             }
             
         except Exception as e:
-            self.log_error(f"실제 데이터 오케스트레이터 처리 실패: {str(e)}")
+            self.log_error("실제 데이터 오케스트레이터 처리 실패: %s", e)
             return {
                 "status": "error",
                 "message": str(e)
-            }
\ No newline at end of file
+            }
+    
+    def analysis_data(self, analysis: Dict[str, Any], result: Dict[str, Any]) -> Optional[Any]:
+        """AI 분석에 넘길 조회 데이터 (현재가/순위 조회 성공 시에만)"""
+        if result.get("status") != "success" or not result.get("data"):
+            return None
+        
+        data = result["data"]
+        if isinstance(data, dict):
+            if "error" in data or "current_price" not in data:
+                return None
+            return dict(data, symbol=data.get("symbol") or analysis.get("symbol"))
+        return data
+    
+    def process_stream(self, input_data: Dict[str, Any]) -> Iterator[str]:
+        """메인 처리 (스트리밍): 조회 결과를 먼저 내보내고 AI 분석은 토큰 단위로 이어서 전달"""
+        query = input_data.get("query", "").strip()
+        
+        if not query:
+            yield "❌ 쿼리가 비어있습니다."
+            return
+        
+        if self.is_help_query(query):
+            yield HELP_RESPONSE
+            return
+        
+        analysis = self.analyze_query(query)
+        handler = self.handlers.get(analysis["type"])
+        if handler is None:
+            yield self.unknown_response(query)
+            return
+        
+        build_request, render = handler
+        try:
+            result = self.fetch_data(build_request(analysis))
+            with span("stage", stage="format"):
+                rendered = render(analysis, result)
+        except Exception as e:
+            yield f"❌ 처리 중 오류가 발생했습니다: {str(e)}"
+            return
+        
+        yield rendered
+        
+        data = self.analysis_data(analysis, result)
+        if data:
+            try:
+                tokens = self.summarizer.analysis_stream(data)
+                yield "\n\n🤖 **AI 분석**: "
+                yield from tokens
+            except Exception as e:
+                self.log_error("AI 분석 스트리밍 실패: %s", e)
+        
+        yield RESPONSE_FOOTER
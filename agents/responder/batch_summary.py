@@ -0,0 +1,78 @@
+import re
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Callable, Awaitable, Iterable
+
+# 한 번의 프롬프트에 담는 최대 종목 수와 종목당 응답 토큰
+BATCH_MAX_STOCKS = 20
+BATCH_TOKENS_PER_STOCK = 150
+BATCH_MAX_TOKENS = 4000
+DEFAULT_CONCURRENCY = 4
+
+_SECTION_HEADING = re.compile(r"^\s*#{2,4}\s*\[?(.+?)\]?\s*$", re.MULTILINE)
+
+
+def chunked(items: List[Any], size: int) -> Iterable[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def batch_max_tokens(count: int) -> int:
+    return min(BATCH_TOKENS_PER_STOCK * count + 100, BATCH_MAX_TOKENS)
+
+
+def build_batch_prompt(stocks: List[Dict[str, Any]]) -> str:
+    """여러 종목을 하나의 구조화된 프롬프트로 묶기 (종목별 '### 종목명' 섹션으로 답하도록 요청)"""
+    prompt = "다음 실시간 주식 정보를 종목별로 분석해서 투자자에게 유용한 인사이트를 제공해주세요.\n\n"
+    for stock in stocks:
+        prompt += (
+            f"[{stock.get('symbol', '알 수 없음')}] "
+            f"현재가 {stock.get('current_price', 0):,}원, "
+            f"변동률 {stock.get('change_rate', 0):+.2f}%, "
+            f"거래량 {stock.get('volume', 0):,}주\n"
+        )
+    prompt += """
+응답 형식:
+- 종목마다 '### 종목명' 한 줄로 시작하고, 그 아래에 2-3줄로 요약해주세요.
+- 위에 나온 순서대로, 모든 종목에 대해 빠짐없이 작성해주세요.
+"""
+    return prompt
+
+
+def split_batch_answer(answer: str, symbols: List[str]) -> Dict[str, str]:
+    """묶음 응답을 '### 종목명' 섹션별로 나누기 (요청하지 않은 종목·빈 섹션은 제외)"""
+    wanted = {symbol.strip(): symbol for symbol in symbols}
+    sections: Dict[str, str] = {}
+
+    headings = list(_SECTION_HEADING.finditer(answer))
+    for index, heading in enumerate(headings):
+        name = heading.group(1).strip().strip("*").strip()
+        symbol = wanted.get(name)
+        if symbol is None or symbol in sections:
+            continue
+        end = headings[index + 1].start() if index + 1 < len(headings) else len(answer)
+        body = answer[heading.end():end].strip()
+        if body:
+            sections[symbol] = body
+
+    return sections
+
+
+def fan_out(call: Callable[[Any], str], items: List[Any], max_concurrency: int = DEFAULT_CONCURRENCY) -> List[str]:
+    """항목(프롬프트)별 호출을 최대 max_concurrency 개씩 동시에 실행 (입력 순서 유지)"""
+    if len(items) <= 1 or max_concurrency <= 1:
+        return [call(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(items))) as executor:
+        return list(executor.map(call, items))
+
+
+async def fan_out_async(call: Callable[[Any], Awaitable[str]], items: List[Any],
+                        max_concurrency: int = DEFAULT_CONCURRENCY) -> List[str]:
+    """fan_out 의 비동기 버전 (세마포어로 동시 호출 수 제한)"""
+    semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+    async def limited(item: Any) -> str:
+        async with semaphore:
+            return await call(item)
+
+    return list(await asyncio.gather(*(limited(item) for item in items)))
@@ -1,9 +1,29 @@
-import requests
 import json
-from typing import Dict, Any, List
+import time
+from typing import Dict, Any, List, Iterator
 from agents.base_agent import BaseAgent
+from utils.http_client import get_http_client, get_async_client
+from utils.completion_cache import get_completion_cache, completion_key
+from utils.single_flight import get_single_flight
+from utils.rate_limiter import get_rate_limiter
+from utils.circuit_breaker import get_circuit_breaker, CircuitOpenError
+from utils.tracing import span
+from utils.sse import iter_sse_events, iter_clova_tokens
+from agents.responder.batch_summary import (
+    BATCH_MAX_STOCKS, DEFAULT_CONCURRENCY, batch_max_tokens, build_batch_prompt, chunked,
+    fan_out, fan_out_async, split_batch_answer,
+)
 from config import HYPERCLOVA_URL, HYPERCLOVA_API_KEY, HYPERCLOVA_API_GATEWAY_KEY, generate_request_id
 
+SYSTEM_PROMPT = '''당신은 전문 주식 애널리스트입니다. 
+실시간 주식 데이터를 바탕으로 투자자들이 이해하기 쉽게 분석하고 요약해주세요.
+- 객관적이고 정확한 정보 전달
+- 투자 위험에 대한 적절한 경고
+- 쉽고 명확한 표현 사용'''
+
+# 스트리밍 시 렌더링 결과에서 AI 분석이 들어갈 자리
+_AI_PLACEHOLDER = "\x00AI_ANALYSIS\x00"
+
 class SummarizerAgent(BaseAgent):
     def __init__(self):
         super().__init__("RealSummarizer")
@@ -15,6 +35,87 @@ class SummarizerAgent(BaseAgent):
             self.log_info("HyperCLOVA API 사용 가능")
         else:
             self.log_info("HyperCLOVA API 키가 없어 기본 요약 모드로 동작")
+        
+        # 같은 프롬프트/파라미터의 응답 캐시 (장중 짧게, 장 마감 후 다음 개장까지)
+        self.completion_cache = get_completion_cache()
+        
+        # 캐시에 없는 같은 프롬프트가 동시에 들어오면 API 호출 하나로 합침
+        self.completion_flight = get_single_flight("hyperclova")
+        
+        # HyperCLOVA 분당 호출 한도 (모든 워커 프로세스가 같은 버킷 공유)
+        self.rate_limiter = get_rate_limiter("hyperclova")
+        
+        # 장애/지연이 이어지면 호출을 차단하고 기본 요약으로 바로 응답
+        self.breaker = get_circuit_breaker("hyperclova")
+    
+    def build_hyperclova_request(self, prompt: str, max_tokens: int = 500):
+        """HyperCLOVA 요청 헤더와 본문 생성"""
+        headers = {
+            'X-NCP-CLOVASTUDIO-API-KEY': HYPERCLOVA_API_KEY,
+            'X-NCP-APIGW-API-KEY': HYPERCLOVA_API_GATEWAY_KEY,
+            'X-NCP-CLOVASTUDIO-REQUEST-ID': generate_request_id(),
+            'Content-Type': 'application/json'
+        }
+        
+        data = {
+            'messages': [
+                {
+                    'role': 'system',
+                    'content': SYSTEM_PROMPT
+                },
+                {
+                    'role': 'user',
+                    'content': prompt
+                }
+            ],
+            'topP': 0.8,
+            'topK': 0,
+            'maxTokens': max_tokens,
+            'temperature': 0.3,  # 정확성을 위해 낮게 설정
+            'repeatPenalty': 5.0,
+            'stopBefore': [],
+            'includeAiFilters': True
+        }
+        return headers, data
+    
+    def completion_key(self, data: Dict[str, Any]) -> str:
+        """요청 본문의 메시지와 샘플링 파라미터로 캐시 키 생성"""
+        params = {name: data[name] for name in ('topP', 'topK', 'maxTokens', 'temperature', 'repeatPenalty')}
+        return completion_key(data['messages'], params)
+    
+    def completion_cache_stats(self) -> Dict[str, Any]:
+        """응답 캐시 적중률과 절약한 지연 시간"""
+        return self.completion_cache.stats()
+    
+    @staticmethod
+    def _response_content(response) -> str:
+        if response.status_code != 200:
+            raise RuntimeError(f"HyperCLOVA API 호출 실패: {response.status_code}")
+        return response.json()['result']['message']['content']
+    
+    def _request_hyperclova(self, headers: Dict[str, str], data: Dict[str, Any], key: str) -> str:
+        """HyperCLOVA API 요청 한 번 (차단 중이면 CircuitOpenError, 성공하면 캐시에 저장)"""
+        started = time.perf_counter()
+        with span("upstream", service="hyperclova"):
+            # 차단 중이면 토큰을 쓰지 않고 바로 실패, 토큰 대기는 요청 마감까지만
+            content = self.breaker.call(lambda timeout: self._response_content(
+                get_http_client(HYPERCLOVA_URL).post(HYPERCLOVA_URL, headers=headers, json=data, timeout=timeout)),
+                acquire=self.rate_limiter.acquire)
+        self.completion_cache.put(key, content, time.perf_counter() - started)
+        return content
+    
+    async def _request_hyperclova_async(self, headers: Dict[str, str], data: Dict[str, Any], key: str) -> str:
+        """HyperCLOVA API 비동기 요청 한 번"""
+        started = time.perf_counter()
+        
+        async def post(timeout: float) -> str:
+            response = await get_async_client(HYPERCLOVA_URL).post(HYPERCLOVA_URL, headers=headers, json=data, timeout=timeout)
+            return self._response_content(response)
+        
+        with span("upstream", service="hyperclova"):
+            content = await self.breaker.call_async(post, acquire=self.rate_limiter.acquire_async)
+        await self.completion_cache.put_async(key, content, time.perf_counter() - started)
+        return content
     
     def call_hyperclova(self, prompt: str, max_tokens: int = 500) -> str:
         """HyperCLOVA API 호출"""
@@ -22,50 +123,94 @@ class SummarizerAgent(BaseAgent):
             return self._fallback_summary(prompt)
         
         try:
-            headers = {
-                'X-NCP-CLOVASTUDIO-API-KEY': HYPERCLOVA_API_KEY,
-                'X-NCP-APIGW-API-KEY': HYPERCLOVA_API_GATEWAY_KEY,
-                'X-NCP-CLOVASTUDIO-REQUEST-ID': generate_request_id(),
-                'Content-Type': 'application/json'
-            }
-            
-            data = {
-                'messages': [
-                    {
-                        'role': 'system',
-                        'content': '''당신은 전문 주식 애널리스트입니다. 
-실시간 주식 데이터를 바탕으로 투자자들이 이해하기 쉽게 분석하고 요약해주세요.
-- 객관적이고 정확한 정보 전달
-- 투자 위험에 대한 적절한 경고
-- 쉽고 명확한 표현 사용'''
-                    },
-                    {
-                        'role': 'user',
-                        'content': prompt
-                    }
-                ],
-                'topP': 0.8,
-                'topK': 0,
-                'maxTokens': max_tokens,
-                'temperature': 0.3,  # 정확성을 위해 낮게 설정
-                'repeatPenalty': 5.0,
-                'stopBefore': [],
-                'includeAiFilters': True
-            }
+            headers, data = self.build_hyperclova_request(prompt, max_tokens)
+            key = self.completion_key(data)
+            cached = self.completion_cache.get(key)
+            if cached is not None:
+                return cached
             
-            response = requests.post(HYPERCLOVA_URL, headers=headers, json=data, timeout=30)
+            with span("stage", stage="summarize"):
+                return self.completion_flight.do(key, lambda: self._request_hyperclova(headers, data, key))
+        
+        except CircuitOpenError:
+            return self._fallback_summary(prompt)
+        except Exception as e:
+            self.log_error("HyperCLOVA API 호출 중 오류: %s", e)
+            return self._fallback_summary(prompt)
+    
+    async def call_hyperclova_async(self, prompt: str, max_tokens: int = 500) -> str:
+        """HyperCLOVA API 비동기 호출 (공유 AsyncClient 사용)"""
+        if not self.hyperclova_available:
+            return self._fallback_summary(prompt)
+        
+        try:
+            headers, data = self.build_hyperclova_request(prompt, max_tokens)
+            key = self.completion_key(data)
+            cached = await self.completion_cache.get_async(key)
+            if cached is not None:
+                return cached
             
-            if response.status_code == 200:
-                result = response.json()
-                return result['result']['message']['content']
-            else:
-                self.log_error(f"HyperCLOVA API 호출 실패: {response.status_code}")
-                return self._fallback_summary(prompt)
-                
+            with span("stage", stage="summarize"):
+                return await self.completion_flight.do_async(key, lambda: self._request_hyperclova_async(headers, data, key))
+        
+        except CircuitOpenError:
+            return self._fallback_summary(prompt)
         except Exception as e:
-            self.log_error(f"HyperCLOVA API 호출 중 오류: {str(e)}")
+            self.log_error("HyperCLOVA API 호출 중 오류: %s", e)
             return self._fallback_summary(prompt)
     
+    def call_hyperclova_stream(self, prompt: str, max_tokens: int = 500) -> Iterator[str]:
+        """HyperCLOVA API 스트리밍 호출 (토큰이 도착하는 대로 내보내고, 완료되면 캐시에 저장)"""
+        if not self.hyperclova_available:
+            yield self._fallback_summary(prompt)
+            return
+        
+        headers, data = self.build_hyperclova_request(prompt, max_tokens)
+        key = self.completion_key(data)
+        cached = self.completion_cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+        
+        headers['Accept'] = 'text/event-stream'
+        started = time.perf_counter()
+        tokens = []
+        call_started = None
+        recorded = False
+        try:
+            timeout = self.breaker.admit(self.rate_limiter.acquire)
+            call_started = time.monotonic()
+            with get_http_client(HYPERCLOVA_URL).stream("POST", HYPERCLOVA_URL, headers=headers, json=data, timeout=timeout) as response:
+                if response.status_code != 200:
+                    raise RuntimeError(f"HyperCLOVA API 호출 실패: {response.status_code}")
+                
+                for token in iter_clova_tokens(iter_sse_events(response.iter_lines())):
+                    if not recorded:
+                        # 스트림은 전체 길이가 답변 길이에 달려 있으므로 첫 토큰까지의 지연으로 판단
+                        self.breaker.record(time.monotonic() - call_started, True)
+                        recorded = True
+                    tokens.append(token)
+                    yield token
+        
+        except CircuitOpenError:
+            yield self._fallback_summary(prompt)
+            return
+        except Exception as e:
+            if call_started is not None and not recorded:
+                self.breaker.record(time.monotonic() - call_started, False)
+                recorded = True
+            self.log_error("HyperCLOVA 스트리밍 중 오류: %s", e)
+            if not tokens:
+                yield self._fallback_summary(prompt)
+            return
+        finally:
+            # 토큰 없이 끝났거나 소비자가 먼저 닫은 경우에도 half-open 탐색이 끝나도록 기록
+            if call_started is not None and not recorded:
+                self.breaker.record(time.monotonic() - call_started, True)
+        
+        if tokens:
+            self.completion_cache.put(key, "".join(tokens), time.perf_counter() - started)
+    
     def _fallback_summary(self, prompt: str) -> str:
         """API 실패시 대체 요약"""
         if "실시간" in prompt or "현재가" in prompt:
@@ -110,19 +255,14 @@ class SummarizerAgent(BaseAgent):
             "total": total
         }
     
-    def format_stock_summary(self, stock_data: Dict[str, Any], query_type: str = "single") -> str:
-        """개별 주식 데이터 요약"""
-        if "error" in stock_data:
-            return f"❌ 오류: {stock_data['error']}"
-        
+    def build_stock_prompt(self, stock_data: Dict[str, Any]) -> str:
+        """개별 주식 분석 프롬프트"""
         symbol = stock_data.get('symbol', '알 수 없음')
         current_price = stock_data.get('current_price', 0)
         change_rate = stock_data.get('change_rate', 0)
         volume = stock_data.get('volume', 0)
-        data_source = stock_data.get('data_source', 'unknown')
         
-        # HyperCLOVA를 사용한 분석
-        prompt = f"""
+        return f"""
 다음 실시간 주식 정보를 분석해서 투자자에게 유용한 인사이트를 제공해주세요:
 
 종목: {symbol}
@@ -137,8 +277,14 @@ class SummarizerAgent(BaseAgent):
 
 간결하고 명확하게 2-3줄로 요약해주세요.
 """
-        
-        ai_analysis = self.call_hyperclova(prompt, 300)
+    
+    def render_stock_summary(self, stock_data: Dict[str, Any], ai_analysis: str) -> str:
+        """개별 주식 요약 응답 구성"""
+        symbol = stock_data.get('symbol', '알 수 없음')
+        current_price = stock_data.get('current_price', 0)
+        change_rate = stock_data.get('change_rate', 0)
+        volume = stock_data.get('volume', 0)
+        data_source = stock_data.get('data_source', 'unknown')
         
         # 기본 정보 표시
         trend_emoji = "📈" if change_rate > 0 else "📉" if change_rate < 0 else "➡️"
@@ -151,15 +297,83 @@ class SummarizerAgent(BaseAgent):
         
         return result
     
-    def format_ranking_summary(self, stock_list: List[Dict[str, Any]], query_type: str = "ranking") -> str:
-        """순위 데이터 요약"""
-        if not stock_list:
-            return "❌ 조회된 종목이 없습니다."
+    def format_stock_summary(self, stock_data: Dict[str, Any], query_type: str = "single") -> str:
+        """개별 주식 데이터 요약"""
+        if "error" in stock_data:
+            return f"❌ 오류: {stock_data['error']}"
         
-        # 시장 심리 분석
-        market_sentiment = self.analyze_market_sentiment(stock_list)
+        # HyperCLOVA를 사용한 분석
+        ai_analysis = self.call_hyperclova(self.build_stock_prompt(stock_data), 300)
+        return self.render_stock_summary(stock_data, ai_analysis)
+    
+    async def format_stock_summary_async(self, stock_data: Dict[str, Any], query_type: str = "single") -> str:
+        """개별 주식 데이터 요약 (비동기)"""
+        if "error" in stock_data:
+            return f"❌ 오류: {stock_data['error']}"
         
-        # 상위 종목들 정보
+        ai_analysis = await self.call_hyperclova_async(self.build_stock_prompt(stock_data), 300)
+        return self.render_stock_summary(stock_data, ai_analysis)
+    
+    def format_stock_summaries(self, stock_list: List[Dict[str, Any]], mode: str = "packed",
+                               max_concurrency: int = DEFAULT_CONCURRENCY) -> Dict[str, str]:
+        """여러 종목 요약을 한꺼번에 생성 ({종목: 요약}, 입력 순서 유지)
+        
+        packed: 최대 BATCH_MAX_STOCKS 개씩 하나의 프롬프트로 묶어 호출한 뒤 종목별로 분리
+        fanout: 종목별 프롬프트를 max_concurrency 개씩 동시에 호출
+        응답에서 빠진 종목은 _fallback_summary 로 채운다.
+        """
+        valid = [stock for stock in stock_list if "error" not in stock]
+        
+        if mode == "fanout":
+            prompts = [self.build_stock_prompt(stock) for stock in valid]
+            answers = fan_out(lambda prompt: self.call_hyperclova(prompt, 300), prompts, max_concurrency)
+            analyses = {stock.get('symbol', '알 수 없음'): answer for stock, answer in zip(valid, answers)}
+        else:
+            chunks = list(chunked(valid, BATCH_MAX_STOCKS))
+            requests = [(build_batch_prompt(chunk), batch_max_tokens(len(chunk))) for chunk in chunks]
+            answers = fan_out(lambda request: self.call_hyperclova(*request), requests, max_concurrency)
+            analyses = {}
+            for chunk, answer in zip(chunks, answers):
+                analyses.update(split_batch_answer(answer, [stock.get('symbol', '알 수 없음') for stock in chunk]))
+        
+        return self.render_stock_summaries(stock_list, analyses)
+    
+    async def format_stock_summaries_async(self, stock_list: List[Dict[str, Any]], mode: str = "packed",
+                                           max_concurrency: int = DEFAULT_CONCURRENCY) -> Dict[str, str]:
+        """여러 종목 요약을 한꺼번에 생성 (비동기, 묶음 프롬프트도 동시에 호출)"""
+        valid = [stock for stock in stock_list if "error" not in stock]
+        
+        if mode == "fanout":
+            prompts = [self.build_stock_prompt(stock) for stock in valid]
+            answers = await fan_out_async(lambda prompt: self.call_hyperclova_async(prompt, 300),
+                                          prompts, max_concurrency)
+            analyses = {stock.get('symbol', '알 수 없음'): answer for stock, answer in zip(valid, answers)}
+        else:
+            chunks = list(chunked(valid, BATCH_MAX_STOCKS))
+            requests = [(build_batch_prompt(chunk), batch_max_tokens(len(chunk))) for chunk in chunks]
+            answers = await fan_out_async(lambda request: self.call_hyperclova_async(*request),
+                                          requests, max_concurrency)
+            analyses = {}
+            for chunk, answer in zip(chunks, answers):
+                analyses.update(split_batch_answer(answer, [stock.get('symbol', '알 수 없음') for stock in chunk]))
+        
+        return self.render_stock_summaries(stock_list, analyses)
+    
+    def render_stock_summaries(self, stock_list: List[Dict[str, Any]], analyses: Dict[str, str]) -> Dict[str, str]:
+        """종목별 요약 응답 구성 (분석이 없는 종목은 대체 요약)"""
+        summaries = {}
+        for stock in stock_list:
+            symbol = stock.get('symbol', '알 수 없음')
+            if "error" in stock:
+                summaries[symbol] = f"❌ 오류: {stock['error']}"
+                continue
+            
+            ai_analysis = analyses.get(symbol) or self._fallback_summary(self.build_stock_prompt(stock))
+            summaries[symbol] = self.render_stock_summary(stock, ai_analysis)
+        return summaries
+    
+    def top_stocks_info(self, stock_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """상위 5개 종목 정보"""
         top_stocks_info = []
         for i, stock in enumerate(stock_list[:5], 1):
             symbol = stock.get('symbol', '알 수 없음')
@@ -174,8 +388,10 @@ class SummarizerAgent(BaseAgent):
                 "change": change,
                 "volume": volume
             })
-        
-        # HyperCLOVA를 사용한 시장 분석
+        return top_stocks_info
+    
+    def build_ranking_prompt(self, market_sentiment: Dict[str, Any], top_stocks_info: List[Dict[str, Any]]) -> str:
+        """순위 데이터 시장 분석 프롬프트"""
         prompt = f"""
 다음 실시간 주식 순위 데이터를 분석해서 현재 시장 상황을 요약해주세요:
 
@@ -193,10 +409,11 @@ class SummarizerAgent(BaseAgent):
         prompt += """
 현재 시장 상황과 투자자가 주목해야 할 점을 3-4줄로 분석해주세요.
 """
-        
-        ai_analysis = self.call_hyperclova(prompt, 400)
-        
-        # 응답 구성
+        return prompt
+    
+    def render_ranking_summary(self, stock_list: List[Dict[str, Any]], market_sentiment: Dict[str, Any],
+                               top_stocks_info: List[Dict[str, Any]], ai_analysis: str) -> str:
+        """순위 요약 응답 구성"""
         sentiment_emoji = {
             '매우 긍정적': '🚀',
             '긍정적': '📈',
@@ -221,6 +438,84 @@ class SummarizerAgent(BaseAgent):
         
         return result
     
+    def format_ranking_summary(self, stock_list: List[Dict[str, Any]], query_type: str = "ranking") -> str:
+        """순위 데이터 요약"""
+        if not stock_list:
+            return "❌ 조회된 종목이 없습니다."
+        
+        # 시장 심리 분석
+        market_sentiment = self.analyze_market_sentiment(stock_list)
+        top_stocks_info = self.top_stocks_info(stock_list)
+        
+        # HyperCLOVA를 사용한 시장 분석
+        ai_analysis = self.call_hyperclova(self.build_ranking_prompt(market_sentiment, top_stocks_info), 400)
+        return self.render_ranking_summary(stock_list, market_sentiment, top_stocks_info, ai_analysis)
+    
+    async def format_ranking_summary_async(self, stock_list: List[Dict[str, Any]], query_type: str = "ranking") -> str:
+        """순위 데이터 요약 (비동기)"""
+        if not stock_list:
+            return "❌ 조회된 종목이 없습니다."
+        
+        market_sentiment = self.analyze_market_sentiment(stock_list)
+        top_stocks_info = self.top_stocks_info(stock_list)
+        
+        ai_analysis = await self.call_hyperclova_async(self.build_ranking_prompt(market_sentiment, top_stocks_info), 400)
+        return self.render_ranking_summary(stock_list, market_sentiment, top_stocks_info, ai_analysis)
+    
+    def _stream_rendered(self, rendered: str, tokens: Iterator[str]) -> Iterator[str]:
+        """렌더링 결과의 AI 분석 자리에 토큰을 흘려 넣으며 조각 단위로 반환"""
+        before, _, after = rendered.partition(_AI_PLACEHOLDER)
+        yield before
+        yield from tokens
+        if after:
+            yield after
+    
+    def format_stock_summary_stream(self, stock_data: Dict[str, Any], query_type: str = "single") -> Iterator[str]:
+        """개별 주식 데이터 요약 (스트리밍)"""
+        if "error" in stock_data:
+            yield f"❌ 오류: {stock_data['error']}"
+            return
+        
+        tokens = self.call_hyperclova_stream(self.build_stock_prompt(stock_data), 300)
+        yield from self._stream_rendered(self.render_stock_summary(stock_data, _AI_PLACEHOLDER), tokens)
+    
+    def format_ranking_summary_stream(self, stock_list: List[Dict[str, Any]], query_type: str = "ranking") -> Iterator[str]:
+        """순위 데이터 요약 (스트리밍)"""
+        if not stock_list:
+            yield "❌ 조회된 종목이 없습니다."
+            return
+        
+        market_sentiment = self.analyze_market_sentiment(stock_list)
+        top_stocks_info = self.top_stocks_info(stock_list)
+        
+        tokens = self.call_hyperclova_stream(self.build_ranking_prompt(market_sentiment, top_stocks_info), 400)
+        rendered = self.render_ranking_summary(stock_list, market_sentiment, top_stocks_info, _AI_PLACEHOLDER)
+        yield from self._stream_rendered(rendered, tokens)
+    
+    def analysis_stream(self, data: Any) -> Iterator[str]:
+        """조회 데이터에 대한 AI 분석 문장만 스트리밍 (오케스트레이터 스트리밍 모드용)"""
+        if isinstance(data, dict) and "error" not in data:
+            yield from self.call_hyperclova_stream(self.build_stock_prompt(data), 300)
+        elif isinstance(data, list) and data:
+            market_sentiment = self.analyze_market_sentiment(data)
+            prompt = self.build_ranking_prompt(market_sentiment, self.top_stocks_info(data))
+            yield from self.call_hyperclova_stream(prompt, 400)
+    
+    def process_stream(self, input_data: Dict[str, Any]) -> Iterator[str]:
+        """실제 데이터 기반 요약 처리 (스트리밍, 응답 조각을 순서대로 반환)"""
+        data = input_data.get("data")
+        original_query = input_data.get("original_query", "")
+        query_type = input_data.get("query_type", "unknown")
+        
+        if not data:
+            yield "❌ 요약할 데이터가 없습니다."
+        elif isinstance(data, dict):
+            yield from self.format_stock_summary_stream(data, query_type)
+        elif isinstance(data, list):
+            yield from self.format_ranking_summary_stream(data, query_type)
+        else:
+            yield f"🤖 '{original_query}' 요청을 처리했습니다.\n\n📡 실시간 데이터로 응답했습니다."
+    
     def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """실제 데이터 기반 요약 처리"""
         try:
@@ -251,8 +546,44 @@ class SummarizerAgent(BaseAgent):
             }
             
         except Exception as e:
-            self.log_error(f"실제 데이터 요약 실패: {str(e)}")
+            self.log_error("실제 데이터 요약 실패: %s", e)
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+    
+    async def process_async(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """실제 데이터 기반 요약 처리 (비동기)"""
+        try:
+            data = input_data.get("data")
+            query_type = input_data.get("query_type", "unknown")
+            original_query = input_data.get("original_query", "")
+            
+            if not data:
+                return {
+                    "status": "error",
+                    "message": "요약할 데이터가 없습니다."
+                }
+            
+            # 데이터 타입에 따른 요약
+            if isinstance(data, dict):
+                # 단일 주식 데이터
+                summary = await self.format_stock_summary_async(data, query_type)
+            elif isinstance(data, list):
+                # 여러 주식 데이터
+                summary = await self.format_ranking_summary_async(data, query_type)
+            else:
+                summary = f"🤖 '{original_query}' 요청을 처리했습니다.\n\n📡 실시간 데이터로 응답했습니다."
+            
+            return {
+                "status": "success",
+                "summary": summary,
+                "query_type": query_type
+            }
+            
+        except Exception as e:
+            self.log_error("실제 데이터 요약 실패: %s", e)
             return {
                 "status": "error",
                 "message": str(e)
-            }
\ No newline at end of file
+            }
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""여러 종목 요약: 종목별 순차 호출 vs 동시 호출(fan-out) vs 묶음 프롬프트(packed)
+
+로컬 HyperCLOVA 대역 서버가 (기본 지연 + 출력 토큰당 지연) 만큼 기다렸다가 응답한다.
+사용법: python benchmarks/bench_batch_summary.py [--base-ms 400] [--token-ms 4] [--concurrency 4]
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.responder.batch_summary import (
+    BATCH_MAX_STOCKS, batch_max_tokens, build_batch_prompt, chunked, fan_out, split_batch_answer,
+)
+from utils.http_client import get_http_client
+
+BATCH_SIZES = (1, 5, 20)
+TOKENS_PER_SUMMARY = 60
+_STOCK_LINE = re.compile(r"^\[(.+?)\] ", re.MULTILINE)
+
+
+def start_stub_server(base_ms: float, token_ms: float) -> str:
+    """프롬프트의 [종목] 줄 수만큼 '### 종목' 섹션을 돌려주는 대역 서버"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            prompt = body["messages"][-1]["content"]
+            symbols = _STOCK_LINE.findall(prompt)
+            if symbols:
+                content = "\n".join(f"### {symbol}\n{symbol} 요약입니다." for symbol in symbols)
+            else:
+                symbols = [None]
+                content = "단일 종목 요약입니다."
+            time.sleep((base_ms + token_ms * TOKENS_PER_SUMMARY * len(symbols)) / 1000)
+
+            payload = json.dumps({"result": {"message": {"role": "assistant", "content": content}}},
+                                 ensure_ascii=False).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}/v1/chat-completions"
+
+
+def make_caller(url: str):
+    def call(prompt: str, max_tokens: int = 300) -> str:
+        data = {"messages": [{"role": "user", "content": prompt}], "maxTokens": max_tokens}
+        response = get_http_client(url).post(url, json=data, timeout=60)
+        return response.json()["result"]["message"]["content"]
+    return call
+
+
+def make_stocks(count: int):
+    return [{"symbol": f"종목{i:02d}", "current_price": 10000 + i * 100, "change_rate": i / 10, "volume": 1000 * i}
+            for i in range(count)]
+
+
+def run_sequential(call, stocks, concurrency):
+    return [call(f"종목: {stock['symbol']}") for stock in stocks]
+
+
+def run_fanout(call, stocks, concurrency):
+    return fan_out(lambda stock: call(f"종목: {stock['symbol']}"), stocks, concurrency)
+
+
+def run_packed(call, stocks, concurrency):
+    chunks = list(chunked(stocks, BATCH_MAX_STOCKS))
+    answers = fan_out(lambda chunk: call(build_batch_prompt(chunk), batch_max_tokens(len(chunk))), chunks, concurrency)
+    sections = {}
+    for chunk, answer in zip(chunks, answers):
+        sections.update(split_batch_answer(answer, [stock["symbol"] for stock in chunk]))
+    assert len(sections) == len(stocks)
+    return sections
+
+
+def main():
+    parser = argparse.ArgumentParser(description="여러 종목 요약 벤치마크")
+    parser.add_argument("--base-ms", type=float, default=400, help="호출당 고정 지연 (ms)")
+    parser.add_argument("--token-ms", type=float, default=4, help="출력 토큰당 지연 (ms)")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    call = make_caller(start_stub_server(args.base_ms, args.token_ms))
+    call("워밍업")
+    modes = [("순차", run_sequential), ("fan-out", run_fanout), ("packed", run_packed)]
+
+    print(f"호출당 {args.base_ms:.0f} ms + 토큰당 {args.token_ms:.0f} ms, 동시 호출 {args.concurrency}개")
+    print(f"{'종목 수':>6}" + "".join(f"{name:>14}" for name, _ in modes) + "   (종목당 ms)")
+    for size in BATCH_SIZES:
+        stocks = make_stocks(size)
+        row = f"{size:>6}"
+        for _, run in modes:
+            start = time.perf_counter()
+            run(call, stocks, args.concurrency)
+            row += f"{(time.perf_counter() - start) * 1000 / size:14.1f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
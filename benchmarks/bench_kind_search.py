@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""KIND 검색 비교: pandas str.contains 전체 스캔 vs n-gram 역색인
+
+사용법: python benchmarks/bench_kind_search.py [--lookups 10000] [--limit 10]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from benchmarks.corpora import COMPANY_SEARCH_TERMS
+from utils.kind_index import KindSearchIndex, KIND_CSV_FILE, SEARCH_FIELDS
+
+SEARCH_TERMS = COMPANY_SEARCH_TERMS
+
+
+def load_dataframe(path: str) -> pd.DataFrame:
+    """KINDDataAgent._load_kind_data 와 같은 방식으로 로드"""
+    df = pd.read_csv(path, dtype=str, encoding="utf-8")
+    df.columns = [col.strip().lstrip("﻿") for col in df.columns]
+    return df.fillna("")
+
+
+def dataframe_scan(df: pd.DataFrame, query: str, limit: int):
+    """기존 방식: 필드별 str.contains 후 to_dict(orient="records")"""
+    mask = pd.Series(True, index=df.index)
+    for term in query.split():
+        term_mask = pd.Series(False, index=df.index)
+        for field in SEARCH_FIELDS:
+            term_mask |= df[field].str.contains(term, case=False, regex=False)
+        mask &= term_mask
+    return df[mask].to_dict(orient="records")[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KIND 검색 벤치마크")
+    parser.add_argument("--lookups", type=int, default=10000)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    csv_path = os.path.join(root, KIND_CSV_FILE)
+    queries = [SEARCH_TERMS[i % len(SEARCH_TERMS)] for i in range(args.lookups)]
+
+    df = load_dataframe(csv_path)
+    start = time.perf_counter()
+    for query in queries:
+        dataframe_scan(df, query, args.limit)
+    scan_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = KindSearchIndex.from_csv(csv_path)
+    build_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for query in queries:
+        index.search(query, args.limit)
+    index_elapsed = time.perf_counter() - start
+
+    print(f"종목 수: {index.size:,}, 조회: {args.lookups:,}회 (상위 {args.limit}건)")
+    print(f"DataFrame 스캔 : {args.lookups / scan_elapsed:12,.0f} lookups/sec")
+    print(f"n-gram 색인    : {args.lookups / index_elapsed:12,.0f} lookups/sec (색인 생성 {build_elapsed * 1000:.0f} ms)")
+    print(f"속도 향상      : {scan_elapsed / index_elapsed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
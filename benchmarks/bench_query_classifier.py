@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""쿼리 파싱 처리량 비교: 기존 2중 파서 경로 vs 단일 스캔 분류기
+
+사용법: python benchmarks/bench_query_classifier.py [--rounds 200]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.interpreter.query_classifier import QueryClassifier
+from benchmarks.corpora import QUERY_CORPUS
+from benchmarks.legacy_parsers import LegacyQueryParsers
+
+
+def run_legacy(parsers: LegacyQueryParsers, queries):
+    """오케스트레이터 분석 + QueryUnderstander 분석을 각각 수행 (기존 경로)"""
+    for query in queries:
+        parsers.analyze_query(query)
+        parsers.understand({"query": query})
+
+
+def run_classifier(classifier: QueryClassifier, queries):
+    """한 번 스캔한 특징을 두 분석에 공유 (신규 경로)"""
+    for query in queries:
+        features = classifier.scan(query)
+        classifier.analyze(query, features)
+        classifier.understand(query, features)
+
+
+def measure(fn, target, queries, rounds: int) -> float:
+    """초당 처리 쿼리 수 측정"""
+    fn(target, queries)  # 워밍업
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(target, queries)
+    elapsed = time.perf_counter() - start
+    return len(queries) * rounds / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="쿼리 분류기 마이크로 벤치마크")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    legacy_qps = measure(run_legacy, LegacyQueryParsers(), QUERY_CORPUS, args.rounds)
+    classifier_qps = measure(run_classifier, QueryClassifier(), QUERY_CORPUS, args.rounds)
+
+    print(f"쿼리 수: {len(QUERY_CORPUS)} x {args.rounds}회")
+    print(f"기존 2중 파서   : {legacy_qps:12,.0f} queries/sec")
+    print(f"단일 스캔 분류기: {classifier_qps:12,.0f} queries/sec")
+    print(f"속도 향상       : {classifier_qps / legacy_qps:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
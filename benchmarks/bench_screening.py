@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""전체 시장 스크리닝: dict 필터 + sorted vs NumPy 마스크 + argpartition
+
+사용법: python benchmarks/bench_screening.py [--stocks 2700] [--repeat 1000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.decisionmaker.screening_engine import ScreeningUniverse
+
+SECTORS = ["반도체", "2차전지", "바이오", "자동차", "화학", "금융", "게임", "엔터", "건설", "유통"]
+
+COMPOUND_FILTERS = [
+    ("volume", ">", 1_000_000),
+    ("per", "between", (0, 15)),
+    ("change_rate", ">=", 1.0),
+    ("sector", "in", {"반도체", "2차전지", "자동차"}),
+]
+
+
+def make_universe(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    return [{
+        "ticker": f"{i:06d}",
+        "volume": rng.randint(0, 5_000_000),
+        "per": round(rng.uniform(-20, 60), 2),
+        "change_rate": round(rng.uniform(-30, 30), 2),
+        "sector": rng.choice(SECTORS),
+    } for i in range(count)]
+
+
+def legacy_screening(data_list):
+    """ReasonerAgent._handle_screening 과 같은 방식"""
+    filtered = [d for d in data_list if d.get("volume", 0) > 1_000_000]
+    sorted_result = sorted(filtered, key=lambda d: d.get("volume", 0), reverse=True)
+    return {"result": sorted_result[:10], "total_matched": len(sorted_result)}
+
+
+def legacy_compound(data_list):
+    filtered = [d for d in data_list
+                if d.get("volume", 0) > 1_000_000 and 0 <= d["per"] <= 15 and d["change_rate"] >= 1.0
+                and d["sector"] in {"반도체", "2차전지", "자동차"}]
+    return sorted(filtered, key=lambda d: d.get("volume", 0), reverse=True)[:10]
+
+
+def timed(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스크리닝 벤치마크")
+    parser.add_argument("--stocks", type=int, default=2700)
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    records = make_universe(args.stocks)
+    start = time.perf_counter()
+    universe = ScreeningUniverse(records)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    assert universe.screen() == legacy_screening(records)
+    assert universe.screen(COMPOUND_FILTERS)["result"] == legacy_compound(records)
+
+    rows = [
+        ("거래량 조건", timed(lambda: legacy_screening(records), args.repeat), timed(universe.screen, args.repeat)),
+        ("복합 조건", timed(lambda: legacy_compound(records), args.repeat),
+         timed(lambda: universe.screen(COMPOUND_FILTERS), args.repeat)),
+    ]
+
+    print(f"종목 수: {args.stocks:,} (컬럼 구성 {build_ms:.1f} ms, 1회)")
+    for label, legacy_ms, engine_ms in rows:
+        print(f"{label:8} 기존 {legacy_ms:8.3f} ms   엔진 {engine_ms:8.3f} ms   ({legacy_ms / engine_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# 벤치마크용 고정 쿼리 코퍼스 (결과 재현성을 위해 수정 시 기준값도 함께 갱신)
+
+QUERY_CORPUS = [
+    "삼성전자의 2024-08-08 종가는?",
+    "삼성전자 2024-08-08 시가",
+    "SK하이닉스의 2024-07-01 고가는?",
+    "카카오 2024-12-02 저가",
+    "삼성전자 현재가",
+    "삼성전자의 현재가는 얼마",
+    "카카오 주가",
+    "네이버 가격은 어떻게",
+    "현대차 주가 알려줘",
+    "005930 현재가",
+    "2024-08-08에 상승한 종목은 몇 개",
+    "2024-08-08에 하락한 종목은 몇 개",
+    "2024-08-08 코스피 시장에 거래된 종목 수",
+    "2024-08-08 KOSDAQ 시장에 거래된 종목 수",
+    "2024-08-08 거래 종목 수",
+    "2024-08-08에서 KOSPI에서 상승률 높은 종목 5개",
+    "상승률 상위 10개 종목",
+    "하락률 상위 5개",
+    "거래량 상위 20개 종목",
+    "2024-08-08 가장 많이 오른 종목",
+    "3% 이상 상승한 종목",
+    "5% 이상 오른 주식",
+    "2.5% 이상 하락한 종목 보여줘",
+    "10% 이상 떨어진 종목",
+    "전날 대비 7% 오른 종목",
+    "많이 오른 주식",
+    "오늘 많이 상승한 종목",
+    "50일 이동평균 대비 10% 이상 돌파한 종목",
+    "20일 이평선 5% 상향 돌파",
+    "이동평균선 돌파 종목",
+    "기술적 지지 구간 종목",
+    "8월 8일 코스닥 상승률 상위 3개",
+    "어제 거래량 상위 5개 종목",
+    "오늘 코스피 하락률 상위 7개",
+    "도움말",
+    "안녕하세요",
+    "요즘 반도체 업종 어때?",
+    "LG에너지솔루션 저가격 종목",
+]
+
+# KIND/DART 회사명 검색어 (부분 일치, 여러 단어 포함)
+COMPANY_SEARCH_TERMS = [
+    "삼성전자", "카카오", "현대", "바이오", "반도체", "전자", "SK", "2차전지",
+    "소프트웨어", "화장품", "제약", "LG", "자동차 부품", "게임", "금융", "엔터",
+]
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""에이전트 파이프라인 벤치마크 모음 (고정 코퍼스 + 대역 업스트림, 네트워크 없음)
+
+결과는 JSON 으로 저장하고, 저장해 둔 기준 결과와 비교해 threshold 이상 느려진 항목을 표시한다.
+
+사용법:
+    python benchmarks/run.py --out benchmarks/baseline.json          # 기준 결과 저장
+    python benchmarks/run.py --compare benchmarks/baseline.json      # 비교 (회귀가 있으면 종료 코드 1)
+    python benchmarks/run.py --only orchestrator --rounds 10 --list
+"""
+
+import os
+import gc
+import sys
+import json
+import time
+import types
+import random
+import platform
+import argparse
+import statistics
+import tempfile
+import importlib.util
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Callable, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from agents.base_agent import BaseAgent
+from benchmarks.corpora import QUERY_CORPUS, COMPANY_SEARCH_TERMS
+
+# 회귀 판정 기준: 기준 결과 대비 중앙값이 이 비율 이상 느려지면 회귀
+DEFAULT_THRESHOLD = 0.15
+DEFAULT_ROUNDS = 7
+# 한 라운드가 최소 이 시간은 걸리도록 반복 횟수를 맞춤 (타이머 해상도 영향 제거)
+DEFAULT_MIN_ROUND_SECONDS = 0.05
+SEED = 20240808
+# 대역 CORPCODE.xml 회사 수 (실제 파일은 약 10만 건, 상장사는 약 3천 건)
+SYNTHETIC_CORP_COUNT = 20000
+# 코퍼스의 시장 통계 질문 날짜 (대역 집계 테이블에 미리 기록)
+AGGREGATE_DAY = "2024-08-08"
+
+
+class SkipBenchmark(Exception):
+    """실행 환경에서 측정할 수 없는 항목 (결과에 건너뛴 사유로 기록)"""
+
+
+# 이름 → 준비 함수 (준비 함수는 (한 번 실행할 함수, 한 번에 처리하는 연산 수) 반환)
+BENCHMARKS: Dict[str, Callable[[str], Tuple[Callable[[], Any], int]]] = {}
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+# ---------------------------------------------------------------- 대역 데이터
+
+def make_stock_list(count: int) -> List[Dict[str, Any]]:
+    """순위/조건 검색 결과 형태의 고정 종목 목록"""
+    rng = random.Random(SEED)
+    return [{
+        "symbol": f"종목{i:03d}",
+        "current_price": rng.randrange(1000, 500000, 10),
+        "change_rate": round(rng.uniform(-15, 15), 2),
+        "volume": rng.randrange(1000, 10_000_000),
+    } for i in range(count)]
+
+
+def write_synthetic_corpcode(path: str, count: int = SYNTHETIC_CORP_COUNT):
+    """CORPCODE.xml 과 같은 구조의 고정 대역 파일 (상장사 약 15%)"""
+    rng = random.Random(SEED)
+    syllables = "가나다라마바사아자차카타파하전자바이오제약금융화학건설"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<result>\n')
+        for i in range(count):
+            name = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 6))) + f"{i % 97}"
+            stock_code = f"{i:06d}" if rng.random() < 0.15 else " "
+            f.write(f"<list><corp_code>{10000000 + i:08d}</corp_code><corp_name>{name}</corp_name>"
+                    f"<stock_code>{stock_code}</stock_code><modify_date>20240101</modify_date></list>\n")
+        f.write("</result>\n")
+
+
+class StubGatherer(BaseAgent):
+    """고정 시세를 바로 돌려주는 데이터 수집기 대역 (DART/KIND/yfinance 호출 없음)"""
+
+    def __init__(self):
+        super().__init__("StubGatherer")
+        self.stocks = make_stock_list(50)
+
+    def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        if input_data.get("type") == "stock_price":
+            return {"status": "success", "data": {
+                "current_price": 71000, "change_rate": 1.5, "volume": 1200000,
+                "open": 70000, "high": 71500, "low": 69800, "data_source": "stub",
+            }}
+        return {"status": "success", "data": self.stocks[:input_data.get("limit", 10) or 10]}
+
+
+def install_config_stub():
+    """config.py 는 배포본에 없으므로 없으면 요약기를 import 하기 전에 대역을 넣음 (HyperCLOVA 는 호출하지 않음)"""
+    if "config" in sys.modules or importlib.util.find_spec("config") is not None:
+        return
+    config = types.ModuleType("config")
+    config.HYPERCLOVA_URL = "http://127.0.0.1:9/unused"
+    config.HYPERCLOVA_API_KEY = "benchmark-api-key"
+    config.HYPERCLOVA_API_GATEWAY_KEY = "benchmark-gateway-key"
+    config.generate_request_id = lambda: "benchmark"
+    sys.modules["config"] = config
+
+
+def make_summarizer():
+    """HyperCLOVA 호출을 고정 문자열로 바꾼 SummarizerAgent"""
+    install_config_stub()
+    from agents.responder.summarizer_agent import SummarizerAgent
+    summarizer = SummarizerAgent()
+    summarizer.call_hyperclova = lambda prompt, max_tokens=500: "AI 분석 (벤치마크 대역 응답)"
+    return summarizer
+
+
+# ---------------------------------------------------------------- 측정 항목
+
+@benchmark("orchestrator.analyze_query")
+def bench_analyze_query(workdir: str):
+    from agents.orchestrator import OrchestratorAgent
+    orchestrator = OrchestratorAgent()
+    return (lambda: [orchestrator.analyze_query(query) for query in QUERY_CORPUS]), len(QUERY_CORPUS)
+
+
+@benchmark("understander.process")
+def bench_understander(workdir: str):
+    from agents.interpreter.query_understander_agent import QueryUnderstander
+    understander = QueryUnderstander()
+    return (lambda: [understander.process({"query": query}) for query in QUERY_CORPUS]), len(QUERY_CORPUS)
+
+
+@benchmark("kind.search")
+def bench_kind_search(workdir: str):
+    from utils.kind_index import KindSearchIndex, KIND_CSV_FILE
+    index = KindSearchIndex.from_csv(os.path.join(ROOT, KIND_CSV_FILE))
+    return (lambda: [index.search(term, 10) for term in COMPANY_SEARCH_TERMS]), len(COMPANY_SEARCH_TERMS)
+
+
+@benchmark("dart.corp_code_lookup")
+def bench_corp_code_lookup(workdir: str):
+    from utils.corp_code_index import load_corp_code_index
+    index = load_corp_code_index(os.path.join(workdir, "CORPCODE.xml"))
+    rng = random.Random(SEED)
+    entries = list(index)
+    names = [rng.choice(entries)["corp_name"] for _ in range(500)] + ["없는회사"] * 20
+    return (lambda: [index.get(name) for name in names]), len(names)
+
+
+@benchmark("resolver.find")
+def bench_resolver(workdir: str):
+    from utils.corp_resolver import CompanyResolver
+    from utils.kind_index import KIND_CSV_FILE
+    resolver = CompanyResolver.from_files(os.path.join(ROOT, KIND_CSV_FILE), os.path.join(workdir, "CORPCODE.xml"))
+    return (lambda: [resolver.find(query) for query in QUERY_CORPUS]), len(QUERY_CORPUS)
+
+
+@benchmark("corp_code.build_index")
+def bench_corp_code_build(workdir: str):
+    from utils.corp_code_index import build_corp_code_index
+    xml_path = os.path.join(workdir, "CORPCODE.xml")
+    index_path = os.path.join(workdir, "CORPCODE.build.idx")
+    return (lambda: build_corp_code_index(xml_path, index_path)), 1
+
+
+@benchmark("corp_code.load_index")
+def bench_corp_code_load(workdir: str):
+    from utils.corp_code_index import load_corp_code_index
+    xml_path = os.path.join(workdir, "CORPCODE.xml")
+
+    def load():
+        index = load_corp_code_index(xml_path)  # 인덱스가 최신이면 열기만 함
+        index.close()
+    return load, 1
+
+
+@benchmark("summarizer.analyze_market_sentiment")
+def bench_market_sentiment(workdir: str):
+    summarizer = make_summarizer()
+    stocks = make_stock_list(100)
+    return (lambda: summarizer.analyze_market_sentiment(stocks)), 1
+
+
+@benchmark("summarizer.format_ranking_summary")
+def bench_ranking_summary(workdir: str):
+    summarizer = make_summarizer()
+    stocks = make_stock_list(20)
+    return (lambda: summarizer.format_ranking_summary(stocks)), 1
+
+
+@benchmark("orchestrator.process")
+def bench_orchestrator_process(workdir: str):
+    from agents.orchestrator import OrchestratorAgent
+    orchestrator = OrchestratorAgent()
+    orchestrator.data_gatherer = StubGatherer()
+    # 시장 통계 질문은 작업 디렉터리의 대역 집계 테이블에서 (저장소의 market_aggregates.sqlite3 는 건드리지 않음)
+    from agents.datagatherer.market_aggregates import MarketAggregateStore
+    orchestrator.market_aggregates = MarketAggregateStore(os.path.join(workdir, "market_aggregates.sqlite3"))
+    quotes = make_stock_list(2400)
+    for i, quote in enumerate(quotes):
+        quote["market"] = "KOSPI" if i % 3 == 0 else "KOSDAQ"
+    orchestrator.market_aggregates.record_day(AGGREGATE_DAY, quotes)
+
+    # 대화 기록은 CONTEXT_HISTORY_LIMIT 로 잘리므로 반복해도 컨텍스트 크기는 일정
+    return (lambda: [orchestrator.process({"query": query}) for query in QUERY_CORPUS]), len(QUERY_CORPUS)
+
+
+# ---------------------------------------------------------------- 실행/비교
+
+def measure(fn: Callable[[], Any], ops: int, rounds: int, min_round_seconds: float) -> Dict[str, Any]:
+    """라운드마다 연산 1회당 시간(µs)을 재고 중앙값/최솟값/최댓값 보고"""
+    fn()  # 워밍업 (지연 로딩, 캐시)
+    start = time.perf_counter()
+    fn()
+    single = max(time.perf_counter() - start, 1e-9)
+    loops = max(int(min_round_seconds / single), 1)
+
+    samples = []
+    gc.collect()
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _ in range(loops):
+                fn()
+            samples.append((time.perf_counter() - start) / (loops * ops) * 1_000_000)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    return {
+        "ops": ops,
+        "loops": loops,
+        "rounds": rounds,
+        "median_us": round(statistics.median(samples), 3),
+        "min_us": round(min(samples), 3),
+        "max_us": round(max(samples), 3),
+    }
+
+
+def run_benchmarks(names: List[str], rounds: int = DEFAULT_ROUNDS,
+                   min_round_seconds: float = DEFAULT_MIN_ROUND_SECONDS) -> Dict[str, Any]:
+    """선택한 항목 실행 → {"meta": ..., "results": {이름: 측정값 | {"skipped": 사유}}}"""
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="finance_bench_") as workdir:
+        write_synthetic_corpcode(os.path.join(workdir, "CORPCODE.xml"))
+        for name in names:
+            try:
+                fn, ops = BENCHMARKS[name](workdir)
+                results[name] = measure(fn, ops, rounds, min_round_seconds)
+            except SkipBenchmark as e:
+                results[name] = {"skipped": str(e)}
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "rounds": rounds,
+            "min_round_seconds": min_round_seconds,
+        },
+        "results": results,
+    }
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any],
+                    threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """항목별 중앙값 비교 (ratio = 현재 / 기준, 1 + threshold 초과면 regression)"""
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if "median_us" not in result or not base or "median_us" not in base:
+            rows.append({"name": name, "status": "new" if not base else "skipped"})
+            continue
+        ratio = result["median_us"] / base["median_us"] if base["median_us"] else float("inf")
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({"name": name, "status": status, "ratio": round(ratio, 3),
+                     "baseline_us": base["median_us"], "current_us": result["median_us"]})
+    return rows
+
+
+def format_results(report: Dict[str, Any]) -> str:
+    lines = [f"{'항목':<38}{'중앙값(µs/op)':>16}{'최소':>12}{'최대':>12}"]
+    for name, result in report["results"].items():
+        if "skipped" in result:
+            lines.append(f"{name:<38}  건너뜀: {result['skipped']}")
+        else:
+            lines.append(f"{name:<38}{result['median_us']:>16,.2f}{result['min_us']:>12,.2f}{result['max_us']:>12,.2f}")
+    return "\n".join(lines)
+
+
+def format_comparison(rows: List[Dict[str, Any]], threshold: float) -> str:
+    marks = {"regression": "❌ 느려짐", "improved": "✅ 빨라짐", "ok": "  ", "new": "  (기준 없음)", "skipped": "  (건너뜀)"}
+    lines = [f"기준 대비 비교 (±{threshold:.0%} 이내는 변화 없음)"]
+    for row in rows:
+        if "ratio" in row:
+            lines.append(f"{row['name']:<38}{row['baseline_us']:>12,.2f} → {row['current_us']:>12,.2f} µs"
+                         f"  x{row['ratio']:.2f} {marks[row['status']]}")
+        else:
+            lines.append(f"{row['name']:<38}{marks[row['status']]}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="에이전트 파이프라인 벤치마크")
+    parser.add_argument("--only", action="append", default=[], help="이름에 이 문자열이 들어간 항목만 (여러 번 지정 가능)")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument("--min-round-seconds", type=float, default=DEFAULT_MIN_ROUND_SECONDS)
+    parser.add_argument("--out", metavar="JSON", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", metavar="JSON", help="비교할 기준 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"회귀로 볼 중앙값 증가 비율 (기본 {DEFAULT_THRESHOLD})")
+    parser.add_argument("--list", action="store_true", help="항목 이름만 출력")
+    args = parser.parse_args(argv)
+    # --out/--compare 는 실행한 위치 기준, KIND_corp_list.csv 등 상대 경로 데이터 파일은 저장소 루트 기준
+    args.out = os.path.abspath(args.out) if args.out else None
+    args.compare = os.path.abspath(args.compare) if args.compare else None
+    cwd = os.getcwd()
+    os.chdir(ROOT)
+    try:
+        return _run(args)
+    finally:
+        os.chdir(cwd)
+
+
+def _run(args: argparse.Namespace) -> int:
+    names = [name for name in BENCHMARKS if not args.only or any(part in name for part in args.only)]
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    report = run_benchmarks(names, args.rounds, args.min_round_seconds)
+    print(format_results(report))
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare_results(report, baseline, args.threshold)
+        print()
+        print(format_comparison(rows, args.threshold))
+        if any(row["status"] == "regression" for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
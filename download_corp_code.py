@@ -1,34 +1,177 @@
 import os
-import requests
+import sys
+import json
+import shutil
+import hashlib
 import zipfile
-import io
+import tempfile
+import argparse
 from dotenv import load_dotenv
+from utils.http_client import get_http_client
+from utils.corp_code_index import iter_corp_code_entries, build_corp_code_index
 
 load_dotenv()
 
 DART_API_KEY = os.getenv("DART_API_KEY")
 CORPCODE_URL = f"https://opendart.fss.or.kr/api/corpCode.xml?crtfc_key={DART_API_KEY}"
 CORPCODE_FILE = "CORPCODE.xml"
+CORPCODE_PREV_FILE = "CORPCODE.prev.xml"
+CORPCODE_META_FILE = "CORPCODE.meta.json"
+CORPCODE_CHANGES_FILE = "CORPCODE.changes.jsonl"
+CHUNK_SIZE = 64 * 1024
+
+def _download_to_temp(url, headers=None, directory="."):
+    """응답을 청크 단위로 임시 파일에 저장 (메모리에 전체를 올리지 않음)"""
+    with get_http_client(url).stream("GET", url, headers=headers or {}, timeout=60) as response:
+        print("[DEBUG] 응답코드:", response.status_code)
+        if response.status_code != 200:
+            response.read()  # 오류 본문은 작으므로 연결을 풀에 돌려주기 전에 읽어 둔다
+            return response, None, None
+
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(prefix=".corpcode-", suffix=".zip", dir=directory)
+        with os.fdopen(fd, "wb") as f:
+            for chunk in response.iter_bytes(chunk_size=CHUNK_SIZE):
+                f.write(chunk)
+                digest.update(chunk)
+        return response, tmp_path, digest.hexdigest()
+
+def _extract_corp_code(zip_path, xml_path):
+    """zip 안의 CORPCODE.xml 을 임시 파일로 풀어 반환 (원본은 아직 교체하지 않음)"""
+    directory = os.path.dirname(os.path.abspath(xml_path))
+    with zipfile.ZipFile(zip_path) as zf, zf.open(CORPCODE_FILE) as src:
+        fd, tmp_xml = tempfile.mkstemp(prefix=".corpcode-", suffix=".xml", dir=directory)
+        with os.fdopen(fd, "wb") as dst:
+            shutil.copyfileobj(src, dst, CHUNK_SIZE)
+    return tmp_xml
+
+def diff_corp_codes(old_xml_path, new_xml_path):
+    """이전/신규 CORPCODE.xml 비교 후 변경된 회사만 반환"""
+    old_entries = {}
+    if old_xml_path:
+        old_entries = {corp["corp_code"]: corp for corp in iter_corp_code_entries(old_xml_path)}
+
+    changes = []
+    for corp in iter_corp_code_entries(new_xml_path):
+        previous = old_entries.pop(corp["corp_code"], None)
+        if previous is None:
+            changes.append(dict(corp, change="added"))
+        elif previous != corp:
+            changes.append(dict(corp, change="modified"))
+
+    for corp in old_entries.values():
+        changes.append(dict(corp, change="removed"))
+
+    return changes
+
+def _load_meta(meta_path):
+    if not os.path.exists(meta_path):
+        return {}
+    with open(meta_path, encoding="utf-8") as f:
+        return json.load(f)
+
+def refresh_corp_code(url=CORPCODE_URL, xml_path=CORPCODE_FILE, prev_path=CORPCODE_PREV_FILE,
+                      meta_path=CORPCODE_META_FILE, changes_path=CORPCODE_CHANGES_FILE,
+                      rebuild_index=True):
+    """조건부 갱신: 바뀐 경우에만 교체하고, 이전 버전 대비 변경된 회사 목록을 기록
+
+    반환값의 status 는 not_modified(304), unchanged(같은 zip), updated, error 중 하나이며
+    updated 인 경우 changes 에 added/modified/removed 레코드가 담긴다.
+    """
+    meta = _load_meta(meta_path)
+    headers = {}
+    if os.path.exists(xml_path):
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    directory = os.path.dirname(os.path.abspath(xml_path))
+    response, zip_path, zip_sha256 = _download_to_temp(url, headers, directory)
+
+    if response.status_code == 304:
+        print(f"[INFO] {CORPCODE_FILE} 변경 없음 (304)")
+        return {"status": "not_modified", "changes": []}
+    if zip_path is None:
+        print(f"[ERROR] 다운로드 실패: {response.status_code}")
+        return {"status": "error", "changes": [], "message": f"HTTP {response.status_code}"}
+
+    tmp_xml = None
+    try:
+        if os.path.exists(xml_path) and zip_sha256 == meta.get("zip_sha256"):
+            print(f"[INFO] {CORPCODE_FILE} 내용 변경 없음")
+            return {"status": "unchanged", "changes": []}
+
+        try:
+            tmp_xml = _extract_corp_code(zip_path, xml_path)
+        except (zipfile.BadZipFile, KeyError):
+            print("[ERROR] 받은 파일이 유효한 zip 파일이 아닙니다.")
+            return {"status": "error", "changes": [], "message": "invalid zip"}
+
+        # 이전 버전 보관 후 교체 (처음 받는 경우 모든 회사가 added)
+        had_previous = os.path.exists(xml_path)
+        if had_previous:
+            os.replace(xml_path, prev_path)
+        os.replace(tmp_xml, xml_path)
+        tmp_xml = None
+
+        changes = diff_corp_codes(prev_path if had_previous else None, xml_path)
+        with open(changes_path, "w", encoding="utf-8") as f:
+            for change in changes:
+                f.write(json.dumps(change, ensure_ascii=False) + "\n")
+
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "zip_sha256": zip_sha256,
+            }, f)
+
+        if rebuild_index and changes:
+            build_corp_code_index(xml_path, os.path.splitext(xml_path)[0] + ".idx")
+
+        print(f"[INFO] {CORPCODE_FILE} 갱신 완료 (변경 {len(changes)}건)")
+        return {"status": "updated", "changes": changes}
+    finally:
+        os.remove(zip_path)
+        if tmp_xml and os.path.exists(tmp_xml):
+            os.remove(tmp_xml)
 
 def download_and_extract_corp_code(force=False):
     if os.path.exists(CORPCODE_FILE) and not force:
         print(f"[INFO] 이미 {CORPCODE_FILE} 파일이 존재합니다.")
         return
 
-    response = requests.get(CORPCODE_URL)
-    print("[DEBUG] 응답코드:", response.status_code)
+    response, zip_path, _ = _download_to_temp(CORPCODE_URL)
 
-    if response.status_code == 200:
+    if zip_path is not None:
         try:
-            with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
-                zf.extract(CORPCODE_FILE)
-                print(f"[INFO] {CORPCODE_FILE} 압축 해제 완료")
+            tmp_xml = _extract_corp_code(zip_path, CORPCODE_FILE)
+            os.replace(tmp_xml, CORPCODE_FILE)
+            print(f"[INFO] {CORPCODE_FILE} 압축 해제 완료")
         except zipfile.BadZipFile:
             print("[ERROR] 받은 파일이 유효한 zip 파일이 아닙니다.")
-            print("[DEBUG] 응답본문 앞부분:", response.content[:200])
+            with open(zip_path, "rb") as f:
+                print("[DEBUG] 응답본문 앞부분:", f.read(200))
+        finally:
+            os.remove(zip_path)
     else:
         print(f"[ERROR] 다운로드 실패: {response.status_code}")
         print(response.text)
 
 if __name__ == "__main__":
-    download_and_extract_corp_code(force=True)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="OpenDART 고유번호(CORPCODE.xml) 다운로드")
+    parser.add_argument("--refresh", action="store_true",
+                        help="변경된 경우에만 갱신하고 변경 회사 목록을 기록")
+    args = parser.parse_args()
+
+    # HTTP_CASSETTE_MODE=record|replay 이면 OpenDART 응답을 녹화하거나 녹화본으로 재생 (main.py 와 동일)
+    from utils.http_cassette import use_cassettes_from_env
+    session = use_cassettes_from_env()
+    if session is not None:
+        print(f"[INFO] HTTP {session.mode} 모드 ({session.store.root})")
+
+    if args.refresh:
+        result = refresh_corp_code()
+        sys.exit(0 if result["status"] != "error" else 1)
+    download_and_extract_corp_code(force=True)
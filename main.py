@@ -4,48 +4,63 @@
 import os
 import sys
 import logging
+import argparse
 from colorama import init, Fore, Style
-from dotenv import load_dotenv
-
-load_dotenv()
 
 # 현재 디렉토리를 Python 경로에 추가
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, current_dir)
 
-try:
-    from agents.orchestrator import OrchestratorAgent
-except ImportError as e:
-    print(f"❌ Import Error: {e}")
-    print("향상된 에이전트 파일들이 있는지 확인해주세요.")
-    # 대체로 기본 오케스트레이터 사용 시도
+# 컬러 출력 초기화
+init(autoreset=True)
+
+def load_environment():
+    """.env 로드 (python-dotenv 는 실제로 시작할 때만 import)"""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    # HTTP_CASSETTE_MODE=record|replay 이면 DART/HyperCLOVA/yfinance 응답을 녹화하거나 녹화본으로 재생
+    if os.getenv("HTTP_CASSETTE_MODE"):
+        from utils.http_cassette import use_cassettes_from_env
+        session = use_cassettes_from_env()
+        print(f"{Fore.YELLOW}📼 HTTP {session.mode} 모드 ({session.store.root}){Style.RESET_ALL}")
+
+def load_orchestrator_class():
+    """오케스트레이터 클래스 로드 (데이터 수집기 등 무거운 의존성은 첫 질문 때 로드)"""
     try:
         from agents.orchestrator import OrchestratorAgent
-        OrchestratorAgent = OrchestratorAgent
-        print("💡 기본 오케스트레이터를 사용합니다.")
-    except ImportError:
+        return OrchestratorAgent
+    except ImportError as e:
+        print(f"❌ Import Error: {e}")
         print("agents 디렉토리와 __init__.py 파일들이 있는지 확인해주세요.")
         sys.exit(1)
 
-# 컬러 출력 초기화
-init(autoreset=True)
+def create_orchestrator():
+    """오케스트레이터 생성 (MARKET_SNAPSHOT=1 이면 전 종목 시세 스냅샷을 연결하고 백그라운드 갱신 시작)"""
+    orchestrator = load_orchestrator_class()()
+    from agents.datagatherer.market_snapshot import MARKET_SNAPSHOT_ENABLED, start_market_snapshot
+    if MARKET_SNAPSHOT_ENABLED:
+        orchestrator.market_snapshot = start_market_snapshot()
+    return orchestrator
 
 class FinancialAgent:
-    def __init__(self):
+    def __init__(self, stream: bool = False):
         self.setup_logging()
-        self.orchestrator = OrchestratorAgent()
+        self._orchestrator = None
         self.running = True
+        self.stream = stream
+    
+    @property
+    def orchestrator(self):
+        """오케스트레이터 (첫 질문 시 생성)"""
+        if self._orchestrator is None:
+            self._orchestrator = create_orchestrator()
+        return self._orchestrator
         
     def setup_logging(self):
-        """로깅 설정"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('financial_agent.log', encoding='utf-8'),
-                logging.StreamHandler()
-            ]
-        )
+        """로깅 설정 (파일은 JSON 줄, 콘솔은 사람이 읽는 형식 - 쓰기는 별도 스레드에서)"""
+        from utils.logger import setup_logging
+        setup_logging(console=True)
     
     def print_welcome(self):
         """환영 메시지 출력"""
@@ -92,6 +107,37 @@ class FinancialAgent:
         
         return formatted
     
+    def format_chunk(self, chunk: str) -> str:
+        """스트리밍 응답 조각 포맷팅 (색상 없이 마크다운 강조만 변환)"""
+        return chunk.replace("**", f"{Style.BRIGHT}").replace("*", "")
+    
+    def print_stream(self, user_input: str):
+        """스트리밍 모드: 응답 조각이 도착하는 대로 출력"""
+        print("\n" + "="*60)
+        for chunk in self.orchestrator.process_stream({"query": user_input}):
+            print(self.format_chunk(chunk), end="", flush=True)
+        print(f"{Style.RESET_ALL}")
+        print("="*60)
+    
+    def print_latency_status(self):
+        """에이전트/질문 유형/단계별 실시간 지연 시간 (p50/p99)"""
+        from utils.tracing import latency_summary
+
+        sections = [("agent", "agent", "🤖 에이전트"), ("query", "type", "❓ 질문 유형"),
+                    ("stage", "stage", "⏱️ 단계"), ("upstream", "service", "🌐 외부 호출")]
+        printed = False
+        for name, label, title in sections:
+            entries = latency_summary(name, label)
+            if not entries:
+                continue
+            printed = True
+            print(f"{Fore.CYAN}{title}:{Style.RESET_ALL}")
+            for value, entry in entries:
+                print(f"{Fore.CYAN}   • {value}: p50 {entry['p50_ms']:.1f}ms / p99 {entry['p99_ms']:.1f}ms "
+                      f"({entry['count']}건){Style.RESET_ALL}")
+        if not printed:
+            print(f"{Fore.CYAN}📊 아직 처리한 질문이 없어 지연 시간 통계가 없습니다.{Style.RESET_ALL}")
+    
     def get_user_input(self) -> str:
         """사용자 입력 받기"""
         try:
@@ -123,7 +169,22 @@ class FinancialAgent:
         # 상태 명령어
         if lower_input in ['status', '상태']:
             print(f"{Fore.GREEN}✅ 시스템이 정상 작동 중입니다.{Style.RESET_ALL}")
-            print(f"{Fore.CYAN}📊 활성 에이전트: DataGatherer, Analyzer, Validator, Summarizer{Style.RESET_ALL}")
+            self.print_latency_status()
+            from utils.completion_cache import get_completion_cache
+            cache = get_completion_cache().stats()
+            print(f"{Fore.CYAN}🗄️ AI 응답 캐시: 적중 {cache['hits']}/{cache['hits'] + cache['misses']} "
+                  f"({cache['hit_rate']:.0%}), 절약 {cache['saved_seconds']:.1f}초{Style.RESET_ALL}")
+            from utils.single_flight import single_flight_stats
+            for name, flight in single_flight_stats().items():
+                print(f"{Fore.CYAN}🔗 {name} 중복 호출 합침: {flight['saved']}/{flight['calls']}건 절약{Style.RESET_ALL}")
+            from utils.rate_limiter import rate_limit_stats
+            for name, limit in rate_limit_stats().items():
+                print(f"{Fore.CYAN}🪣 {name} 남은 호출 한도: {limit['remaining']:,.0f}/{limit['capacity']:,.0f} "
+                      f"(거절 {limit['rejected']}건){Style.RESET_ALL}")
+            from utils.circuit_breaker import circuit_breaker_stats
+            for name, breaker in circuit_breaker_stats().items():
+                print(f"{Fore.CYAN}🔌 {name} 차단기: {breaker['state']} (실패율 {breaker['failure_rate']:.0%}, "
+                      f"차단 응답 {breaker['rejected']}건){Style.RESET_ALL}")
             return False
         
         return False
@@ -147,6 +208,11 @@ class FinancialAgent:
                 # 처리 중 표시
                 self.print_thinking()
                 
+                # 스트리밍 모드는 응답 조각을 바로 출력
+                if self.stream:
+                    self.print_stream(user_input)
+                    continue
+                
                 # 쿼리 처리
                 result = self.orchestrator.process({"query": user_input})
                 
@@ -220,17 +286,106 @@ HYPERCLOVA_API_GATEWAY_KEY=your_hyperclova_gateway_key
 """
     print(instructions)
 
+def print_startup_profile():
+    """에이전트별 import/초기화 시간 출력"""
+    from utils.startup_profile import profile_startup, format_startup_report
+
+    print(f"{Fore.CYAN}⏱️  시작 시간 측정 중 (에이전트별 새 프로세스)...{Style.RESET_ALL}\n")
+    print(format_startup_report(profile_startup(current_dir)))
+
+def run_batch_mode(args):
+    """배치 모드: JSONL 질문 파일을 워커 풀로 처리해 결과 JSONL 을 쓰고 처리량/지연 통계 출력"""
+    from utils.batch_runner import run_batch_files, format_batch_report
+    from utils.logger import setup_logging
+
+    setup_logging(console=args.log_console)
+    orchestrator = create_orchestrator()
+    summary = run_batch_files(orchestrator, args.batch, args.out, args.workers)
+    # 결과를 표준 출력으로 쓸 때는 통계가 섞이지 않도록 표준 에러로
+    report_stream = sys.stderr if not args.out or args.out == "-" else sys.stdout
+    print(format_batch_report(summary), file=report_stream)
+
+def run_service_mode(args):
+    """서비스 모드: 질문/헬스/메트릭 HTTP 엔드포인트 실행"""
+    import asyncio
+    from utils.service import FinancialService
+    from utils.logger import setup_logging
+
+    setup_logging(console=args.log_console)
+    service = FinancialService(create_orchestrator())
+    print(f"{Fore.GREEN}🌐 http://{args.host}:{args.port} 에서 서비스 중 "
+          f"(POST /query, GET /health, GET /metrics){Style.RESET_ALL}")
+    asyncio.run(service.serve_forever(args.host, args.port))
+
+def run_aggregates_mode(args):
+    """시장 집계 생성: 지정한 날짜(또는 구간) 중 빠진 거래일을 일봉으로 채움 (매일 장 마감 후 실행)"""
+    from datetime import date
+    from agents.datagatherer.market_aggregates import build_market_aggregates
+    from agents.datagatherer.market_snapshot import YFinanceQuoteSource
+
+    start, _, end = (args.build_aggregates or date.today().isoformat()).partition(":")
+    # KIND 목록에는 시장 구분이 없으므로 전 종목 시세를 한 번 받아 종목별 시장을 알아냄
+    source = YFinanceQuoteSource()
+    source()
+    filled = build_market_aggregates(start, end or start, source.yfinance_listings())
+    print(f"{Fore.GREEN}📊 시장 집계 {len(filled)}일 생성: {', '.join(filled) or '없음'}{Style.RESET_ALL}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="AI 금융 에이전트")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="에이전트별 import/초기화 시간을 측정해 출력")
+    parser.add_argument("--stream", action="store_true",
+                        help="AI 분석을 생성되는 대로 토큰 단위로 출력")
+    parser.add_argument("--batch", metavar="JSONL",
+                        help="JSONL 질문 파일을 일괄 처리 (줄마다 {\"id\": ..., \"query\": ...})")
+    parser.add_argument("--out", metavar="JSONL",
+                        help="배치 결과 파일 (생략 또는 '-' 이면 표준 출력)")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="배치 모드 동시 처리 개수 (기본 8)")
+    parser.add_argument("--serve", action="store_true",
+                        help="HTTP 서비스 모드로 실행 (POST /query, GET /health, GET /metrics)")
+    parser.add_argument("--host", default="127.0.0.1", help="서비스 모드 바인드 주소")
+    parser.add_argument("--port", type=int, default=8000, help="서비스 모드 포트")
+    parser.add_argument("--build-aggregates", nargs="?", const="", metavar="START[:END]",
+                        help="시장 집계 생성 (날짜 생략 시 오늘, 이미 있는 날짜는 건너뜀, 장 마감 후 실행)")
+    parser.add_argument("--log-console", action="store_true",
+                        help="배치/서비스 모드에서도 로그를 콘솔에 출력 (기본은 로그 파일에만 기록)")
+    return parser.parse_args()
+
 if __name__ == "__main__":
+    args = parse_args()
+    
+    if args.profile_startup:
+        print_startup_profile()
+        sys.exit(0)
+    
     print(f"{Fore.CYAN}{Style.BRIGHT}🚀 AI 금융 에이전트 시작 중...{Style.RESET_ALL}")
+    load_environment()
+    
+    # 시장 집계 생성은 시세만 받으므로 API 키 확인 전에
+    if args.build_aggregates is not None:
+        run_aggregates_mode(args)
+        sys.exit(0)
     
     # 환경 설정 확인
     if not check_environment():
         print_setup_instructions()
         sys.exit(1)
     
+    if args.batch:
+        run_batch_mode(args)
+        sys.exit(0)
+    
+    if args.serve:
+        try:
+            run_service_mode(args)
+        except KeyboardInterrupt:
+            print(f"\n{Fore.YELLOW}👋 서비스를 종료합니다.{Style.RESET_ALL}")
+        sys.exit(0)
+    
     try:
         # 앱 시작
-        app = FinancialAgent()
+        app = FinancialAgent(stream=args.stream)
         app.run()
         
     except KeyboardInterrupt:
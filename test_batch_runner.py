@@ -0,0 +1,92 @@
+import io
+import json
+import random
+import asyncio
+
+from utils.batch_runner import iter_batch_records, percentile, run_batch, run_batch_async
+from test_orchestrator_async import make_orchestrator
+
+def test_iter_batch_records_is_lazy():
+    consumed = []
+
+    def lines():
+        for i, line in enumerate(['{"id": "a", "query": "삼성전자 현재가"}', "", "not json",
+                                  '{"request_id": 7, "question": "도움말"}', '{"id": "b"}']):
+            consumed.append(i)
+            yield line
+
+    records = iter_batch_records(lines())
+    assert next(records) == {"id": "a", "query": "삼성전자 현재가"}
+    assert consumed == [0]
+    rest = list(records)
+    assert rest[0]["id"] == 3 and "JSON" in rest[0]["error"]
+    assert rest[1] == {"id": 7, "query": "도움말"}
+    assert rest[2]["id"] == "b" and rest[2]["query"] is None
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert (percentile(values, 50), percentile(values, 95), percentile(values, 99)) == (50, 95, 99)
+    assert percentile([3.0], 99) == 3.0 and percentile([], 50) == 0.0
+
+def test_bounded_in_flight_and_ordered_output():
+    state = {"running": 0, "max_running": 0, "created": 0}
+    rng = random.Random(0)
+
+    async def process(input_data):
+        state["running"] += 1
+        state["max_running"] = max(state["max_running"], state["running"])
+        await asyncio.sleep(rng.uniform(0, 0.005))
+        state["running"] -= 1
+        return {"status": "success", "response": input_data["query"].upper()}
+
+    def records():
+        for i in range(200):
+            state["created"] += 1
+            yield {"id": i, "query": f"q{i}"}
+
+    written = []
+
+    def write(result):
+        # 입력을 한꺼번에 읽지 않는다: 쓰기 시점에 읽은 항목은 창 크기(workers * 4) 이내
+        assert state["created"] - len(written) <= 4 * 4
+        written.append(result)
+
+    stats = asyncio.run(run_batch_async(process, records(), write, workers=4))
+    assert [r["id"] for r in written] == list(range(200))
+    assert written[5]["response"] == "Q5"
+    assert state["max_running"] == 4
+    assert stats.summary()["count"] == 200 and stats.errors == 0
+
+def test_malformed_lines_are_errors_without_latency_samples():
+    async def process(input_data):
+        await asyncio.sleep(0.01)
+        return {"status": "success", "response": input_data["query"]}
+
+    records = iter_batch_records(['{"id": 1, "query": "도움말"}', "not json", '{"id": 3}', '{"id": 4, "query": "도움말"}'])
+    written = []
+    stats = asyncio.run(run_batch_async(process, records, written.append, workers=2))
+    summary = stats.summary()
+    assert [r["status"] for r in written] == ["success", "error", "error", "success"]
+    assert summary["count"] == 4 and summary["errors"] == 2
+    assert len(stats.latencies) == 2 and summary["p50_ms"] >= 10  # 0ms 표본이 백분위를 끌어내리지 않음
+
+def test_run_batch_with_orchestrator():
+    lines = io.StringIO("\n".join(json.dumps({"id": i, "query": q}, ensure_ascii=False) for i, q in
+                                  enumerate(["삼성전자 현재가", "상승률 상위 3개 종목", "도움말", ""])) + "\n")
+    output = io.StringIO()
+    summary = run_batch(make_orchestrator(), lines, output, workers=2)
+
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [r["id"] for r in results] == [0, 1, 2, 3]
+    assert "71,000원" in results[0]["response"]
+    assert results[3]["status"] == "error"
+    assert summary["count"] == 4 and summary["errors"] == 1
+    assert summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"]
+
+if __name__ == "__main__":
+    test_iter_batch_records_is_lazy()
+    test_percentile_nearest_rank()
+    test_bounded_in_flight_and_ordered_output()
+    test_malformed_lines_are_errors_without_latency_samples()
+    test_run_batch_with_orchestrator()
+    print("결과: 통과")
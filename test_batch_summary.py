@@ -0,0 +1,65 @@
+import time
+import asyncio
+
+from agents.responder.batch_summary import (
+    BATCH_MAX_STOCKS, batch_max_tokens, build_batch_prompt, chunked, fan_out, fan_out_async, split_batch_answer,
+)
+
+STOCKS = [
+    {"symbol": "삼성전자", "current_price": 71000, "change_rate": 1.5, "volume": 1200000},
+    {"symbol": "SK하이닉스", "current_price": 180000, "change_rate": -0.8, "volume": 300000},
+    {"symbol": "NAVER", "current_price": 165000, "change_rate": 0.0, "volume": 90000},
+]
+
+def test_prompt_lists_every_stock():
+    prompt = build_batch_prompt(STOCKS)
+    assert "[삼성전자] 현재가 71,000원, 변동률 +1.50%" in prompt
+    assert "[SK하이닉스]" in prompt and "[NAVER]" in prompt
+    assert batch_max_tokens(1) < batch_max_tokens(20) <= 4000
+    assert [len(chunk) for chunk in chunked(list(range(45)), BATCH_MAX_STOCKS)] == [20, 20, 5]
+
+def test_split_keeps_only_requested_sections():
+    answer = """종목별 분석입니다.
+### 삼성전자
+거래량이 늘었습니다.
+반도체 업황을 주목하세요.
+
+### **NAVER**
+보합세입니다.
+### 카카오
+요청하지 않은 종목
+### SK하이닉스
+"""
+    sections = split_batch_answer(answer, [s["symbol"] for s in STOCKS])
+    assert sections == {
+        "삼성전자": "거래량이 늘었습니다.\n반도체 업황을 주목하세요.",
+        "NAVER": "보합세입니다.",
+    }
+    # 빈 섹션(SK하이닉스)은 빠지므로 호출 측에서 대체 요약으로 채운다
+    assert split_batch_answer("API 호출 중 오류 발생", ["삼성전자"]) == {}
+
+def test_fan_out_caps_concurrency_and_keeps_order():
+    active, peak = [0], [0]
+
+    def call(prompt):
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        active[0] -= 1
+        return prompt.upper()
+
+    prompts = [f"p{i}" for i in range(10)]
+    assert fan_out(call, prompts, max_concurrency=3) == [p.upper() for p in prompts]
+    assert peak[0] <= 3
+
+    async def acall(prompt):
+        await asyncio.sleep(0.01)
+        return prompt * 2
+
+    assert asyncio.run(fan_out_async(acall, ["a", "b", "c"], max_concurrency=2)) == ["aa", "bb", "cc"]
+
+if __name__ == "__main__":
+    test_prompt_lists_every_stock()
+    test_split_keeps_only_requested_sections()
+    test_fan_out_caps_concurrency_and_keeps_order()
+    print("결과: 통과")
@@ -0,0 +1,41 @@
+import os
+import json
+
+from benchmarks.run import compare_results, main, run_benchmarks
+
+MEASURED = ["orchestrator.analyze_query", "orchestrator.process",
+            "summarizer.analyze_market_sentiment", "summarizer.format_ranking_summary"]
+
+def test_run_reports_per_op_timings():
+    report = run_benchmarks(MEASURED, rounds=2, min_round_seconds=0)
+    for name in MEASURED:  # config.py 가 없어도 요약기 항목은 건너뛰지 않고 측정
+        result = report["results"][name]
+        assert result["rounds"] == 2 and 0 < result["min_us"] <= result["median_us"] <= result["max_us"]
+    assert report["meta"]["rounds"] == 2
+
+def test_compare_flags_regressions():
+    baseline = {"results": {"a": {"median_us": 10.0}, "b": {"median_us": 10.0}, "c": {"median_us": 10.0},
+                            "d": {"skipped": "설정 없음"}}}
+    current = {"results": {"a": {"median_us": 12.0}, "b": {"median_us": 10.5}, "c": {"median_us": 5.0},
+                           "d": {"median_us": 1.0}, "e": {"median_us": 1.0}}}
+    rows = {row["name"]: row for row in compare_results(current, baseline, threshold=0.15)}
+    assert rows["a"]["status"] == "regression" and rows["a"]["ratio"] == 1.2
+    assert rows["b"]["status"] == "ok" and rows["c"]["status"] == "improved"
+    assert rows["d"]["status"] == "skipped" and rows["e"]["status"] == "new"
+
+def test_main_exits_nonzero_on_regression(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    baseline = tmp_path / "baseline.json"
+    args = ["--only", "analyze_query", "--rounds", "1", "--min-round-seconds", "0"]
+    assert main(args + ["--out", "baseline.json"]) == 0  # 상대 경로는 실행한 위치 기준
+    assert baseline.exists() and os.getcwd() == str(tmp_path)
+
+    report = json.loads(baseline.read_text(encoding="utf-8"))
+    report["results"]["orchestrator.analyze_query"]["median_us"] /= 10  # 기준이 10배 빨랐던 것처럼
+    baseline.write_text(json.dumps(report), encoding="utf-8")
+    assert main(args + ["--compare", "baseline.json"]) == 1
+
+if __name__ == "__main__":
+    test_run_reports_per_op_timings()
+    test_compare_flags_regressions()
+    print("결과: 통과 (test_main_exits_nonzero_on_regression 은 pytest 로 실행)")
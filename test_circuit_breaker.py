@@ -0,0 +1,153 @@
+import time
+import socket
+import asyncio
+
+import pytest
+
+import utils.circuit_breaker as circuit_breaker
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError, deadline
+
+def failing(timeout):
+    raise ConnectionError("upstream down")
+
+def make_breaker(**kwargs):
+    options = dict(window=4, min_calls=4, failure_ratio=0.5, slow_seconds=1.0, open_seconds=0.05, max_open_seconds=1.0)
+    options.update(kwargs)
+    return CircuitBreaker("test", **options)
+
+def trip(breaker):
+    for _ in range(breaker.min_calls):
+        with pytest.raises(ConnectionError):
+            breaker.call(failing)
+
+def test_trips_open_and_fails_fast():
+    breaker = make_breaker()
+    breaker.call(lambda timeout: "ok")
+    breaker.call(lambda timeout: "ok")
+    with pytest.raises(ConnectionError):
+        breaker.call(failing)
+    assert breaker.state == "closed"  # 호출 수가 min_calls 미만
+
+    with pytest.raises(ConnectionError):
+        breaker.call(failing)
+    assert breaker.state == "open"  # 4번 중 2번 실패
+
+    calls = []
+    start = time.monotonic()
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda timeout: calls.append(timeout))
+    assert calls == [] and time.monotonic() - start < 0.01
+    assert breaker.stats()["transitions"] == {"closed->open": 1} and breaker.rejected == 1
+
+def test_slow_calls_count_as_failures():
+    breaker = make_breaker(slow_seconds=0.01, min_calls=2, window=2)
+    for _ in range(2):
+        breaker.call(lambda timeout: time.sleep(0.02))
+    assert breaker.state == "open"
+
+def test_half_open_probe_and_jittered_backoff():
+    breaker = make_breaker()
+    trip(breaker)
+    first_retry = breaker._retry_at - time.monotonic()
+    assert 0.02 <= first_retry <= 0.05  # open_seconds * [0.5, 1.0]
+
+    time.sleep(0.06)
+    assert breaker.allow()            # 탐색 호출 하나만 허용
+    assert not breaker.allow()
+    breaker.record(0.0, False)        # 탐색 실패 → 두 배 대기로 다시 차단
+    assert breaker.state == "open"
+    assert 0.05 <= breaker._retry_at - time.monotonic() <= 0.1
+
+    time.sleep(0.11)
+    assert breaker.call(lambda timeout: "ok") == "ok"
+    assert breaker.state == "closed"
+    assert breaker.stats()["transitions"] == {"closed->open": 1, "open->half_open": 2, "half_open->open": 1,
+                                              "half_open->closed": 1}
+
+def test_deadline_limits_timeout():
+    breaker = make_breaker()
+    assert breaker.call(lambda timeout: timeout) == breaker.timeout
+    with deadline(0.5):
+        assert breaker.call(lambda timeout: timeout) <= 0.5
+    with deadline(0):
+        with pytest.raises(CircuitOpenError):
+            breaker.call(lambda timeout: timeout)
+
+    async def probe(timeout):
+        return timeout
+
+    async def main():
+        with deadline(0.2):
+            return await breaker.call_async(probe)
+    assert asyncio.run(main()) <= 0.2
+
+def test_open_breaker_does_not_spend_rate_limit_tokens(tmp_path):
+    from utils.rate_limiter import TokenBucket, RateLimitExceeded
+
+    bucket = TokenBucket("clova", capacity=1, refill_per_second=0.1, path=str(tmp_path / "l.sqlite3"))
+    breaker = make_breaker()
+    trip(breaker)
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda timeout: "ok", acquire=bucket.acquire)
+    assert bucket.acquired == 0 and bucket.remaining() >= 1
+
+    # 토큰 대기는 요청 마감까지만 (MAX_WAIT 10초가 아니라)
+    fresh = make_breaker()
+    bucket.acquire()
+    start = time.monotonic()
+    with deadline(0.2):
+        with pytest.raises(RateLimitExceeded):
+            fresh.call(lambda timeout: "ok", acquire=bucket.acquire)
+    assert time.monotonic() - start < 0.1
+
+def test_cancellation_is_not_a_failure():
+    async def hang(timeout):
+        await asyncio.sleep(10)
+
+    async def cancel_call(breaker):
+        task = asyncio.ensure_future(breaker.call_async(hang))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    breaker = make_breaker(min_calls=1, window=1)
+    asyncio.run(cancel_call(breaker))
+    assert breaker.state == "closed" and breaker.stats()["failure_rate"] == 0.0
+
+    # half-open 탐색이 취소되면 실패로 다시 차단하지 않고 다음 탐색을 허용
+    probe = make_breaker(open_seconds=0.01)
+    trip(probe)
+    time.sleep(0.02)
+    asyncio.run(cancel_call(probe))
+    assert probe.state == "half_open" and probe.allow()
+
+def test_stream_fails_fast_while_open(monkeypatch, tmp_path):
+    from utils import hyperclova_api, rate_limiter
+
+    breaker = make_breaker(min_calls=2, window=2, open_seconds=60)
+    monkeypatch.setitem(circuit_breaker._breakers, "hyperclova", breaker)
+    # 실제 ./rate_limits.sqlite3 의 공유 한도를 쓰지 않도록
+    bucket = rate_limiter.TokenBucket("hyperclova", capacity=10, refill_per_second=0, path=str(tmp_path / "l.sqlite3"))
+    monkeypatch.setitem(rate_limiter._limiters, "hyperclova", bucket)
+
+    # 닫힌 포트로 연결 실패를 두 번 내서 차단
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        url = f"http://127.0.0.1:{sock.getsockname()[1]}/chat"
+    for _ in range(2):
+        assert list(hyperclova_api.generate_answer_stream("질문", url=url)) == ["API 호출 중 오류 발생"]
+    assert breaker.state == "open"
+
+    start = time.monotonic()
+    assert list(hyperclova_api.generate_answer_stream("질문", url=url)) == ["API 호출 중 오류 발생"]
+    assert time.monotonic() - start < 0.05 and breaker.rejected == 1
+    assert bucket.stats()["acquired"] == 2
+
+if __name__ == "__main__":
+    test_trips_open_and_fails_fast()
+    test_slow_calls_count_as_failures()
+    test_half_open_probe_and_jittered_backoff()
+    test_deadline_limits_timeout()
+    test_cancellation_is_not_a_failure()
+    print("결과: 통과 (test_stream_fails_fast_while_open 은 pytest 로 실행)")
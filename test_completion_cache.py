@@ -0,0 +1,61 @@
+from datetime import datetime
+
+from utils.completion_cache import (
+    CompletionCache, KST, MARKET_HOURS_TTL, completion_key, completion_ttl, is_market_open, normalize_prompt,
+)
+
+def test_ttl_follows_market_hours():
+    # 2024-08-07 은 수요일
+    assert is_market_open(datetime(2024, 8, 7, 10, 0, tzinfo=KST))
+    assert completion_ttl(datetime(2024, 8, 7, 10, 0, tzinfo=KST)) == MARKET_HOURS_TTL
+
+    # 장 마감 후 → 다음날 09:00 까지
+    assert completion_ttl(datetime(2024, 8, 7, 16, 0, tzinfo=KST)) == 17 * 3600
+    # 금요일 장 마감 후 → 월요일 09:00 까지
+    assert completion_ttl(datetime(2024, 8, 9, 15, 30, tzinfo=KST)) == (2 * 24 + 17.5) * 3600
+    # 장 시작 전 → 당일 09:00 까지
+    assert completion_ttl(datetime(2024, 8, 7, 8, 30, tzinfo=KST)) == 1800
+
+def test_key_ignores_whitespace_but_not_params():
+    messages = [{"role": "system", "content": "분석가"}, {"role": "user", "content": "\n 종목:  삼성전자\n\n현재가: 70,000원 \n"}]
+    same = [{"role": "system", "content": "분석가"}, {"role": "user", "content": "종목: 삼성전자\n현재가: 70,000원"}]
+    params = {"temperature": 0.3, "maxTokens": 300}
+
+    assert normalize_prompt(messages[1]["content"]) == "종목: 삼성전자\n현재가: 70,000원"
+    assert completion_key(messages, params) == completion_key(same, params)
+    assert completion_key(messages, params) != completion_key(messages, {"temperature": 0.3, "maxTokens": 400})
+
+def test_lru_disk_and_stats(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = CompletionCache(path, max_entries=2)
+    assert cache.get("a") is None
+
+    cache.put("a", "응답A", latency=2.0, ttl=600)
+    cache.put("b", "응답B", latency=1.0, ttl=600)
+    cache.put("c", "응답C", latency=1.0, ttl=600)
+    assert "a" not in cache._memory
+
+    # 메모리에서 밀려난 항목은 디스크에서 읽어 온다
+    assert cache.get("a") == "응답A"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["saved_seconds"]) == (1, 1, 2.0)
+    cache.close()
+
+    reopened = CompletionCache(path)
+    assert reopened.get("b") == "응답B"
+    reopened.close()
+
+def test_expired_entries_miss(tmp_path):
+    cache = CompletionCache(str(tmp_path / "cache.sqlite3"))
+    cache.put("a", "응답A", latency=1.0, ttl=-1)
+    assert cache.get("a") is None
+    assert cache.purge_expired() == 1
+    cache.close()
+
+if __name__ == "__main__":
+    import tempfile, pathlib
+    test_ttl_follows_market_hours()
+    test_key_ignores_whitespace_but_not_params()
+    test_lru_disk_and_stats(pathlib.Path(tempfile.mkdtemp()))
+    test_expired_entries_miss(pathlib.Path(tempfile.mkdtemp()))
+    print("ok")
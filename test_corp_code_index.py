@@ -0,0 +1,70 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.corp_code_index import build_corp_code_index, load_corp_code_index
+from utils.corp_resolver import CompanyResolver
+
+CORPCODE_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<result>
+<list><corp_code>00126380</corp_code><corp_name>삼성전자</corp_name><stock_code>005930</stock_code><modify_date>20240101</modify_date></list>
+<list><corp_code>00164779</corp_code><corp_name>SK하이닉스</corp_name><stock_code>000660</stock_code><modify_date>20240101</modify_date></list>
+<list><corp_code>00999999</corp_code><corp_name>다코</corp_name><stock_code> </stock_code><modify_date>20170630</modify_date></list>
+<list><corp_code>00888888</corp_code><corp_name>다코</corp_name><stock_code>123456</stock_code><modify_date>20170630</modify_date></list>
+</result>
+"""
+
+def write_xml(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+def test_build_and_lookup(tmp_path):
+    xml_path = str(tmp_path / "CORPCODE.xml")
+    write_xml(xml_path, CORPCODE_XML)
+
+    index = load_corp_code_index(xml_path)
+    assert len(index) == 4
+    assert index.get("삼성전자") == "00126380"
+    assert index.get("없는회사") is None
+    # 동명 회사는 상장사 우선
+    assert index.get("다코") == "00888888"
+    assert [e["corp_code"] for e in index.find_all("다코")] == ["00888888", "00999999"]
+    assert index.get_by_stock_code("000660")["corp_name"] == "SK하이닉스"
+    assert index.find_prefix("SK")[0]["corp_code"] == "00164779"
+    assert index.as_dict()["다코"] == "00888888"
+    index.close()
+
+def test_rebuild_only_when_xml_changes(tmp_path):
+    xml_path = str(tmp_path / "CORPCODE.xml")
+    index_path = str(tmp_path / "CORPCODE.idx")
+    write_xml(xml_path, CORPCODE_XML)
+    build_corp_code_index(xml_path, index_path)
+    built = os.stat(index_path)
+
+    # 내용이 같으면 mtime 이 바뀌어도 다시 만들지 않음 (파일 교체 없음)
+    touched_at = built.st_mtime_ns + 10**9
+    os.utime(xml_path, ns=(touched_at, touched_at))
+    load_corp_code_index(xml_path, index_path).close()
+    assert os.stat(index_path).st_ino == built.st_ino
+
+    # 내용이 바뀌면 다시 생성
+    write_xml(xml_path, CORPCODE_XML.replace("SK하이닉스", "에스케이하이닉스"))
+    index = load_corp_code_index(xml_path, index_path)
+    assert index.get("에스케이하이닉스") == "00164779"
+    assert index.get("SK하이닉스") is None
+    index.close()
+
+def test_concurrent_builds_do_not_share_a_temp_file(tmp_path):
+    xml_path = str(tmp_path / "CORPCODE.xml")
+    index_path = str(tmp_path / "CORPCODE.idx")
+    write_xml(xml_path, CORPCODE_XML)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        counts = list(pool.map(lambda _: build_corp_code_index(xml_path, index_path), range(16)))
+    assert counts == [4] * 16
+    assert sorted(os.listdir(tmp_path)) == ["CORPCODE.idx", "CORPCODE.xml"]  # 임시 파일이 남지 않음
+    assert load_corp_code_index(xml_path, index_path).get("삼성전자") == "00126380"
+
+def test_resolver_uses_corp_codes(tmp_path):
+    xml_path = str(tmp_path / "CORPCODE.xml")
+    write_xml(xml_path, CORPCODE_XML)
+    resolver = CompanyResolver.from_files(corpcode_xml=xml_path)
+    assert resolver.find("삼성전자 현재가")["corp_code"] == "00126380"
@@ -0,0 +1,59 @@
+from utils.corp_resolver import CompanyResolver
+
+def test_resolver():
+    resolver = CompanyResolver([
+        {"name": "삼성전자", "stock_code": "005930", "corp_code": "00126380"},
+        {"name": "삼성전자서비스", "stock_code": None, "corp_code": "00258999"},
+        {"name": "SK하이닉스", "stock_code": "000660", "corp_code": "00164779"},
+        {"name": "(주)레몬", "stock_code": "294140", "corp_code": None},
+    ])
+
+    # 가장 긴 회사 언급 우선
+    assert resolver.find("삼성전자서비스 실적")["corp_code"] == "00258999"
+    assert resolver.find("삼성전자의 2024-08-08 종가는?")["stock_code"] == "005930"
+    # 영문 대소문자 무시, 종목코드 인식
+    assert resolver.find("sk하이닉스 주가")["stock_code"] == "000660"
+    assert resolver.find("000660 현재가")["name"] == "SK하이닉스"
+    assert resolver.find("20000660 거래량") is None
+    # 법인 표기를 뺀 약칭, 짧은 이름은 단어 경계에서만
+    assert resolver.find("레몬의 주가")["stock_code"] == "294140"
+    assert resolver.find("레몬트리 판매량") is None
+    assert resolver.lookup("레몬")["stock_code"] == "294140"
+
+def test_mention_needs_right_boundary():
+    resolver = CompanyResolver([
+        {"name": "삼성전자", "stock_code": "005930", "corp_code": "00126380"},
+        {"name": "카카오", "stock_code": "035720", "corp_code": "00258801"},
+    ])
+
+    # 긴 이름도 다른 단어의 앞부분이면 제외 (조사, 공백, 문장부호, 문자열 끝은 허용)
+    assert resolver.find("카카오뱅크 주가") is None
+    assert resolver.find("카카오에서 발표한 실적")["stock_code"] == "035720"
+    assert resolver.find("카카오, 삼성전자 비교")["stock_code"] == "005930"
+    assert resolver.find("오늘 삼성전자")["stock_code"] == "005930"
+
+    # 우선주는 보통주로 인식하지 않음
+    for query in ("삼성전자우 현재가", "삼성전자우선주 현재가", "삼성전자 우선주 현재가", "삼성전자2우B 주가"):
+        assert resolver.find(query) is None, query
+
+def test_preferred_share_is_not_common_stock():
+    from agents.interpreter.query_classifier import QueryClassifier
+
+    classifier = QueryClassifier()
+    assert classifier.analyze("삼성전자우 현재가") == {"type": "stock_price", "symbol": "삼성전자우"}
+    assert classifier.extract_stock_name("삼성전자우 현재가") == "삼성전자우"
+    assert classifier.analyze("삼성전자 현재가")["stock_code"] == "005930"
+
+def test_resolver_from_kind_csv():
+    resolver = CompanyResolver.from_files(corpcode_xml="missing_CORPCODE.xml")
+    company = resolver.find("카카오 주가")
+    assert company["name"] == "카카오"
+    assert company["stock_code"] == "035720"
+    assert "ticker" not in company and "market" not in company
+
+if __name__ == "__main__":
+    test_resolver()
+    test_mention_needs_right_boundary()
+    test_preferred_share_is_not_common_stock()
+    test_resolver_from_kind_csv()
+    print("결과: 통과")
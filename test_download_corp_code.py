@@ -0,0 +1,96 @@
+import io
+import os
+import json
+import zipfile
+import sys
+import hashlib
+import threading
+import subprocess
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+from download_corp_code import refresh_corp_code
+
+def make_zip(entries):
+    xml = "<result>" + "".join(
+        f"<list><corp_code>{code}</corp_code><corp_name>{name}</corp_name>"
+        f"<stock_code>{stock}</stock_code><modify_date>20240101</modify_date></list>"
+        for code, name, stock in entries
+    ) + "</result>"
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("CORPCODE.xml", xml)
+    return buffer.getvalue()
+
+class FixtureServer:
+    """로컬 OpenDART 대역: 현재 fixture zip 을 ETag 와 함께 제공"""
+
+    def __init__(self):
+        self.payload = b""
+        self.requests = 0
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                fixture.requests += 1
+                etag = '"' + hashlib.md5(fixture.payload).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(fixture.payload)))
+                self.end_headers()
+                self.wfile.write(fixture.payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = HTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/api/corpCode.xml"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+
+def test_refresh_emits_only_changed_records(tmp_path):
+    server = FixtureServer()
+    paths = {
+        "xml_path": str(tmp_path / "CORPCODE.xml"),
+        "prev_path": str(tmp_path / "CORPCODE.prev.xml"),
+        "meta_path": str(tmp_path / "CORPCODE.meta.json"),
+        "changes_path": str(tmp_path / "CORPCODE.changes.jsonl"),
+    }
+    try:
+        server.payload = make_zip([("00126380", "삼성전자", "005930"), ("00164779", "SK하이닉스", "000660")])
+        first = refresh_corp_code(url=server.url, **paths)
+        assert first["status"] == "updated"
+        assert len(first["changes"]) == 2
+        assert os.path.exists(str(tmp_path / "CORPCODE.idx"))
+
+        # 같은 ETag → 304
+        assert refresh_corp_code(url=server.url, **paths)["status"] == "not_modified"
+
+        server.payload = make_zip([("00126380", "삼성전자", "005930"), ("00164779", "에스케이하이닉스", "000660"),
+                                   ("00000001", "신규상장", "999999")])
+        updated = refresh_corp_code(url=server.url, **paths)
+        assert updated["status"] == "updated"
+        assert sorted((c["change"], c["corp_code"]) for c in updated["changes"]) == [
+            ("added", "00000001"), ("modified", "00164779")
+        ]
+        assert os.path.exists(paths["prev_path"])
+        with open(paths["changes_path"], encoding="utf-8") as f:
+            assert [json.loads(line)["corp_code"] for line in f] == ["00164779", "00000001"]
+    finally:
+        server.close()
+
+def test_script_uses_cassettes_from_env(tmp_path):
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "download_corp_code.py")
+    env = dict(os.environ, HTTP_CASSETTE_MODE="replay", HTTP_CASSETTE_DIR=str(tmp_path / "cassettes"), DART_API_KEY="test")
+    result = subprocess.run([sys.executable, script, "--refresh"], cwd=tmp_path, env=env,
+                            capture_output=True, text=True, timeout=60)
+
+    # 재생 모드라 네트워크로 나가지 않고 빈 카세트에서 바로 실패
+    assert "HTTP replay 모드" in result.stdout
+    assert result.returncode != 0 and "CassetteMiss" in result.stderr
+    assert not (tmp_path / "CORPCODE.xml").exists()
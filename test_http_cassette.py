@@ -0,0 +1,127 @@
+import os
+import time
+import asyncio
+from datetime import date
+
+import httpx
+import numpy as np
+import pytest
+
+from utils.http_cassette import CassetteMiss, cassette_fetcher, cassette_stats, use_cassettes
+from utils.http_client import get_http_client, get_async_client, close_async_client
+from utils.price_store import OHLCV_DTYPE
+from test_http_client import KeepAliveServer
+
+@pytest.fixture(autouse=True)
+def reset_cassettes():
+    yield
+    use_cassettes(None)
+
+def record_one(tmp_path):
+    server = KeepAliveServer()
+    try:
+        use_cassettes("record", str(tmp_path))
+        url = server.origin + "/api/fnlttSinglAcnt.json?corp_code=00126380&crtfc_key=SECRET"
+        assert get_http_client(url).get(url).json() == {"status": "000"}
+    finally:
+        server.close()
+    return server.origin
+
+def test_record_then_replay_without_network(tmp_path):
+    origin = record_one(tmp_path)
+    files = [os.path.join(root, name) for root, _, names in os.walk(tmp_path) for name in names]
+    assert len(files) == 1 and "SECRET" not in open(files[0], encoding="utf-8").read()
+
+    use_cassettes("replay", str(tmp_path), latency="fixed:30")
+    # 인증 키와 파라미터 순서가 달라도 같은 카세트 (서버는 이미 종료)
+    url = origin + "/api/fnlttSinglAcnt.json?crtfc_key=OTHER&corp_code=00126380"
+    start = time.monotonic()
+    assert get_http_client(url).get(url).json() == {"status": "000"}
+    assert time.monotonic() - start >= 0.03
+
+    with pytest.raises(CassetteMiss):
+        get_http_client(url).get(origin + "/api/list.json")
+    assert cassette_stats() == {"mode": "replay", "recorded": 0, "replayed": 1, "misses": 1, "injected_errors": 0}
+
+def test_injected_errors_are_seeded(tmp_path):
+    origin = record_one(tmp_path)
+    url = origin + "/api/fnlttSinglAcnt.json?corp_code=00126380"
+
+    def statuses(seed):
+        use_cassettes("replay", str(tmp_path), latency="0", error_rate=0.5, seed=seed)
+        return [get_http_client(url).get(url).status_code for _ in range(40)]
+
+    first = statuses(7)
+    assert first == statuses(7) and set(first) == {200, 503}
+
+    use_cassettes("replay", str(tmp_path), latency="0", error_rate=1.0, error_status=0)
+    with pytest.raises(httpx.ConnectError):
+        get_http_client(url).get(url)
+
+def test_async_replay_latency_does_not_block(tmp_path):
+    origin = record_one(tmp_path)
+    url = origin + "/api/fnlttSinglAcnt.json?corp_code=00126380"
+    use_cassettes("replay", str(tmp_path), latency=f"127.0.0.1:{origin.rsplit(':', 1)[1]}=fixed:100;default=fixed:5000")
+
+    async def main():
+        client = get_async_client(url)
+        start = time.monotonic()
+        responses = await asyncio.gather(*(client.get(url) for _ in range(10)))
+        elapsed = time.monotonic() - start
+        await close_async_client()
+        return responses, elapsed
+
+    responses, elapsed = asyncio.run(main())
+    assert all(response.json() == {"status": "000"} for response in responses)
+    assert 0.1 <= elapsed < 0.5  # 호스트별 지연 100ms, 10개가 동시에 대기
+
+def test_price_fetcher_record_and_replay(tmp_path):
+    calls = []
+
+    def fetcher(ticker, start, end):
+        calls.append(ticker)
+        rows = np.zeros(2, dtype=OHLCV_DTYPE)
+        rows["date"] = [20240807, 20240808]
+        rows["close"] = [71000.0, 72000.0]
+        return rows
+
+    fetch = cassette_fetcher(fetcher)
+    use_cassettes("record", str(tmp_path))
+    recorded = fetch("005930.KS", date(2024, 8, 7), date(2024, 8, 8))
+
+    use_cassettes("replay", str(tmp_path), latency="0")
+    replayed = fetch("005930.KS", date(2024, 8, 7), date(2024, 8, 8))
+    assert calls == ["005930.KS"] and np.array_equal(recorded, replayed)
+    with pytest.raises(CassetteMiss):
+        fetch("000660.KS", date(2024, 8, 7), date(2024, 8, 8))
+
+def test_market_snapshot_download_record_and_replay(tmp_path, monkeypatch):
+    from agents.datagatherer import market_snapshot
+
+    calls = []
+
+    def download(symbols):
+        calls.append(sorted(symbols))
+        return {"005930.KS": (np.array([71000.0, 72000.0]), np.array([900, 1000]))}
+
+    listings = [("005930", "삼성전자")]
+    monkeypatch.setattr(market_snapshot, "yfinance_daily_bars", download)
+    use_cassettes("record", str(tmp_path))
+    source = market_snapshot.YFinanceQuoteSource(listings)
+    recorded = [source(), source()]  # 첫 갱신은 .KS/.KQ 모두, 다음은 알아낸 시장만
+    assert calls == [["005930.KQ", "005930.KS"], ["005930.KS"]]
+
+    monkeypatch.setattr(market_snapshot, "yfinance_daily_bars", lambda symbols: pytest.fail("재생 중 Yahoo 호출"))
+    use_cassettes("replay", str(tmp_path), latency="0")
+    source = market_snapshot.YFinanceQuoteSource(listings)
+    assert [source(), source()] == recorded
+    assert recorded[0][0]["market"] == "KOSPI" and recorded[0][0]["volume"] == 1000
+    assert cassette_stats()["replayed"] == 2
+
+if __name__ == "__main__":
+    import tempfile, pathlib
+    for test in (test_record_then_replay_without_network, test_injected_errors_are_seeded,
+                 test_async_replay_latency_does_not_block, test_price_fetcher_record_and_replay):
+        test(pathlib.Path(tempfile.mkdtemp()))
+        use_cassettes(None)
+    print("결과: 통과")
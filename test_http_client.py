@@ -0,0 +1,80 @@
+import asyncio
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from utils.http_client import get_http_client, get_async_client, close_async_client, pool_stats
+
+class KeepAliveServer:
+    """HTTP/1.1 keep-alive 로 응답하는 로컬 서버 (연결 수를 센다)"""
+
+    def __init__(self):
+        self.connections = 0
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                fixture.connections += 1
+                super().setup()
+
+            def do_GET(self):
+                body = b'{"status": "000"}'
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.origin = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+
+def test_sync_client_reuses_connection_per_host():
+    server = KeepAliveServer()
+    try:
+        url = server.origin + "/api/test.json"
+        client = get_http_client(url)
+        assert get_http_client(server.origin + "/other") is client
+
+        for _ in range(3):
+            assert client.get(url).json() == {"status": "000"}
+
+        stats = pool_stats()[server.origin]
+        assert stats["requests"] == 3
+        assert stats["misses"] == 1
+        assert stats["hits"] == 2
+        assert server.connections == 1
+    finally:
+        server.close()
+
+def test_async_client_reuses_connection_per_host():
+    server = KeepAliveServer()
+    url = server.origin + "/api/test.json"
+
+    async def run():
+        try:
+            for _ in range(3):
+                response = await get_async_client(url).get(url)
+                assert response.status_code == 200
+        finally:
+            await close_async_client()
+
+    try:
+        asyncio.run(run())
+        stats = pool_stats()[server.origin]
+        assert (stats["misses"], stats["hits"]) == (1, 2)
+        assert server.connections == 1
+    finally:
+        server.close()
+
+if __name__ == "__main__":
+    test_sync_client_reuses_connection_per_host()
+    test_async_client_reuses_connection_per_host()
+    print("ok")
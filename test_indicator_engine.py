@@ -0,0 +1,85 @@
+import numpy as np
+
+from agents.decisionmaker.indicator_engine import IndicatorEngine
+
+def make_engine(days=80, tickers=30, seed=0):
+    rng = np.random.default_rng(seed)
+    closes = 10000 * np.cumprod(1 + rng.normal(0, 0.02, size=(days, tickers)), axis=0)
+    closes[:15, 0] = np.nan  # 상장 전
+    dates = [f"2024-{1 + i // 28:02d}-{1 + i % 28:02d}" for i in range(days)]
+    return IndicatorEngine(closes, [f"T{i:03d}" for i in range(tickers)], dates), closes, dates
+
+def naive_ma(closes, period, day):
+    if day + 1 < period:
+        return np.full(closes.shape[1], np.nan)
+    return closes[day + 1 - period:day + 1].mean(axis=0)
+
+def test_moving_average_matches_naive():
+    engine, closes, dates = make_engine()
+    for period in (5, 20, 50):
+        for day in (0, 10, 49, 60, 79):
+            np.testing.assert_allclose(engine.moving_average(period, dates[day]), naive_ma(closes, period, day))
+        series = engine.moving_average_series(period)
+        np.testing.assert_allclose(series[-1], naive_ma(closes, period, 79))
+        np.testing.assert_allclose(series[period + 3], naive_ma(closes, period, period + 3))
+
+def test_cache_and_append_day():
+    engine, closes, dates = make_engine()
+    engine.moving_average(20)
+    engine.moving_average(20)
+    assert (engine.cache_hits, engine.cache_misses) == (1, 1)
+
+    new_row = closes[-1] * 1.3
+    engine.append_day("2024-04-01", new_row)
+    full = IndicatorEngine(np.vstack([closes, new_row]), engine.tickers, dates + ["2024-04-01"])
+    np.testing.assert_allclose(engine.moving_average(20), full.moving_average(20))
+
+    # 같은 날짜로 다시 추가하면 장중 갱신으로 교체되고 해당 날짜 캐시만 무효화
+    engine.append_day("2024-04-01", closes[-1])
+    np.testing.assert_allclose(engine.moving_average(20), naive_ma(np.vstack([closes, closes[-1]]), 20, 80))
+
+    # 버퍼 용량을 넘어도 계속 추가 가능
+    for i in range(200):
+        engine.append_day(f"2025-{1 + i // 28:02d}-{1 + i % 28:02d}", closes[-1])
+    np.testing.assert_allclose(engine.moving_average(50), closes[-1])
+
+def test_breakout_and_cross_signals():
+    dates = ["d01", "d02", "d03", "d04"]
+    closes = np.array([
+        [100, 100, 100],
+        [100, 100, 100],
+        [100, 90, 110],
+        [120, 120, 90],
+    ], dtype=float)
+    engine = IndicatorEngine(closes, ["A", "B", "C"], dates)
+
+    # 3일 이평: d04 = [106.67, 103.33, 100] → 이격도 [12.5%, 16.13%, -10%]
+    assert engine.breakout(3, 10.0).tolist() == [True, True, False]
+    assert engine.breakout(3, 15.0).tolist() == [False, True, False]
+    assert engine.cross(3).tolist() == [1, 1, -1]
+
+    result = engine.evaluate(ma_period=3, threshold=10.0, signal_type="breakout")
+    assert result["result"] == [
+        {"target": "B", "signal": "상향 돌파", "gap_ratio": 16.13, "judgement": True},
+        {"target": "A", "signal": "상향 돌파", "gap_ratio": 12.5, "judgement": True},
+    ]
+    crosses = engine.evaluate(ma_period=3, signal_type="cross")
+    assert [(r["target"], r["signal"]) for r in crosses["result"]] == [("B", "상향 돌파"), ("A", "상향 돌파"), ("C", "하향 이탈")]
+
+def test_from_price_store(tmp_path):
+    from utils.price_store import PriceStore
+    from test_price_store import fake_fetcher
+
+    store = PriceStore(str(tmp_path), fetcher=fake_fetcher([]))
+    engine = IndicatorEngine.from_price_store(store, ["005930.KS", "000660.KS"], "2024-08-01", "2024-08-09")
+    assert engine.dates == ["2024-08-01", "2024-08-02", "2024-08-05", "2024-08-06", "2024-08-07", "2024-08-08", "2024-08-09"]
+    # fake 종가 = 일자 * 100 + 10 → 최근 3거래일 (7, 8, 9일) 평균
+    np.testing.assert_allclose(engine.moving_average(3), [810.0, 810.0])
+
+if __name__ == "__main__":
+    test_moving_average_matches_naive()
+    test_cache_and_append_day()
+    test_breakout_and_cross_signals()
+    import tempfile, pathlib
+    test_from_price_store(pathlib.Path(tempfile.mkdtemp()))
+    print("결과: 통과")
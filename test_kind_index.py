@@ -0,0 +1,34 @@
+from utils.kind_index import KindSearchIndex
+
+def make_index():
+    return KindSearchIndex({
+        "회사명": ["삼성전자", "삼성바이오로직스", "카카오", "카카오게임즈", "셀트리온"],
+        "종목코드": ["005930", "207940", "035720", "293490", "068270"],
+        "업종": ["통신 및 방송 장비 제조업", "기초 의약물질 제조업", "포털 및 기타 인터넷 정보매개 서비스업",
+               "소프트웨어 개발 및 공급업", "기초 의약물질 제조업"],
+        "주요제품": ["반도체, 휴대폰", "바이오의약품 위탁생산", "인터넷 서비스", "모바일 게임", "바이오의약품"],
+    })
+
+def test_substring_and_ranking():
+    index = make_index()
+    # 회사명 완전일치 → 회사명 시작 → 주요제품 순
+    assert [r["회사명"] for r in index.search("카카오")] == ["카카오", "카카오게임즈"]
+    assert [r["회사명"] for r in index.search("바이오")] == ["삼성바이오로직스", "셀트리온"]
+    assert index.search("반도체")[0]["종목코드"] == "005930"
+    assert index.search("없는회사") == []
+
+def test_multi_term_and_limit():
+    index = make_index()
+    assert index.search_ids("의약 위탁") == [1]
+    assert len(index.search("제조업", limit=2)) == 2
+    assert index.search_ids("게임", fields=["회사명"]) == [3]
+
+def test_kind_csv():
+    index = KindSearchIndex.from_csv()
+    result = index.search("삼성전자", limit=1)
+    assert result[0]["종목코드"] == "005930"
+
+if __name__ == "__main__":
+    test_substring_and_ranking()
+    test_multi_term_and_limit()
+    test_kind_csv()
@@ -0,0 +1,120 @@
+import json
+import logging
+import threading
+
+from agents.base_agent import BaseAgent
+from utils.logger import DebugSampler, request_context, set_console_echo, setup_logging, shutdown_logging
+
+class EchoAgent(BaseAgent):
+    def __init__(self):
+        super().__init__("EchoAgent")
+
+    def process(self, input_data):
+        self.log_info("질문 처리: %s", input_data["query"])
+        return {"status": "success"}
+
+class Probe:
+    """str() 이 불린 횟수와 스레드를 기록 (지연 포맷 확인용)"""
+
+    def __init__(self):
+        self.threads = []
+
+    def __str__(self):
+        self.threads.append(threading.current_thread().name)
+        return "probe"
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+def test_json_lines_carry_agent_and_request_id(tmp_path):
+    path = tmp_path / "agent.log"
+    setup_logging(str(path), console=False)
+    try:
+        with request_context("req-1"):
+            EchoAgent().process({"query": "삼성전자 현재가"})
+        EchoAgent().log_error("실패: %s", ValueError("boom"))
+    finally:
+        shutdown_logging()
+
+    first, second = read_lines(path)
+    assert first["agent"] == "EchoAgent" and first["request_id"] == "req-1"
+    assert first["level"] == "INFO" and first["message"] == "질문 처리: 삼성전자 현재가"
+    assert second["level"] == "ERROR" and second["request_id"] is None and second["message"] == "실패: boom"
+
+def test_formatting_is_lazy_and_off_thread(tmp_path):
+    setup_logging(str(tmp_path / "agent.log"), level="INFO", console=False)
+    agent = EchoAgent()
+    probe = Probe()
+    try:
+        agent.log_debug("무시됨 %s", probe)
+        assert probe.threads == []  # 레벨이 꺼져 있으면 포맷하지 않음
+        agent.log_info("기록됨 %s", probe)
+    finally:
+        shutdown_logging()
+    assert any(name != threading.current_thread().name for name in probe.threads)
+
+def test_debug_sampling_is_per_request():
+    sampler = DebugSampler(0.5)
+
+    def kept(request_id):
+        record = logging.LogRecord("x", logging.DEBUG, __file__, 1, "m", None, None)
+        with request_context(request_id):
+            return sampler.filter(record)
+
+    decisions = {request_id: kept(request_id) for request_id in map(str, range(200))}
+    assert all(kept(request_id) == decision for request_id, decision in decisions.items())
+    assert 60 < sum(decisions.values()) < 140
+    assert not DebugSampler(0).filter(logging.LogRecord("x", logging.DEBUG, __file__, 1, "m", None, None))
+    assert DebugSampler(0).filter(logging.LogRecord("x", logging.INFO, __file__, 1, "m", None, None))
+
+def test_console_echo_switch(tmp_path, capsys):
+    setup_logging(str(tmp_path / "agent.log"), console=True)
+    try:
+        EchoAgent().log_info("보임")
+        set_console_echo(False)
+        EchoAgent().log_info("숨김")
+    finally:
+        shutdown_logging()
+    err = capsys.readouterr().err
+    assert "[EchoAgent] 보임" in err and "숨김" not in err
+    assert [line["message"] for line in read_lines(tmp_path / "agent.log")] == ["보임", "숨김"]
+
+def test_agent_errors_use_lazy_formatting():
+    from agents.orchestrator import OrchestratorAgent
+
+    class Recorder(logging.Handler):
+        def __init__(self):
+            super().__init__()
+            self.records = []
+
+        def emit(self, record):
+            self.records.append(record)
+
+    class BrokenClassifier:
+        def analyze(self, query):
+            raise ValueError("boom")
+
+    recorder = Recorder()
+    orchestrator = OrchestratorAgent()
+    orchestrator.classifier = BrokenClassifier()
+    orchestrator.logger.addHandler(recorder)
+    try:
+        assert orchestrator.process({"query": "삼성전자 현재가"})["status"] == "error"
+        assert orchestrator.validate_input({}, ["query"]) is False
+    finally:
+        orchestrator.logger.removeHandler(recorder)
+
+    # 메시지는 템플릿 그대로, 값은 args 로 넘겨 포맷은 리스너 스레드에서
+    assert [(r.msg, r.getMessage()) for r in recorder.records] == [
+        ("실제 데이터 오케스트레이터 처리 실패: %s", "실제 데이터 오케스트레이터 처리 실패: boom"),
+        ("Required key '%s' not found in input data", "Required key 'query' not found in input data"),
+    ]
+
+if __name__ == "__main__":
+    import tempfile, pathlib
+    test_json_lines_carry_agent_and_request_id(pathlib.Path(tempfile.mkdtemp()))
+    test_formatting_is_lazy_and_off_thread(pathlib.Path(tempfile.mkdtemp()))
+    test_debug_sampling_is_per_request()
+    test_agent_errors_use_lazy_formatting()
+    print("결과: 통과 (test_console_echo_switch 는 pytest 로 실행)")
@@ -0,0 +1,141 @@
+import random
+
+from agents.datagatherer import market_aggregates, market_snapshot
+from agents.datagatherer.market_aggregates import (
+    MarketAggregateStore, build_market_aggregates, compute_daily_aggregates, quotes_from_price_store
+)
+from agents.interpreter.query_classifier import QueryClassifier
+from agents.orchestrator import OrchestratorAgent
+from test_orchestrator_async import FakeGatherer
+
+def make_quotes(count, seed):
+    rng = random.Random(seed)
+    return [{"symbol": f"종목{i:04d}", "market": rng.choice(["KOSPI", "KOSDAQ"]),
+             "change_rate": rng.choice([0.0, round(rng.uniform(-30, 30), 2)]),
+             "volume": rng.choice([0, rng.randint(1, 10_000_000)])}
+            for i in range(count)]
+
+def test_aggregates_match_brute_force():
+    quotes = make_quotes(1000, 1)
+    aggregates = compute_daily_aggregates(quotes)
+
+    for market in ("KOSPI", "KOSDAQ", "ALL"):
+        rows = [q for q in quotes if market == "ALL" or q["market"] == market]
+        traded = [q for q in rows if q["volume"] > 0]
+        assert aggregates[market] == {
+            "advancers": sum(q["change_rate"] > 0 for q in traded),
+            "decliners": sum(q["change_rate"] < 0 for q in traded),
+            "unchanged": sum(q["change_rate"] == 0 for q in traded),
+            "traded": len(traded),
+            "total_volume": sum(q["volume"] for q in rows),
+        }
+
+def test_store_record_and_backfill(tmp_path):
+    store = MarketAggregateStore(str(tmp_path / "aggregates.sqlite3"))
+    store.record_day("2024-08-08", make_quotes(50, 2))
+    assert store.get("2024-08-08", "kospi")["market"] == "KOSPI"
+    assert store.get("2024-08-09") is None
+
+    fetched = []
+
+    def fetch_day(day):
+        fetched.append(day)
+        return [] if day == "2024-08-15" else make_quotes(10, day)  # 광복절 휴장
+
+    filled = store.backfill("2024-08-08", "2024-08-16", fetch_day)
+    assert "2024-08-08" not in fetched  # 이미 있는 날짜는 다시 받지 않음
+    assert "2024-08-10" not in fetched  # 주말 제외
+    assert filled == ["2024-08-09", "2024-08-12", "2024-08-13", "2024-08-14", "2024-08-16"]
+    assert store.backfill("2024-08-08", "2024-08-16", fetch_day) == []
+
+    # 파일에 남아 재시작 후에도 조회
+    store_row = store.get("2024-08-16", "ALL")
+    store.close()
+    assert MarketAggregateStore(str(tmp_path / "aggregates.sqlite3")).get("2024-08-16", "ALL") == store_row
+
+def test_quotes_from_price_store(tmp_path):
+    from utils.price_store import PriceStore
+    from test_price_store import fake_fetcher
+
+    store = PriceStore(str(tmp_path), fetcher=fake_fetcher([]))
+    quotes = quotes_from_price_store(store, [("005930.KS", "KOSPI"), ("035720.KQ", "KOSDAQ")], "2024-08-09")
+    # fake 종가 = 일자 * 100 + 10 → 8일 810, 9일 910
+    assert [q["market"] for q in quotes] == ["KOSPI", "KOSDAQ"]
+    assert round(quotes[0]["change_rate"], 4) == round(100 / 810 * 100, 4)
+    assert quotes_from_price_store(store, [("005930.KS", "KOSPI")], "2024-08-10") == []  # 주말
+
+def test_build_from_price_store(tmp_path):
+    from utils.price_store import PriceStore
+    from test_price_store import fake_fetcher
+
+    calls = []
+    price_store = PriceStore(str(tmp_path / "prices"), fetcher=fake_fetcher(calls))
+    store = MarketAggregateStore(str(tmp_path / "aggregates.sqlite3"))
+    listings = [("005930.KS", "KOSPI"), ("035720.KQ", "KOSDAQ")]
+
+    assert build_market_aggregates("2024-08-08", "2024-08-12", listings, price_store, store) == [
+        "2024-08-08", "2024-08-09", "2024-08-12"]
+    assert len(calls) == 2  # 종목마다 구간 전체를 한 번에
+    assert store.get("2024-08-09", "KOSDAQ")["advancers"] == 1
+    assert store.get("2024-08-12")["advancers"] == 2  # 9일 종가 910 → 12일 1210
+
+    # 다음 날 실행하면 새 날짜만 채움
+    assert build_market_aggregates("2024-08-13", "2024-08-13", listings, price_store, store) == ["2024-08-13"]
+
+def test_main_build_aggregates_flag(tmp_path, monkeypatch):
+    import argparse
+    import main
+    from utils import price_store
+    from test_price_store import fake_fetcher
+
+    class FakeSource:
+        def __call__(self):
+            return []
+
+        def yfinance_listings(self):
+            return [("005930.KS", "KOSPI")]
+
+    store = MarketAggregateStore(str(tmp_path / "aggregates.sqlite3"))
+    monkeypatch.setattr(market_snapshot, "YFinanceQuoteSource", FakeSource)
+    monkeypatch.setattr(market_aggregates, "_default_store", store)
+    monkeypatch.setattr(price_store, "_default_store", price_store.PriceStore(str(tmp_path / "prices"), fetcher=fake_fetcher([])))
+
+    main.run_aggregates_mode(argparse.Namespace(build_aggregates="2024-08-09:2024-08-12"))
+    assert store.recorded_dates() == ["2024-08-09", "2024-08-12"]
+    assert store.get("2024-08-09", "KOSPI")["traded"] == 1
+
+def test_classifier_and_orchestrator(tmp_path):
+    classifier = QueryClassifier()
+    assert classifier.analyze("2024-08-08에 하락한 종목은 몇 개?") == {
+        "type": "market_statistics", "sub_type": "movement_count",
+        "date": "2024-08-08", "movement": "down", "market": "ALL"
+    }
+    assert classifier.analyze("2024-08-08 코스피 시장에 거래된 종목 수") == {
+        "type": "market_statistics", "sub_type": "total_count", "date": "2024-08-08", "market": "KOSPI"
+    }
+
+    orchestrator = OrchestratorAgent()
+    orchestrator.data_gatherer = FakeGatherer()
+    orchestrator.market_aggregates = MarketAggregateStore(str(tmp_path / "aggregates.sqlite3"))
+    orchestrator.market_aggregates.record_day("2024-08-08", [
+        {"symbol": "삼성전자", "market": "KOSPI", "change_rate": 1.2, "volume": 100},
+        {"symbol": "SK하이닉스", "market": "KOSPI", "change_rate": -0.5, "volume": 200},
+        {"symbol": "카카오", "market": "KOSDAQ", "change_rate": 3.0, "volume": 300},
+        {"symbol": "거래정지", "market": "KOSPI", "change_rate": 0.0, "volume": 0},
+    ])
+
+    response = orchestrator.process({"query": "2024-08-08에 상승한 종목은 몇 개?"})["response"]
+    assert "상승 종목: 2개" in response
+    response = orchestrator.process({"query": "2024-08-08 코스피 시장에 거래된 종목 수"})["response"]
+    assert "거래된 종목: 2개" in response and "거래량 합계: 300주" in response
+    assert "집계가 없습니다" in orchestrator.process({"query": "2024-08-09 거래 종목 수"})["response"]
+    assert orchestrator.data_gatherer.requests == []
+
+if __name__ == "__main__":
+    import tempfile, pathlib
+    test_aggregates_match_brute_force()
+    test_store_record_and_backfill(pathlib.Path(tempfile.mkdtemp()))
+    test_quotes_from_price_store(pathlib.Path(tempfile.mkdtemp()))
+    test_build_from_price_store(pathlib.Path(tempfile.mkdtemp()))
+    test_classifier_and_orchestrator(pathlib.Path(tempfile.mkdtemp()))
+    print("결과: 통과")
@@ -0,0 +1,138 @@
+import time
+import random
+
+import numpy as np
+
+from agents.datagatherer import market_snapshot
+from agents.datagatherer.market_snapshot import MarketSnapshot, SnapshotRefresher, YFinanceQuoteSource
+from agents.orchestrator import OrchestratorAgent
+from test_orchestrator_async import FakeGatherer
+
+def make_quotes(count, seed):
+    rng = random.Random(seed)
+    return [{"symbol": f"종목{i:04d}", "current_price": rng.randint(1000, 100000),
+             "change_rate": round(rng.uniform(-30, 30), 2), "volume": rng.randint(0, 10_000_000)}
+            for i in range(count)]
+
+def brute_force(quotes):
+    latest = {}
+    for quote in quotes:
+        latest[quote["symbol"]] = quote
+    return list(latest.values())
+
+def test_incremental_index_matches_full_sort():
+    snapshot = MarketSnapshot(capacity=16)  # 용량 확장도 함께 확인
+    history = make_quotes(500, 1)
+    snapshot.update_many(history)
+
+    # 일부 종목 시세가 여러 번 바뀐다
+    rng = random.Random(2)
+    for _ in range(2000):
+        quote = dict(rng.choice(history), change_rate=round(rng.uniform(-30, 30), 2), volume=rng.randint(0, 10_000_000))
+        snapshot.update(quote)
+        history.append(quote)
+
+    latest = brute_force(history)
+    by_change = sorted(latest, key=lambda q: q["change_rate"], reverse=True)
+    assert [q["change_rate"] for q in snapshot.top_gainers(10)] == [q["change_rate"] for q in by_change[:10]]
+    assert [q["change_rate"] for q in snapshot.top_losers(10)] == [q["change_rate"] for q in by_change[::-1][:10]]
+    assert [q["volume"] for q in snapshot.top_volume(5)] == sorted((q["volume"] for q in latest), reverse=True)[:5]
+
+    for threshold in (0, 3.0, 10.0, 29.5):
+        up = [q for q in latest if q["change_rate"] >= threshold]
+        down = [q for q in latest if q["change_rate"] <= -threshold]
+        assert snapshot.count_beyond(threshold, "up") == len(up)
+        assert snapshot.count_beyond(threshold, "down") == len(down)
+        assert {q["symbol"] for q in snapshot.beyond_threshold(threshold, "down")} == {q["symbol"] for q in down}
+
+    assert snapshot.get(latest[0]["symbol"]) == {k: latest[0][k] for k in ("symbol", "current_price", "change_rate", "volume")}
+
+def test_orchestrator_reads_snapshot_without_gatherer():
+    orchestrator = OrchestratorAgent()
+    orchestrator.data_gatherer = FakeGatherer()
+    orchestrator.market_snapshot = MarketSnapshot()
+    orchestrator.market_snapshot.update_many([
+        {"symbol": "삼성전자", "current_price": 71000, "change_rate": 4.0, "volume": 100},
+        {"symbol": "카카오", "current_price": 40000, "change_rate": -6.0, "volume": 200},
+        {"symbol": "NAVER", "current_price": 165000, "change_rate": 0.5, "volume": 300},
+    ])
+
+    response = orchestrator.process({"query": "하락률 상위 2개 종목"})["response"]
+    assert "하락률 상위 2개" in response and response.index("카카오") < response.index("NAVER")
+    assert "3.0% 이상 상승 종목 (1개)" in orchestrator.process({"query": "3% 이상 상승한 종목"})["response"]
+    assert orchestrator.data_gatherer.requests == []
+
+    # 개별 종목 현재가는 여전히 데이터 수집기에서 조회
+    orchestrator.process({"query": "삼성전자 현재가"})
+    assert [r["type"] for r in orchestrator.data_gatherer.requests] == ["stock_price"]
+
+    # 오래된 스냅샷은 쓰지 않는다
+    orchestrator.market_snapshot.updated_at -= 3600
+    orchestrator.process({"query": "상승률 상위 3개 종목"})
+    assert orchestrator.data_gatherer.requests[-1]["type"] == "top_gainers"
+
+def test_refresher_updates_in_background():
+    snapshot = MarketSnapshot()
+    calls = []
+
+    def fetch_quotes():
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError("일시 오류")
+        return [{"symbol": "삼성전자", "current_price": 70000 + len(calls), "change_rate": 1.0, "volume": 1}]
+
+    refresher = SnapshotRefresher(snapshot, fetch_quotes, interval=0.01).start()
+    deadline = time.time() + 2
+    while len(calls) < 4 and time.time() < deadline:
+        time.sleep(0.01)
+    refresher.stop(timeout=1)
+
+    assert refresher.errors == 1
+    assert snapshot.is_ready()
+    assert snapshot.get("삼성전자")["current_price"] > 70001
+
+def test_quote_source_learns_market_from_suffix():
+    downloads = []
+
+    def download(symbols):
+        downloads.append(sorted(symbols))
+        return {"005930.KS": (np.array([70000.0, 71400.0]), np.array([10, 20])),
+                "035720.KQ": (np.array([40000.0, 38000.0]), np.array([5, 7]))}
+
+    source = YFinanceQuoteSource([("005930", "삼성전자"), ("035720", "카카오")], download)
+    quotes = source()
+    assert downloads[0] == ["005930.KQ", "005930.KS", "035720.KQ", "035720.KS"]
+    assert [(q["symbol"], q["market"], q["current_price"], q["volume"]) for q in quotes] == [
+        ("삼성전자", "KOSPI", 71400.0, 20), ("카카오", "KOSDAQ", 38000.0, 7)]
+    assert round(quotes[0]["change_rate"], 2) == 2.0 and round(quotes[1]["change_rate"], 2) == -5.0
+
+    # 시장을 알게 된 종목은 그 코드만 조회
+    source()
+    assert downloads[1] == ["005930.KS", "035720.KQ"]
+
+def test_main_attaches_refreshed_snapshot():
+    import main
+
+    quotes = [{"symbol": "삼성전자", "current_price": 71000, "change_rate": 4.0, "volume": 100}]
+    original = market_snapshot.YFinanceQuoteSource
+    market_snapshot.YFinanceQuoteSource = lambda: lambda: quotes
+    try:
+        orchestrator = main.create_orchestrator()
+        orchestrator.data_gatherer = FakeGatherer()
+        deadline = time.time() + 2
+        while not orchestrator.market_snapshot.is_ready() and time.time() < deadline:
+            time.sleep(0.01)
+        assert "삼성전자" in orchestrator.process({"query": "상승률 상위 1개 종목"})["response"]
+        assert orchestrator.data_gatherer.requests == []
+        assert main.create_orchestrator().market_snapshot is orchestrator.market_snapshot
+    finally:
+        market_snapshot.YFinanceQuoteSource = original
+        market_snapshot.stop_market_snapshot(timeout=1)
+
+if __name__ == "__main__":
+    test_incremental_index_matches_full_sort()
+    test_orchestrator_reads_snapshot_without_gatherer()
+    test_refresher_updates_in_background()
+    test_quote_source_learns_market_from_suffix()
+    test_main_attaches_refreshed_snapshot()
+    print("결과: 통과")
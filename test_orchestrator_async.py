@@ -0,0 +1,50 @@
+import asyncio
+from agents.base_agent import BaseAgent
+from agents.orchestrator import OrchestratorAgent
+
+class FakeGatherer(BaseAgent):
+    """테스트용 데이터 수집기 (고정 시세 반환)"""
+
+    def __init__(self):
+        super().__init__("FakeGatherer")
+        self.requests = []
+
+    def process(self, input_data):
+        self.requests.append(input_data)
+        if input_data["type"] == "stock_price":
+            return {"status": "success", "data": {
+                "current_price": 71000, "change_rate": 1.5, "volume": 1200000,
+                "open": 70000, "high": 71500, "low": 69800, "data_source": "fake"
+            }}
+        return {"status": "success", "data": [
+            {"symbol": "삼성전자", "current_price": 71000, "change_rate": 5.2, "volume": 1000},
+        ]}
+
+def make_orchestrator():
+    orchestrator = OrchestratorAgent()
+    orchestrator.data_gatherer = FakeGatherer()
+    return orchestrator
+
+def test_sync_and_async_responses_match():
+    orchestrator = make_orchestrator()
+    for query in ["삼성전자 현재가", "상승률 상위 3개 종목", "3% 이상 상승한 종목", "도움말", "안녕하세요"]:
+        sync_result = orchestrator.process({"query": query})
+        async_result = asyncio.run(orchestrator.process_async({"query": query}))
+        assert sync_result == async_result
+        assert sync_result["status"] == "success"
+
+def test_concurrent_queries():
+    orchestrator = make_orchestrator()
+
+    async def run_all():
+        queries = [{"query": "삼성전자 현재가"} for _ in range(50)]
+        return await asyncio.gather(*(orchestrator.process_async(q) for q in queries))
+
+    results = asyncio.run(run_all())
+    assert all("71,000원" in r["response"] for r in results)
+    assert orchestrator.data_gatherer.requests[0]["parameters"]["stock_code"] == "005930"
+
+if __name__ == "__main__":
+    test_sync_and_async_responses_match()
+    test_concurrent_queries()
+    print("결과: 통과")
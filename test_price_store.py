@@ -0,0 +1,76 @@
+import os
+from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from utils.price_store import OHLCV_DTYPE, PriceStore, missing_ranges
+
+def fake_fetcher(calls):
+    """평일마다 (일자 기반) 가격을 만들어 주는 upstream 대역"""
+    def fetch(ticker, start, end):
+        calls.append((start, end))
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        days = [day for day in days if day.weekday() < 5]
+        rows = np.empty(len(days), dtype=OHLCV_DTYPE)
+        rows["date"] = [day.year * 10000 + day.month * 100 + day.day for day in days]
+        rows["open"] = [day.day * 100 for day in days]
+        rows["high"] = rows["open"] + 50
+        rows["low"] = rows["open"] - 50
+        rows["close"] = rows["open"] + 10
+        rows["volume"] = 1000
+        return rows
+    return fetch
+
+def test_missing_ranges():
+    covered = [(date(2024, 8, 1), date(2024, 8, 5)), (date(2024, 8, 10), date(2024, 8, 12))]
+    assert missing_ranges(covered, date(2024, 8, 3), date(2024, 8, 11)) == [(date(2024, 8, 6), date(2024, 8, 9))]
+    assert missing_ranges(covered, date(2024, 7, 30), date(2024, 8, 14)) == [
+        (date(2024, 7, 30), date(2024, 7, 31)), (date(2024, 8, 6), date(2024, 8, 9)), (date(2024, 8, 13), date(2024, 8, 14))]
+    assert missing_ranges(covered, date(2024, 8, 2), date(2024, 8, 4)) == []
+
+def test_fetches_only_missing_ranges(tmp_path):
+    calls = []
+    store = PriceStore(str(tmp_path), fetcher=fake_fetcher(calls))
+
+    assert len(store.get_range("005930.KS", "2024-08-01", "2024-08-09")) == 7
+    assert calls == [(date(2024, 8, 1), date(2024, 8, 9))]
+
+    # 겹치는 구간은 다시 받지 않고, 주말(휴장일)도 받은 구간으로 기억
+    assert len(store.get_range("005930.KS", "2024-08-05", "2024-08-16")) == 10
+    assert calls[1:] == [(date(2024, 8, 10), date(2024, 8, 16))]
+    assert store.get_price("005930.KS", "2024-08-10") is None
+    assert len(calls) == 2
+
+    assert store.lookup("005930.KS", "2024-08-08", "종가") == 810.0
+    assert store.get_price("005930.KS", "2024-08-08")["volume"] == 1000
+
+def test_offline_reads_pre_seeded_store(tmp_path):
+    seeded = PriceStore(str(tmp_path), fetcher=fake_fetcher([]))
+    seeded.ensure("035420.KQ", "2024-08-01", "2024-08-31")
+
+    def offline_fetcher(*args):
+        raise AssertionError("offline 에서는 upstream 을 호출하면 안 됨")
+
+    offline = PriceStore(str(tmp_path), fetcher=offline_fetcher, offline=True)
+    assert offline.lookup("035420.KQ", "2024-08-01", "시가") == 100.0
+    assert offline.lookup("035420.KQ", "2024-08-30", "고가") == 3050.0
+    assert offline.get_price("035420.KQ", "2024-09-02") is None
+    assert offline.upstream_calls == 0
+
+def test_writers_sharing_a_directory_use_separate_temp_files(tmp_path):
+    # 저장소 인스턴스마다 잠금이 따로라 다른 프로세스의 워커처럼 동시에 같은 종목을 쓴다
+    stores = [PriceStore(str(tmp_path), fetcher=fake_fetcher([])) for _ in range(16)]
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        counts = list(pool.map(lambda store: store.ensure("005930.KS", "2000-01-01", "2024-08-31"), stores))
+    assert 6435 in counts and set(counts) <= {0, 6435}  # 먼저 저장된 구간을 본 인스턴스는 다시 받지 않음
+    assert sorted(os.listdir(tmp_path)) == ["005930.KS.coverage.json", "005930.KS.npy"]
+    assert PriceStore(str(tmp_path), offline=True).lookup("005930.KS", "2024-08-30", "종가") == 3010.0
+
+if __name__ == "__main__":
+    import tempfile, pathlib
+    test_missing_ranges()
+    test_fetches_only_missing_ranges(pathlib.Path(tempfile.mkdtemp()))
+    test_offline_reads_pre_seeded_store(pathlib.Path(tempfile.mkdtemp()))
+    test_writers_sharing_a_directory_use_separate_temp_files(pathlib.Path(tempfile.mkdtemp()))
+    print("결과: 통과")
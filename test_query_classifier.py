@@ -0,0 +1,49 @@
+from agents.interpreter.query_classifier import QueryClassifier
+from agents.interpreter.query_understander_agent import QueryUnderstander
+
+def test_orchestrator_analysis():
+    classifier = QueryClassifier()
+    assert classifier.analyze("삼성전자의 2024-08-08 종가는?") == {
+        "type": "stock_price", "symbol": "삼성전자", "date": "2024-08-08", "price_type": "종가",
+        "stock_code": "005930"
+    }
+    assert classifier.analyze("현대차의 현재가는 얼마") == {"type": "stock_price", "symbol": "현대차"}
+    assert classifier.analyze("하락률 상위 5개") == {"type": "top_losers", "limit": 5}
+    assert classifier.analyze("2.5% 이상 하락한 종목") == {
+        "type": "above_threshold", "threshold": 2.5, "direction": "down"
+    }
+    assert classifier.analyze("많이 오른 주식") == {"type": "top_gainers", "limit": 10}
+    assert classifier.analyze("안녕하세요") == {"type": "unknown"}
+
+def test_understander_analysis():
+    agent = QueryUnderstander()
+
+    result = agent.process({"query": "2024-08-08 코스피 시장에 거래된 종목 수"})["result"]
+    assert result["query_type"] == "market_statistics"
+    assert result["sub_type"] == "total_count"
+    assert result["parameters"] == {"date": "2024-08-08", "market": "KOSPI"}
+
+    result = agent.process({"query": "2024-08-08에서 KOSPI에서 상승률 높은 종목 5개"})["result"]
+    assert result["sub_type"] == "top_gainers"
+    assert result["parameters"] == {"limit": 5, "market": "KOSPI", "date": "2024-08-08"}
+
+    result = agent.process({"query": "20일 이평선 5% 상향 돌파"})["result"]
+    assert result["query_type"] == "technical_signal"
+    assert result["parameters"]["ma_period"] == 20
+    assert result["parameters"]["threshold"] == 5.0
+    assert result["parameters"]["signal_type"] == "breakout"
+
+    # 겹치는 키워드("저가격")도 가격 조회로 인식
+    result = agent.process({"query": "저가격 주식"})["result"]
+    assert result["query_type"] == "stock_price_inquiry"
+
+def test_scan_numbers_match_findall():
+    features = QueryClassifier().scan("2024-08-08 8월 9일 3.5% 이상 20개")
+    assert features["numbers"] == [2024.0, 8.0, 8.0, 8.0, 9.0, 3.5, 20.0]
+    assert features["date"] == "2024-08-08"
+
+if __name__ == "__main__":
+    test_orchestrator_analysis()
+    test_understander_analysis()
+    test_scan_numbers_match_findall()
+    print("결과: 통과")
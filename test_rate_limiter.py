@@ -0,0 +1,138 @@
+import time
+import asyncio
+import threading
+import multiprocessing
+from datetime import datetime
+
+import pytest
+
+from utils import rate_limiter
+from utils.rate_limiter import BATCH, INTERACTIVE, KST, DailyQuota, RateLimitExceeded, TokenBucket, priority
+
+def grab_tokens(path, attempts, queue):
+    bucket = TokenBucket("shared", capacity=50, refill_per_second=0, path=path)
+    queue.put(sum(bucket.try_acquire(1, INTERACTIVE)[0] for _ in range(attempts)))
+
+def test_bucket_is_shared_across_processes(tmp_path):
+    path = str(tmp_path / "limits.sqlite3")
+    TokenBucket("shared", capacity=50, refill_per_second=0, path=path)
+
+    queue = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=grab_tokens, args=(path, 30, queue)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    granted = sum(queue.get(timeout=30) for _ in workers)
+    for worker in workers:
+        worker.join()
+
+    assert granted == 50
+    assert TokenBucket("shared", capacity=50, refill_per_second=0, path=path).remaining() == 0
+
+def test_batch_keeps_reserve_for_interactive(tmp_path):
+    bucket = TokenBucket("dart", capacity=10, refill_per_second=0, path=str(tmp_path / "l.sqlite3"), reserve_ratio=0.2)
+
+    with priority(BATCH):
+        for _ in range(8):
+            bucket.acquire(max_wait=0)
+        with pytest.raises(RateLimitExceeded):
+            bucket.acquire(max_wait=0)  # 남은 2개는 대화형 몫
+
+    bucket.acquire(max_wait=0)
+    bucket.acquire(max_wait=0)
+    with pytest.raises(RateLimitExceeded):
+        bucket.acquire()
+    assert bucket.stats() == {"remaining": 0, "capacity": 10.0, "acquired": 10, "rejected": 2}
+
+def test_waits_for_refill(tmp_path):
+    bucket = TokenBucket("clova", capacity=2, refill_per_second=20, path=str(tmp_path / "l.sqlite3"))
+    start = time.monotonic()
+    for _ in range(4):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.08  # 2개는 즉시, 나머지 2개는 충전 대기
+
+    async def main():
+        with priority(BATCH):
+            await bucket.acquire_async(max_wait=1)
+    asyncio.run(main())
+
+    # 하루 할당량처럼 충전이 느리면 기다리지 않고 바로 거절
+    slow = TokenBucket("daily", capacity=1, refill_per_second=1 / 86400, path=str(tmp_path / "l.sqlite3"))
+    slow.acquire()
+    start = time.monotonic()
+    with pytest.raises(RateLimitExceeded) as error:
+        slow.acquire()
+    assert time.monotonic() - start < 0.5 and error.value.retry_after > 3600
+
+def test_daily_quota_resets_at_kst_midnight(tmp_path):
+    now = [datetime(2024, 5, 1, 23, 59, 0, tzinfo=KST).timestamp()]
+    quota = DailyQuota("dart", capacity=3, path=str(tmp_path / "l.sqlite3"), reserve_ratio=0, clock=lambda: now[0])
+
+    for _ in range(3):
+        quota.acquire(max_wait=0)
+    with pytest.raises(RateLimitExceeded) as error:
+        quota.acquire()
+    assert error.value.retry_after == 60  # 자정까지 남은 시간
+
+    # 버킷과 달리 하루 동안 조금씩 다시 채워지지 않고, 자정에 한 번에 초기화
+    now[0] += 59
+    assert quota.remaining() == 0
+    now[0] += 1
+    assert quota.remaining() == 3
+    for _ in range(3):
+        quota.acquire(max_wait=0)
+    assert quota.stats()["rejected"] == 1
+
+def test_batch_waits_behind_interactive(tmp_path):
+    path = str(tmp_path / "l.sqlite3")
+    bucket = TokenBucket("clova", capacity=1, refill_per_second=10, path=path, reserve_ratio=0)
+    bucket.acquire()
+    order = []
+
+    def interactive():
+        bucket.acquire(max_wait=2)
+        order.append("interactive")
+
+    def batch():
+        with priority(BATCH):
+            bucket.acquire(max_wait=2)
+        order.append("batch")
+
+    first = threading.Thread(target=interactive)
+    first.start()
+    time.sleep(0.02)  # 대화형 요청이 먼저 대기 등록
+    second = threading.Thread(target=batch)
+    second.start()
+    first.join()
+    second.join()
+    assert order == ["interactive", "batch"]
+
+    # 대기 중인 대화형 요청이 없으면 배치도 바로 받음
+    time.sleep(0.1)
+    assert bucket.try_acquire(1, BATCH)[0]
+
+def test_shared_limiter_is_abstract(tmp_path):
+    path = tmp_path / "limits.sqlite3"
+    with pytest.raises(TypeError):
+        rate_limiter.SharedLimiter("base", capacity=1, path=str(path))
+    assert not path.exists()  # 연결을 열기 전에 실패
+
+def test_hyperclova_api_uses_rate_limiter(tmp_path, monkeypatch):
+    from utils import hyperclova_api
+
+    empty = TokenBucket("hyperclova", capacity=0, refill_per_second=0, path=str(tmp_path / "l.sqlite3"))
+    monkeypatch.setitem(rate_limiter._limiters, "hyperclova", empty)
+    monkeypatch.setattr(hyperclova_api, "get_http_client", lambda url: pytest.fail("한도 초과인데 호출함"))
+
+    assert hyperclova_api.generate_answer("질문") == "API 호출 중 오류 발생"
+    assert list(hyperclova_api.generate_answer_stream("질문")) == ["API 호출 중 오류 발생"]
+    assert empty.stats()["rejected"] == 2
+
+if __name__ == "__main__":
+    import tempfile, pathlib
+    test_bucket_is_shared_across_processes(pathlib.Path(tempfile.mkdtemp()))
+    test_batch_keeps_reserve_for_interactive(pathlib.Path(tempfile.mkdtemp()))
+    test_waits_for_refill(pathlib.Path(tempfile.mkdtemp()))
+    test_daily_quota_resets_at_kst_midnight(pathlib.Path(tempfile.mkdtemp()))
+    test_batch_waits_behind_interactive(pathlib.Path(tempfile.mkdtemp()))
+    test_shared_limiter_is_abstract(pathlib.Path(tempfile.mkdtemp()))
+    print("결과: 통과")
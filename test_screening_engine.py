@@ -0,0 +1,60 @@
+import random
+
+import numpy as np
+
+from agents.decisionmaker.screening_engine import ScreeningUniverse, screen_records, top_k_indices
+
+def legacy_screening(data_list):
+    """ReasonerAgent._handle_screening 의 기존 동작"""
+    filtered = [d for d in data_list if d.get("volume", 0) > 1_000_000]
+    sorted_result = sorted(filtered, key=lambda d: d.get("volume", 0), reverse=True)
+    return {"result": sorted_result[:10], "total_matched": len(sorted_result)}
+
+def make_records(count, seed):
+    rng = random.Random(seed)
+    # 거래량을 좁은 범위에서 뽑아 동률을 많이 만든다
+    return [{"ticker": f"{i:06d}", "volume": rng.choice([0, 900_000, 1_000_000, 1_500_000, 2_000_000, 3_000_000]),
+             "per": rng.choice([None, 5.0, 12.0, 30.0]), "change_rate": rng.uniform(-5, 5),
+             "sector": rng.choice(["반도체", "바이오", "금융"])} for i in range(count)]
+
+def test_matches_legacy_including_ties():
+    for seed in range(20):
+        records = make_records(200, seed)
+        assert screen_records(records) == legacy_screening(records)
+
+    # 거래량 키가 없는 종목은 0 으로 취급
+    records = [{"ticker": "A"}, {"ticker": "B", "volume": 2_000_000}]
+    assert screen_records(records) == legacy_screening(records)
+    assert screen_records([]) == {"result": [], "total_matched": 0}
+
+def test_compound_filters():
+    records = make_records(500, 7)
+    universe = ScreeningUniverse(records)
+    filters = [("volume", ">=", 1_500_000), ("per", "<=", 12), ("sector", "in", {"반도체", "금융"}),
+               ("change_rate", ">", 0)]
+    expected = [d for d in records if d["volume"] >= 1_500_000 and d["per"] is not None and d["per"] <= 12
+                and d["sector"] in {"반도체", "금융"} and d["change_rate"] > 0]
+    expected.sort(key=lambda d: d["change_rate"])
+
+    result = universe.screen(filters, sort_by="change_rate", descending=False, limit=5)
+    assert result["total_matched"] == len(expected)
+    assert result["result"] == expected[:5]
+
+    # 없는 섹터는 아무것도 고르지 않는다
+    assert universe.screen([("sector", "==", "조선")])["total_matched"] == 0
+
+def test_top_k_indices():
+    values = np.array([3.0, 5.0, 5.0, 1.0, 5.0, 2.0])
+    assert top_k_indices(values, 2).tolist() == [1, 2]
+    assert top_k_indices(values, 3, descending=False).tolist() == [3, 5, 0]
+    assert top_k_indices(values, 10).tolist() == [1, 2, 4, 0, 5, 3]
+
+def test_unknown_field_reports_error():
+    assert screen_records([{"ticker": "A"}], filters=[("roe", ">", 10)]) == {"error": "screening 처리 중 오류 발생"}
+
+if __name__ == "__main__":
+    test_matches_legacy_including_ties()
+    test_compound_filters()
+    test_top_k_indices()
+    test_unknown_field_reports_error()
+    print("결과: 통과")
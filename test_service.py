@@ -0,0 +1,161 @@
+import time
+import asyncio
+import threading
+
+import httpx
+
+from agents.orchestrator import OrchestratorAgent
+from utils.service import FinancialService, SessionStore
+from test_orchestrator_async import FakeGatherer, make_orchestrator
+
+class SlowGatherer(FakeGatherer):
+    """응답을 늦게 주는 데이터 수집기 (포화 상태 재현용)"""
+
+    def __init__(self, release: asyncio.Event):
+        super().__init__()
+        self.release = release
+
+    async def process_async(self, input_data):
+        await self.release.wait()
+        return self.process(input_data)
+
+def run_with_service(service, scenario):
+    async def main():
+        await service.start("127.0.0.1", 0)
+        try:
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{service.port}") as client:
+                return await scenario(client)
+        finally:
+            await service.close()
+    return asyncio.run(main())
+
+def test_sessions_are_isolated():
+    orchestrator = make_orchestrator()
+    service = FinancialService(orchestrator)
+
+    async def scenario(client):
+        first = (await client.post("/query", json={"query": "삼성전자 현재가"})).json()
+        session_id = first["session_id"]
+        await client.post("/query", json={"query": "상승률 상위 3개 종목", "session_id": session_id})
+        other = (await client.post("/query", json={"query": "3% 이상 상승한 종목", "session_id": "other"})).json()
+        return first, session_id, other
+
+    first, session_id, other = run_with_service(service, scenario)
+    assert first["status"] == "success" and "71,000원" in first["response"]
+    assert other["session_id"] == "other"
+    assert service.sessions.get(session_id).context["previous_queries"] == ["삼성전자 현재가", "상승률 상위 3개 종목"]
+    assert service.sessions.get("other").context["previous_queries"] == ["3% 이상 상승한 종목"]
+    assert orchestrator.context["previous_queries"] == []  # 공유 컨텍스트는 건드리지 않음
+
+def test_health_metrics_and_errors():
+    service = FinancialService(make_orchestrator())
+
+    async def scenario(client):
+        await client.post("/query", json={"query": "도움말"})
+        return (
+            (await client.get("/health")).json(),
+            (await client.get("/metrics")).json(),
+            (await client.post("/query", content=b"not json")).status_code,
+            (await client.post("/query", json={})).status_code,
+            (await client.get("/query")).status_code,
+            (await client.get("/nope")).status_code,
+        )
+
+    health, metrics, bad_json, missing, wrong_method, not_found = run_with_service(service, scenario)
+    assert health["status"] == "ok" and health["sessions"] == 1
+    assert metrics["queries"] == 1 and set(metrics["latency_ms"]) == {"p50", "p95", "p99"}
+    assert (bad_json, missing, wrong_method, not_found) == (400, 400, 405, 404)
+
+def test_backpressure_rejects_when_saturated():
+    async def main():
+        release = asyncio.Event()
+        orchestrator = OrchestratorAgent()
+        orchestrator.data_gatherer = SlowGatherer(release)
+        service = FinancialService(orchestrator, max_in_flight=2, max_queue=1)
+        await service.start("127.0.0.1", 0)
+        try:
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{service.port}") as client:
+                accepted = [asyncio.create_task(client.post("/query", json={"query": "삼성전자 현재가", "session_id": f"s{i}"}))
+                            for i in range(3)]
+                while service.backpressure.in_flight + service.backpressure.waiting < 3:
+                    await asyncio.sleep(0.01)
+
+                rejected = await client.post("/query", json={"query": "삼성전자 현재가"})
+                release.set()
+                return rejected, [(await task).status_code for task in accepted], service
+        finally:
+            await service.close()
+
+    rejected, statuses, service = asyncio.run(main())
+    assert rejected.status_code == 503 and rejected.headers["retry-after"] == "1"
+    assert statuses == [200, 200, 200]
+    assert service.counters["rejected"] == 1
+
+def test_invalid_content_length_is_rejected():
+    service = FinancialService(make_orchestrator())
+
+    async def send(raw):
+        reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+        writer.write(raw)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return response
+
+    async def main():
+        await service.start("127.0.0.1", 0)
+        try:
+            return [await send(b"POST /query HTTP/1.1\r\nContent-Length: " + value + b"\r\n\r\n{}")
+                    for value in (b"abc", b"-5", b"+2", b"1_0")]
+        finally:
+            await service.close()
+
+    for response in asyncio.run(main()):
+        assert response.startswith(b"HTTP/1.1 400 ") and b"Connection: close" in response
+
+def test_timed_out_request_does_not_touch_session_context():
+    class LateWriter:
+        """시간 초과 뒤에도 스레드에서 컨텍스트를 고치는 오케스트레이터"""
+
+        def __init__(self):
+            self.finished = threading.Event()
+
+        def work(self, context):
+            time.sleep(0.2)
+            context["previous_queries"].append("늦게 끝난 질문")
+            self.finished.set()
+
+        async def process_async(self, input_data):
+            await asyncio.to_thread(self.work, input_data["context"])
+            return {"status": "success", "response": "늦은 응답"}
+
+    orchestrator = LateWriter()
+    service = FinancialService(orchestrator, request_timeout=0.05)
+
+    async def main():
+        status, body = await service.handle_query({"query": "삼성전자 현재가", "session_id": "s"})
+        orchestrator.finished.wait(2)
+        return status, body
+
+    status, body = asyncio.run(main())
+    assert status == 504
+    assert service.sessions.get("s").context["previous_queries"] == []
+
+def test_session_store_expiry_and_limit():
+    store = SessionStore(ttl=60, max_sessions=2)
+    first = store.get("a")
+    store.get("b")
+    store.get("c")
+    assert len(store) == 2 and store.get("a") is not first  # 가장 오래된 세션부터 정리
+
+    store.expire(now=first.last_seen + 3600)
+    assert len(store) == 0
+
+if __name__ == "__main__":
+    test_sessions_are_isolated()
+    test_health_metrics_and_errors()
+    test_backpressure_rejects_when_saturated()
+    test_invalid_content_length_is_rejected()
+    test_timed_out_request_does_not_touch_session_context()
+    test_session_store_expiry_and_limit()
+    print("결과: 통과")
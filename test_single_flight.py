@@ -0,0 +1,130 @@
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils.single_flight import SingleFlight, request_key
+from test_orchestrator_async import FakeGatherer, make_orchestrator
+
+def test_threads_share_one_call():
+    flight = SingleFlight("test")
+    started = threading.Event()
+    release = threading.Event()
+    executions = []
+
+    def fetch():
+        executions.append(1)
+        started.set()
+        release.wait()
+        return {"price": 71000}
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        leader = pool.submit(flight.do, "005930", fetch)
+        started.wait()
+        followers = [pool.submit(flight.do, "005930", fetch) for _ in range(7)]
+        while flight.calls < 8:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert executions == [1]
+    assert all(r == {"price": 71000} for r in results)
+    assert flight.stats() == {"calls": 8, "executions": 1, "saved": 7, "in_flight": 0}
+
+    # 끝난 호출은 보관하지 않는다
+    flight.do("005930", fetch)
+    assert len(executions) == 2
+
+def test_errors_are_shared_and_not_cached():
+    flight = SingleFlight("test")
+
+    async def main():
+        calls = []
+
+        async def failing():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(*(flight.do_async("k", failing) for _ in range(5)), return_exceptions=True)
+        assert calls == [1]
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+        async def ok():
+            return "ok"
+        assert await flight.do_async("k", ok) == "ok"
+
+    asyncio.run(main())
+    assert flight.stats()["saved"] == 4
+
+    with pytest.raises(ValueError):
+        flight.do("x", lambda: (_ for _ in ()).throw(ValueError("bad")))
+
+def test_cancelled_leader_does_not_cancel_followers():
+    flight = SingleFlight("test")
+
+    async def main():
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "ok"
+
+        leader = asyncio.create_task(flight.do_async("k", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do_async("k", fetch))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        results = await asyncio.gather(leader, follower, return_exceptions=True)
+        assert isinstance(results[0], asyncio.CancelledError)
+        assert results[1] == "ok"
+        assert calls == [1]
+
+        # 기다리는 호출자가 모두 취소되면 공유 태스크도 취소되고 다음 호출은 새로 실행
+        only = asyncio.create_task(flight.do_async("k", fetch))
+        await asyncio.sleep(0.01)
+        only.cancel()
+        await asyncio.gather(only, return_exceptions=True)
+        assert flight.stats()["in_flight"] == 0
+        assert await flight.do_async("k", fetch) == "ok"
+        assert calls == [1, 1, 1]
+
+    asyncio.run(main())
+
+def test_request_key():
+    base = {"type": "stock_price", "parameters": {"symbol": "삼성전자", "stock_code": "005930", "price_type": "current"}}
+    alias = {"type": "stock_price", "parameters": {"symbol": "삼전", "stock_code": "005930", "date": None}}
+    assert request_key(base) == request_key(alias)
+    dated = {"type": "stock_price", "parameters": {"symbol": "삼성전자", "date": "2024-08-08", "price_type": "종가"}}
+    assert request_key(base) != request_key(dated)
+    assert request_key({"type": "top_gainers", "parameters": {"limit": 5}}) == \
+        request_key({"parameters": {"limit": 5}, "type": "top_gainers"})
+
+class SlowAsyncGatherer(FakeGatherer):
+    async def process_async(self, input_data):
+        await asyncio.sleep(0.02)
+        return self.process(input_data)
+
+def test_orchestrator_coalesces_concurrent_queries():
+    orchestrator = make_orchestrator()
+    orchestrator.data_gatherer = SlowAsyncGatherer()
+    orchestrator.fetch_flight = SingleFlight("data_gatherer")
+
+    async def run_all():
+        return await asyncio.gather(*(orchestrator.process_async({"query": "삼성전자 현재가"}) for _ in range(20)))
+
+    results = asyncio.run(run_all())
+    assert all("71,000원" in r["response"] for r in results)
+    assert len(orchestrator.data_gatherer.requests) == 1
+    assert orchestrator.fetch_flight.stats()["saved"] == 19
+
+if __name__ == "__main__":
+    test_threads_share_one_call()
+    test_errors_are_shared_and_not_cached()
+    test_cancelled_leader_does_not_cancel_followers()
+    test_request_key()
+    test_orchestrator_coalesces_concurrent_queries()
+    print("결과: 통과")
@@ -0,0 +1,37 @@
+import os
+import sys
+import json
+import subprocess
+
+from utils.startup_profile import format_startup_report, profile_startup
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+def test_import_main_does_not_load_agents():
+    script = ("import sys, json; import main; "
+              "print(json.dumps(sorted(m for m in sys.modules if m == 'agents' or m.startswith(('agents.', 'config')))))")
+    completed = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, timeout=60)
+    assert completed.returncode == 0, completed.stderr
+    assert json.loads(completed.stdout.strip().splitlines()[-1]) == []
+
+def test_report_has_a_row_per_agent():
+    targets = [
+        ("OrchestratorAgent", "agents.orchestrator", "OrchestratorAgent"),
+        ("QueryUnderstander", "agents.interpreter.query_understander_agent", "QueryUnderstander"),
+        ("없는 에이전트", "agents.missing_agent", "MissingAgent"),
+    ]
+    results = profile_startup(ROOT, targets)
+    assert [r["label"] for r in results] == ["OrchestratorAgent", "QueryUnderstander", "없는 에이전트"]
+    assert all(r["import_ms"] is not None and r["init_ms"] is not None for r in results[:2])
+    assert results[2]["import_ms"] is None and "ModuleNotFoundError" in results[2]["error"]
+
+    lines = format_startup_report(results).splitlines()
+    assert len(lines) == 2 + len(targets)  # 머리글, 구분선, 에이전트별 한 줄
+    assert lines[2].startswith("OrchestratorAgent") and lines[3].startswith("QueryUnderstander")
+    assert lines[4].startswith("없는 에이전트") and lines[4].rstrip().endswith(results[2]["error"])
+    assert lines[4].split()[2:4] == ["-", "-"]
+
+if __name__ == "__main__":
+    test_import_main_does_not_load_agents()
+    test_report_has_a_row_per_agent()
+    print("결과: 통과")
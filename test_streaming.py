@@ -0,0 +1,140 @@
+import json
+import time
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from agents.base_agent import BaseAgent
+from agents.orchestrator import OrchestratorAgent, RESPONSE_FOOTER
+import pytest
+
+from utils import rate_limiter
+from utils.rate_limiter import TokenBucket
+from utils.sse import iter_sse_events, iter_clova_tokens
+from utils.hyperclova_api import generate_answer_stream
+from test_orchestrator_async import FakeGatherer
+
+TOKENS = ["삼성전자는 ", "거래량이 ", "늘었습니다."]
+
+class SSEStubServer:
+    """HyperCLOVA chat-completions 스트림 대역 (토큰 사이에 지연을 둔다)"""
+
+    def __init__(self, delay=0.2, fail_after=None):
+        self.bodies = []
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                fixture.bodies.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                if fail_after is not None:
+                    # 본문 길이를 크게 알려 두고 중간에 끊어 클라이언트에서 읽기 오류가 나게 한다
+                    self.send_header("Content-Length", "100000")
+                self.end_headers()
+                for index, token in enumerate(TOKENS):
+                    if index == fail_after:
+                        return
+                    if index:
+                        time.sleep(delay)
+                    message = json.dumps({"message": {"role": "assistant", "content": token}}, ensure_ascii=False)
+                    self.wfile.write(f"id: {index}\nevent: token\ndata: {message}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                result = json.dumps({"message": {"role": "assistant", "content": "".join(TOKENS)}}, ensure_ascii=False)
+                self.wfile.write(f"event: result\ndata: {result}\n\n".encode("utf-8"))
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/v1/chat-completions/HCX-003"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+
+class StubSummarizer(BaseAgent):
+    """SSE 스텁 서버에서 AI 분석을 스트리밍하는 요약기"""
+
+    def __init__(self, url):
+        super().__init__("StubSummarizer")
+        self.url = url
+        self.data = None
+
+    def analysis_stream(self, data):
+        self.data = data
+        yield from generate_answer_stream(f"{data['symbol']} 분석", url=self.url)
+
+    def process(self, input_data):
+        return {"status": "success", "summary": "".join(self.analysis_stream(input_data["data"]))}
+
+def make_bucket(path):
+    """실제 ./rate_limits.sqlite3 대신 쓰는 hyperclova 한도"""
+    return TokenBucket("hyperclova", capacity=1000, refill_per_second=0, path=path)
+
+@pytest.fixture(autouse=True)
+def isolated_rate_limit(monkeypatch, tmp_path):
+    monkeypatch.setitem(rate_limiter._limiters, "hyperclova", make_bucket(str(tmp_path / "limits.sqlite3")))
+
+def test_sse_parsing():
+    lines = [": keep-alive", "event: token", 'data: {"message": {"content": "안"}}', "",
+             "event: token", 'data: {"message": {"content": "녕"}}', "",
+             "event: signal", 'data: {"data": "[DONE]"}', "",
+             "event: token", 'data: {"message": {"content": "무시"}}', ""]
+    events = list(iter_sse_events(lines))
+    assert [e["event"] for e in events] == ["token", "token", "signal", "token"]
+    assert list(iter_clova_tokens(events)) == ["안", "녕"]
+
+def test_tokens_arrive_before_completion():
+    server = SSEStubServer()
+    try:
+        started = time.perf_counter()
+        arrivals = []
+        for token in generate_answer_stream("삼성전자 분석", url=server.url):
+            arrivals.append((time.perf_counter() - started, token))
+
+        assert [token for _, token in arrivals] == TOKENS
+        # 첫 토큰은 전체 응답(지연 2회)보다 먼저 도착해야 한다
+        assert arrivals[0][0] < arrivals[-1][0] - 0.3
+        assert server.bodies[0]["messages"][1]["content"] == "삼성전자 분석"
+    finally:
+        server.close()
+
+def test_error_after_tokens_is_not_appended():
+    server = SSEStubServer(delay=0, fail_after=1)
+    try:
+        assert list(generate_answer_stream("삼성전자 분석", url=server.url)) == TOKENS[:1]
+    finally:
+        server.close()
+
+    server = SSEStubServer(delay=0, fail_after=0)
+    try:
+        assert list(generate_answer_stream("삼성전자 분석", url=server.url)) == ["API 호출 중 오류 발생"]
+    finally:
+        server.close()
+
+def test_orchestrator_streams_through_summarizer():
+    server = SSEStubServer(delay=0)
+    try:
+        orchestrator = OrchestratorAgent()
+        orchestrator.data_gatherer = FakeGatherer()
+        orchestrator.summarizer = StubSummarizer(server.url)
+
+        chunks = list(orchestrator.process_stream({"query": "삼성전자 현재가"}))
+        assert "71,000원" in chunks[0]
+        assert chunks[2:-1] == TOKENS
+        assert chunks[-1] == RESPONSE_FOOTER
+        assert orchestrator.summarizer.data["symbol"] == "삼성전자"
+
+        # 도움말/미인식 질문은 한 조각으로 끝난다
+        assert len(list(orchestrator.process_stream({"query": "도움말"}))) == 1
+    finally:
+        server.close()
+
+if __name__ == "__main__":
+    rate_limiter._limiters["hyperclova"] = make_bucket(tempfile.mktemp(suffix=".sqlite3"))
+    test_sse_parsing()
+    test_tokens_arrive_before_completion()
+    test_error_after_tokens_is_not_appended()
+    test_orchestrator_streams_through_summarizer()
+    print("결과: 통과")
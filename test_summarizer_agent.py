@@ -0,0 +1,219 @@
+import re
+import sys
+import json
+import time
+import types
+import uuid
+import asyncio
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# config.py 는 배포본에 없으므로 요약기를 import 하기 전에 대역을 넣는다 (URL 은 테스트마다 스텁 서버로 교체)
+config = types.ModuleType("config")
+config.HYPERCLOVA_URL = "http://127.0.0.1:9/unused"
+config.HYPERCLOVA_API_KEY = "test-api-key"
+config.HYPERCLOVA_API_GATEWAY_KEY = "test-gateway-key"
+config.generate_request_id = lambda: uuid.uuid4().hex
+sys.modules["config"] = config
+
+from agents.responder import summarizer_agent
+from agents.responder.summarizer_agent import SummarizerAgent
+from utils.circuit_breaker import CircuitBreaker
+from utils.completion_cache import CompletionCache
+from utils.rate_limiter import TokenBucket
+from utils.single_flight import SingleFlight
+
+class ClovaStubServer:
+    """HyperCLOVA chat-completions 대역 (Accept: text/event-stream 이면 SSE, 아니면 JSON)"""
+
+    def __init__(self, answer=lambda prompt: f"{prompt.strip()} 요약", delay=0.0):
+        self.prompts = []
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                prompt = body["messages"][1]["content"]
+                fixture.prompts.append(prompt)
+                time.sleep(delay)
+                content = answer(prompt)
+
+                if self.headers.get("Accept") == "text/event-stream":
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.send_header("Connection", "close")
+                    self.end_headers()
+                    for index, token in enumerate(content.split(" ")):
+                        token = token if index == 0 else " " + token
+                        message = json.dumps({"message": {"role": "assistant", "content": token}}, ensure_ascii=False)
+                        self.wfile.write(f"event: token\ndata: {message}\n\n".encode("utf-8"))
+                    result = json.dumps({"message": {"role": "assistant", "content": content}}, ensure_ascii=False)
+                    self.wfile.write(f"event: result\ndata: {result}\n\n".encode("utf-8"))
+                    self.close_connection = True
+                    return
+
+                payload = json.dumps({"result": {"message": {"role": "assistant", "content": content}}},
+                                     ensure_ascii=False).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/v1/chat-completions/HCX-003"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+def make_summarizer(server):
+    """스텁 서버를 호출하는 실제 SummarizerAgent (캐시/합치기/한도/차단기는 테스트 전용)"""
+    summarizer_agent.HYPERCLOVA_URL = server.url
+    agent = SummarizerAgent()
+    agent.completion_cache = CompletionCache(path=None)
+    agent.completion_flight = SingleFlight("hyperclova-test")
+    agent.rate_limiter = TokenBucket("hyperclova", capacity=1000, refill_per_second=0,
+                                     path=tempfile.mktemp(suffix=".sqlite3"))
+    agent.breaker = CircuitBreaker("hyperclova-test")
+    return agent
+
+def test_call_hyperclova_cache_hit_and_miss():
+    server = ClovaStubServer()
+    try:
+        agent = make_summarizer(server)
+        assert agent.hyperclova_available
+
+        first = agent.call_hyperclova("삼성전자 현재가 분석", 300)
+        assert first == "삼성전자 현재가 분석 요약"
+        assert agent.call_hyperclova("삼성전자   현재가 분석", 300) == first  # 공백만 다른 프롬프트도 적중
+        assert len(server.prompts) == 1
+
+        # 파라미터가 다르면 다른 키
+        agent.call_hyperclova("삼성전자 현재가 분석", 400)
+        assert len(server.prompts) == 2
+        stats = agent.completion_cache_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 2)
+    finally:
+        server.close()
+
+def test_call_hyperclova_stream():
+    server = ClovaStubServer()
+    try:
+        agent = make_summarizer(server)
+        tokens = list(agent.call_hyperclova_stream("카카오 하락률 분석", 300))
+        assert tokens == ["카카오", " 하락률", " 분석", " 요약"]
+        assert agent.breaker.stats()["state"] == "closed"
+
+        # 끝까지 받은 스트림은 캐시에 저장되어 다음 호출은 한 조각으로
+        assert list(agent.call_hyperclova_stream("카카오 하락률 분석", 300)) == ["카카오 하락률 분석 요약"]
+        assert agent.call_hyperclova("카카오 하락률 분석", 300) == "카카오 하락률 분석 요약"
+        assert len(server.prompts) == 1
+        assert agent.rate_limiter.stats()["acquired"] == 1
+    finally:
+        server.close()
+
+STOCKS = [
+    {"symbol": "삼성전자", "current_price": 71000, "change_rate": 1.5, "volume": 1000},
+    {"symbol": "카카오", "current_price": 40000, "change_rate": -2.0, "volume": 500},
+    {"symbol": "NAVER", "current_price": 165000, "change_rate": 0.3, "volume": 200},
+    {"symbol": "없는종목", "error": "종목을 찾을 수 없습니다"},
+]
+
+def stock_answer(prompt):
+    """묶음 프롬프트면 '### 종목' 섹션으로 (NAVER 는 빠뜨림), 단일 프롬프트면 한 줄로 답함"""
+    symbols = re.findall(r"^\[(.+?)\]", prompt, re.M)
+    if symbols:
+        return "\n".join(f"### {symbol}\n{symbol} 묶음 분석" for symbol in symbols if symbol != "NAVER")
+    return f"{re.search(r'종목: (.+)', prompt).group(1)} 개별 분석"
+
+def test_format_stock_summaries():
+    server = ClovaStubServer(answer=stock_answer)
+    try:
+        agent = make_summarizer(server)
+        packed = agent.format_stock_summaries(STOCKS)
+        assert list(packed) == ["삼성전자", "카카오", "NAVER", "없는종목"]
+        assert len(server.prompts) == 1  # 세 종목을 한 번에
+        assert "🤖 **AI 분석**: 삼성전자 묶음 분석" in packed["삼성전자"]
+        assert "카카오 묶음 분석" in packed["카카오"] and "-2.00%" in packed["카카오"]
+        assert agent._fallback_summary(agent.build_stock_prompt(STOCKS[2])) in packed["NAVER"]  # 빠진 종목은 대체 요약
+        assert packed["없는종목"] == "❌ 오류: 종목을 찾을 수 없습니다"
+
+        fanout = agent.format_stock_summaries(STOCKS, mode="fanout", max_concurrency=3)
+        assert len(server.prompts) == 4  # 종목별 호출
+        assert all(f"{symbol} 개별 분석" in fanout[symbol] for symbol in ("삼성전자", "카카오", "NAVER"))
+    finally:
+        server.close()
+
+def test_identical_prompts_share_one_call():
+    server = ClovaStubServer(delay=0.3)
+    try:
+        agent = make_summarizer(server)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(agent.call_hyperclova("SK하이닉스 분석", 300)))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == ["SK하이닉스 분석 요약"] * 5
+        assert len(server.prompts) == 1
+        assert agent.completion_flight.stats()["saved"] >= 1
+
+        async def main():
+            return await asyncio.gather(*(agent.call_hyperclova_async("LG화학 분석", 300) for _ in range(5)))
+
+        assert asyncio.run(main()) == ["LG화학 분석 요약"] * 5
+        assert len(server.prompts) == 2
+        assert agent.rate_limiter.stats()["acquired"] == 2
+    finally:
+        server.close()
+
+class ThreadRecordingCache(CompletionCache):
+    """get/put 이 어느 스레드에서 실행됐는지 기록"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.threads = []
+
+    def get(self, key):
+        self.threads.append(threading.get_ident())
+        return super().get(key)
+
+    def put(self, key, value, latency, ttl=None):
+        self.threads.append(threading.get_ident())
+        super().put(key, value, latency, ttl)
+
+def test_async_cache_access_stays_off_the_event_loop():
+    server = ClovaStubServer()
+    try:
+        agent = make_summarizer(server)
+        agent.completion_cache = ThreadRecordingCache(tempfile.mktemp(suffix=".sqlite3"))
+
+        async def main():
+            first = await agent.call_hyperclova_async("현대차 분석", 300)
+            second = await agent.call_hyperclova_async("현대차 분석", 300)
+            return first, second, threading.get_ident()
+
+        first, second, loop_thread = asyncio.run(main())
+        assert first == second == "현대차 분석 요약"
+        assert len(server.prompts) == 1
+        assert len(agent.completion_cache.threads) == 3  # 조회(미스), 저장, 조회(적중)
+        assert loop_thread not in agent.completion_cache.threads
+    finally:
+        server.close()
+
+if __name__ == "__main__":
+    test_call_hyperclova_cache_hit_and_miss()
+    test_call_hyperclova_stream()
+    test_format_stock_summaries()
+    test_identical_prompts_share_one_call()
+    test_async_cache_access_stays_off_the_event_loop()
+    print("결과: 통과")
@@ -0,0 +1,73 @@
+import random
+import asyncio
+
+import httpx
+
+from utils.service import FinancialService
+from utils.tracing import LatencyHistogram, Tracer, tracer
+from test_orchestrator_async import make_orchestrator
+
+def test_histogram_percentiles_within_bucket_error():
+    rng = random.Random(7)
+    samples = [rng.lognormvariate(-4, 1.2) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    for value in samples:
+        histogram.record(value)
+
+    ordered = sorted(samples)
+    for p in (50, 90, 99):
+        exact = ordered[int(len(ordered) * p / 100) - 1]
+        assert abs(histogram.percentile(p) - exact) / exact < 0.05
+    assert histogram.count == 20000 and histogram.percentile(100) == max(samples)
+    assert len(histogram._counts) < 400  # 값 범위에만 비례
+
+def test_prometheus_format():
+    local = Tracer()
+    local.observe("stage", 0.010, stage="gather")
+    local.observe("stage", 0.030, stage="gather")
+    local.observe("query", 0.5)
+    text = local.to_prometheus()
+
+    assert "# TYPE finance_agent_stage_latency_seconds summary" in text
+    assert 'finance_agent_stage_latency_seconds{stage="gather",quantile="0.5"} 0.0' in text
+    assert 'finance_agent_stage_latency_seconds_count{stage="gather"} 2' in text
+    assert 'finance_agent_query_latency_seconds{quantile="0.99"} 0.5' in text
+    assert "finance_agent_query_latency_seconds_sum 0.500000" in text
+
+def test_agents_and_stages_are_traced():
+    tracer.reset()
+    orchestrator = make_orchestrator()
+    orchestrator.process({"query": "삼성전자 현재가"})
+    asyncio.run(orchestrator.process_async({"query": "상승률 상위 3개 종목"}))
+
+    data = tracer.to_json()
+    agents = {entry["labels"]["agent"]: entry["count"] for entry in data["agent"]}
+    assert agents["FakeGatherer"] == 2 and agents[orchestrator.name] == 2
+    assert {entry["labels"]["stage"] for entry in data["stage"]} >= {"parse", "gather", "format"}
+    assert len(data["query"]) == 2
+
+def test_metrics_endpoint_serves_prometheus():
+    tracer.reset()
+    service = FinancialService(make_orchestrator())
+
+    async def main():
+        await service.start("127.0.0.1", 0)
+        try:
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{service.port}") as client:
+                await client.post("/query", json={"query": "삼성전자 현재가"})
+                return (await client.get("/metrics?format=prometheus"),
+                        (await client.get("/metrics")).json())
+        finally:
+            await service.close()
+
+    prometheus, metrics = asyncio.run(main())
+    assert prometheus.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'finance_agent_agent_latency_seconds_count{agent="FakeGatherer"} 1' in prometheus.text
+    assert metrics["latency_histograms"]["query"][0]["count"] == 1
+
+if __name__ == "__main__":
+    test_histogram_percentiles_within_bucket_error()
+    test_prometheus_format()
+    test_agents_and_stages_are_traced()
+    test_metrics_endpoint_serves_prometheus()
+    print("결과: 통과")
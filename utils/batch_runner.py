@@ -0,0 +1,157 @@
+import sys
+import json
+import math
+import time
+import asyncio
+from collections import deque
+from typing import Dict, Any, List, Optional, Callable, Iterable, Iterator, Awaitable, TextIO
+
+from utils.rate_limiter import BATCH, set_priority
+from utils.logger import set_request_id
+
+DEFAULT_WORKERS = 8
+# 입력 순서대로 쓰기 위해 기다리는 결과까지 포함한 최대 보유 개수 (workers 배수)
+WINDOW_FACTOR = 4
+
+
+def iter_batch_records(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """JSONL 줄을 하나씩 읽어 {"id", "query"} 로 변환 (빈 줄은 건너뜀, 파일 전체를 읽지 않음)
+
+    id 는 "id" / "request_id" 키, 없으면 줄 번호. 질문은 "query" / "question" 키.
+    """
+    for line_no, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield {"id": line_no, "query": None, "error": f"JSON 파싱 실패: {str(e)}"}
+            continue
+        if not isinstance(item, dict):
+            item = {"query": item}
+        record_id = item.get("id", item.get("request_id", line_no))
+        query = item.get("query", item.get("question"))
+        if not isinstance(query, str) or not query.strip():
+            yield {"id": record_id, "query": None, "error": "query 필드가 없습니다."}
+            continue
+        yield {"id": record_id, "query": query}
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """정렬된 값의 p 백분위수 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    rank = min(max(math.ceil(len(sorted_values) * p / 100), 1), len(sorted_values))
+    return sorted_values[rank - 1]
+
+
+class BatchStats:
+    """배치 처리 건수/오류/지연 시간 집계"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.count = 0
+        self.errors = 0
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+
+    def record(self, latency: float, ok: bool):
+        self.count += 1
+        self.latencies.append(latency)
+        if not ok:
+            self.errors += 1
+
+    def record_invalid(self):
+        """처리하지 않은 잘못된 입력 줄 (오류로만 세고 지연 시간 표본에는 넣지 않음)"""
+        self.count += 1
+        self.errors += 1
+
+    def finish(self):
+        self.finished_at = time.perf_counter()
+
+    def summary(self) -> Dict[str, Any]:
+        elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+        latencies = sorted(self.latencies)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "elapsed_seconds": elapsed,
+            "throughput": self.count / elapsed if elapsed > 0 else 0.0,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+        }
+
+
+def format_batch_report(summary: Dict[str, Any]) -> str:
+    return (f"📦 배치 처리 완료: {summary['count']}건 (오류 {summary['errors']}건), "
+            f"{summary['elapsed_seconds']:.2f}초, {summary['throughput']:.1f}건/초\n"
+            f"⏱️  지연 p50 {summary['p50_ms']:.1f}ms / p95 {summary['p95_ms']:.1f}ms / p99 {summary['p99_ms']:.1f}ms")
+
+
+async def run_batch_async(process: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+                          records: Iterable[Dict[str, Any]], write: Callable[[Dict[str, Any]], None],
+                          workers: int = DEFAULT_WORKERS, stats: Optional[BatchStats] = None) -> BatchStats:
+    """records 를 최대 workers 개씩 동시에 처리하고 결과는 입력 순서대로 write
+
+    동시에 실행되는 처리는 workers 개, 처리 중이거나 앞선 결과를 기다리는 항목은
+    workers * WINDOW_FACTOR 개를 넘지 않아 입력 크기와 무관하게 메모리가 일정하다.
+    """
+    stats = stats or BatchStats()
+    semaphore = asyncio.Semaphore(workers)
+    window = max(workers * WINDOW_FACTOR, 1)
+    pending = deque()
+
+    async def run_one(record: Dict[str, Any]) -> Dict[str, Any]:
+        # 태스크마다 컨텍스트가 따로라 이 태스크의 업스트림 호출만 배치 우선순위가 되고 로그에 레코드 id 가 붙는다
+        set_priority(BATCH)
+        set_request_id(record["id"])
+        if record.get("error"):
+            stats.record_invalid()
+            return {"id": record["id"], "status": "error", "message": record["error"]}
+
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                result = await process({"query": record["query"]})
+            except Exception as e:
+                result = {"status": "error", "message": str(e)}
+            latency = time.perf_counter() - start
+
+        stats.record(latency, result.get("status") == "success")
+        return {"id": record["id"], "query": record["query"], **result, "latency_ms": round(latency * 1000, 2)}
+
+    for record in records:
+        pending.append(asyncio.create_task(run_one(record)))
+        while pending and pending[0].done():
+            write(pending.popleft().result())
+        if len(pending) >= window:
+            write(await pending.popleft())
+
+    while pending:
+        write(await pending.popleft())
+
+    stats.finish()
+    return stats
+
+
+def run_batch(orchestrator, input_file: TextIO, output_file: TextIO,
+              workers: int = DEFAULT_WORKERS) -> Dict[str, Any]:
+    """JSONL 질문 파일을 오케스트레이터로 처리해 JSONL 결과를 쓰고 통계 요약 반환"""
+    def write(result: Dict[str, Any]):
+        output_file.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+    stats = asyncio.run(run_batch_async(orchestrator.process_async, iter_batch_records(input_file), write, workers))
+    output_file.flush()
+    return stats.summary()
+
+
+def run_batch_files(orchestrator, input_path: str, output_path: Optional[str] = None,
+                    workers: int = DEFAULT_WORKERS) -> Dict[str, Any]:
+    """파일 경로 버전 (output_path 가 없거나 "-" 이면 표준 출력)"""
+    with open(input_path, encoding="utf-8") as input_file:
+        if not output_path or output_path == "-":
+            return run_batch(orchestrator, input_file, sys.stdout, workers)
+        with open(output_path, "w", encoding="utf-8") as output_file:
+            return run_batch(orchestrator, input_file, output_file, workers)
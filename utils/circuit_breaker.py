@@ -0,0 +1,248 @@
+import os
+import time
+import random
+import logging
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Callable, Awaitable, TypeVar
+
+T = TypeVar("T")
+
+logger = logging.getLogger("CircuitBreaker")
+
+# LLM 호출 한 번의 최대 대기 시간 (요청 마감 시각이 더 이르면 그쪽을 따름)
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "10"))
+
+# 최근 BREAKER_WINDOW 번 호출 중 실패(느린 호출 포함) 비율이 BREAKER_FAILURE_RATIO 이상이면 차단
+BREAKER_WINDOW = int(os.getenv("BREAKER_WINDOW", "20"))
+BREAKER_MIN_CALLS = int(os.getenv("BREAKER_MIN_CALLS", "5"))
+BREAKER_FAILURE_RATIO = float(os.getenv("BREAKER_FAILURE_RATIO", "0.5"))
+BREAKER_SLOW_SECONDS = float(os.getenv("BREAKER_SLOW_SECONDS", "8"))
+# 차단 후 첫 재시도까지 기다리는 시간 (연속으로 다시 차단될 때마다 두 배, 최대 BREAKER_MAX_OPEN_SECONDS)
+BREAKER_OPEN_SECONDS = float(os.getenv("BREAKER_OPEN_SECONDS", "5"))
+BREAKER_MAX_OPEN_SECONDS = float(os.getenv("BREAKER_MAX_OPEN_SECONDS", "60"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_deadline: contextvars.ContextVar = contextvars.ContextVar("request_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: float):
+    """이 블록 안의 LLM 호출은 seconds 초 뒤의 마감 시각을 넘기지 않음"""
+    token = _deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def set_deadline(seconds: float):
+    """현재 컨텍스트(태스크)의 마감 시각 설정"""
+    _deadline.set(time.monotonic() + seconds)
+
+
+def time_remaining() -> Optional[float]:
+    """요청 마감까지 남은 초 (마감이 없으면 None, 지났으면 0)"""
+    limit = _deadline.get()
+    if limit is None:
+        return None
+    return max(limit - time.monotonic(), 0.0)
+
+
+class CircuitOpenError(Exception):
+    """차단 중이거나 마감 시각이 지나 호출하지 않음"""
+
+
+class CircuitBreaker:
+    """업스트림 호출의 최근 실패/지연 비율을 보고 차단(open) → 탐색(half-open) → 복구(closed)
+
+    차단 중에는 호출하지 않고 CircuitOpenError 를 바로 던져 호출자가 즉시 대체 응답을 쓰게 한다.
+    재시도 시각이 되면 탐색 호출 하나만 보내고, 성공하면 복구, 실패하면 지터를 준 더 긴 대기로 다시 차단한다.
+    """
+
+    def __init__(self, name: str, timeout: float = LLM_TIMEOUT, window: int = BREAKER_WINDOW,
+                 min_calls: int = BREAKER_MIN_CALLS, failure_ratio: float = BREAKER_FAILURE_RATIO,
+                 slow_seconds: float = BREAKER_SLOW_SECONDS, open_seconds: float = BREAKER_OPEN_SECONDS,
+                 max_open_seconds: float = BREAKER_MAX_OPEN_SECONDS):
+        self.name = name
+        self.timeout = timeout
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.slow_seconds = slow_seconds
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window)  # True = 실패 또는 느린 호출
+        self.state = CLOSED
+        self._retry_at = 0.0
+        self._consecutive_opens = 0
+        self._probe_in_flight = False
+
+        self.rejected = 0
+        self.transitions: Dict[str, int] = {}
+
+    def _transition(self, state: str):
+        if state == self.state:
+            return
+        name = f"{self.state}->{state}"
+        self.transitions[name] = self.transitions.get(name, 0) + 1
+        logger.warning("[CircuitBreaker] %s: %s", self.name, name)
+        self.state = state
+
+    def _open(self, now: float):
+        backoff = min(self.open_seconds * 2 ** self._consecutive_opens, self.max_open_seconds)
+        self._consecutive_opens += 1
+        self._retry_at = now + backoff * random.uniform(0.5, 1.0)
+        self._probe_in_flight = False
+        self._transition(OPEN)
+
+    def allow(self) -> bool:
+        """지금 호출해도 되는지 (half-open 에서는 탐색 호출 하나만 허용)"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            now = time.monotonic()
+            if self.state == OPEN and now >= self._retry_at:
+                self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def release(self):
+        """허용받은 호출을 결과 없이 포기 (취소, 호출 한도 대기 실패 등 업스트림과 무관한 중단)"""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probe_in_flight = False
+
+    def record(self, latency: float, ok: bool):
+        """호출 결과 기록 (성공이어도 slow_seconds 이상 걸리면 실패로 셈)"""
+        failed = not ok or latency >= self.slow_seconds
+        with self._lock:
+            now = time.monotonic()
+            if self.state == HALF_OPEN:
+                if failed:
+                    self._open(now)
+                else:
+                    self._outcomes.clear()
+                    self._consecutive_opens = 0
+                    self._probe_in_flight = False
+                    self._transition(CLOSED)
+                return
+
+            self._outcomes.append(failed)
+            if (self.state == CLOSED and len(self._outcomes) >= self.min_calls
+                    and sum(self._outcomes) / len(self._outcomes) >= self.failure_ratio):
+                self._open(now)
+
+    def call_timeout(self) -> float:
+        """이번 호출에 쓸 타임아웃 (요청 마감까지 남은 시간과 timeout 중 작은 값)"""
+        limit = _deadline.get()
+        if limit is None:
+            return self.timeout
+        remaining = limit - time.monotonic()
+        if remaining <= 0:
+            raise CircuitOpenError(f"{self.name}: 요청 마감 시각이 지났습니다")
+        return min(self.timeout, remaining)
+
+    def start_call(self) -> float:
+        """호출 직전 확인 (차단 중이면 CircuitOpenError), 타임아웃 반환 - 끝나면 record 로 결과를 남길 것"""
+        timeout = self.call_timeout()
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name}: 장애로 호출을 차단 중입니다")
+        return timeout
+
+    def admit(self, acquire: Optional[Callable[[], Any]] = None) -> float:
+        """start_call 후 acquire()(호출 한도 토큰 등)까지 받고 남은 타임아웃 반환
+
+        차단 중이면 토큰을 쓰지 않고 바로 CircuitOpenError, acquire 가 실패하면 허용을 되돌린다.
+        """
+        timeout = self.start_call()
+        if acquire is None:
+            return timeout
+        try:
+            acquire()
+            return self.call_timeout()
+        except BaseException:
+            self.release()
+            raise
+
+    async def admit_async(self, acquire: Optional[Callable[[], Awaitable[Any]]] = None) -> float:
+        """admit 의 비동기 버전"""
+        timeout = self.start_call()
+        if acquire is None:
+            return timeout
+        try:
+            await acquire()
+            return self.call_timeout()
+        except BaseException:
+            self.release()
+            raise
+
+    def call(self, fn: Callable[[float], T], acquire: Optional[Callable[[], Any]] = None) -> T:
+        """fn(timeout) 실행 (차단 중이면 CircuitOpenError, 예외도 실패로 기록 후 다시 던짐)"""
+        timeout = self.admit(acquire)
+        started = time.monotonic()
+        try:
+            result = fn(timeout)
+        except Exception:
+            self.record(time.monotonic() - started, False)
+            raise
+        except BaseException:
+            self.release()  # 취소/인터럽트는 업스트림 실패로 세지 않음
+            raise
+        self.record(time.monotonic() - started, True)
+        return result
+
+    async def call_async(self, fn: Callable[[float], Awaitable[T]],
+                         acquire: Optional[Callable[[], Awaitable[Any]]] = None) -> T:
+        """call 의 비동기 버전 (CancelledError 는 기록하지 않고 다시 던짐)"""
+        timeout = await self.admit_async(acquire)
+        started = time.monotonic()
+        try:
+            result = await fn(timeout)
+        except Exception:
+            self.record(time.monotonic() - started, False)
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.record(time.monotonic() - started, True)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            outcomes = list(self._outcomes)
+            return {
+                "state": self.state,
+                "failure_rate": round(sum(outcomes) / len(outcomes), 3) if outcomes else 0.0,
+                "rejected": self.rejected,
+                "transitions": dict(self.transitions),
+                "retry_in": round(max(self._retry_at - time.monotonic(), 0.0), 1) if self.state == OPEN else 0.0,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """이름별로 프로세스 전역에서 공유하는 CircuitBreaker"""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+        return breaker
+
+
+def circuit_breaker_stats() -> Dict[str, Dict[str, Any]]:
+    """모든 CircuitBreaker 의 상태와 전이 횟수"""
+    with _breakers_lock:
+        return {name: breaker.stats() for name, breaker in _breakers.items()}
@@ -0,0 +1,185 @@
+import os
+import re
+import json
+import time
+import asyncio
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Optional, List
+
+COMPLETION_CACHE_FILE = os.getenv("COMPLETION_CACHE_FILE", "completion_cache.sqlite3")
+
+KST = timezone(timedelta(hours=9))
+MARKET_OPEN = (9, 0)
+MARKET_CLOSE = (15, 30)
+
+# 장중에는 시세가 계속 바뀌므로 짧게, 장 마감 후에는 다음 개장까지 유지
+MARKET_HOURS_TTL = 60
+MEMORY_MAX_ENTRIES = 256
+
+_WHITESPACE = re.compile(r"[ \t]+")
+
+
+def is_market_open(now: Optional[datetime] = None) -> bool:
+    """KRX 정규장(평일 09:00~15:30 KST) 여부"""
+    now = (now or datetime.now(KST)).astimezone(KST)
+    if now.weekday() >= 5:
+        return False
+    return MARKET_OPEN <= (now.hour, now.minute) < MARKET_CLOSE
+
+
+def next_market_open(now: Optional[datetime] = None) -> datetime:
+    """다음 정규장 시작 시각 (공휴일은 고려하지 않음)"""
+    now = (now or datetime.now(KST)).astimezone(KST)
+    candidate = now.replace(hour=MARKET_OPEN[0], minute=MARKET_OPEN[1], second=0, microsecond=0)
+    if candidate <= now:
+        candidate += timedelta(days=1)
+    while candidate.weekday() >= 5:
+        candidate += timedelta(days=1)
+    return candidate
+
+
+def completion_ttl(now: Optional[datetime] = None) -> float:
+    """장중이면 MARKET_HOURS_TTL, 장 마감 후에는 다음 개장까지 남은 초"""
+    now = (now or datetime.now(KST)).astimezone(KST)
+    if is_market_open(now):
+        return MARKET_HOURS_TTL
+    return (next_market_open(now) - now).total_seconds()
+
+
+def normalize_prompt(prompt: str) -> str:
+    """줄 앞뒤 공백, 연속 공백, 빈 줄 차이를 무시하도록 정규화"""
+    lines = (_WHITESPACE.sub(" ", line).strip() for line in prompt.strip().splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def completion_key(messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+    """시스템/사용자 메시지와 샘플링 파라미터로 캐시 키 생성"""
+    payload = {
+        "messages": [{"role": m["role"], "content": normalize_prompt(m["content"])} for m in messages],
+        "params": params,
+    }
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class CompletionCache:
+    """HyperCLOVA 응답 캐시: 메모리 LRU 앞단 + sqlite 디스크 저장소
+
+    항목마다 원래 호출에 걸린 시간을 함께 저장해, 적중 시 절약한 지연 시간을 누적한다.
+    """
+
+    def __init__(self, path: Optional[str] = COMPLETION_CACHE_FILE, max_entries: int = MEMORY_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def _db(self) -> Optional[sqlite3.Connection]:
+        """디스크 저장소 (처음 쓸 때 연결)"""
+        if self.path and self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS completions ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, latency REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _remember(self, key: str, entry: tuple):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """유효한 응답이 있으면 반환 (메모리 → 디스크 순)"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+            else:
+                db = self._db()
+                row = db.execute("SELECT value, expires_at, latency FROM completions WHERE key = ?",
+                                 (key,)).fetchone() if db else None
+                if row is not None:
+                    entry = tuple(row)
+                    self._remember(key, entry)
+
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    self._memory.pop(key, None)
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.saved_seconds += entry[2]
+            return entry[0]
+
+    def put(self, key: str, value: str, latency: float, ttl: Optional[float] = None):
+        """응답 저장 (ttl 을 주지 않으면 장 시간 기준)"""
+        ttl = completion_ttl() if ttl is None else ttl
+        entry = (value, time.time() + ttl, latency)
+        with self._lock:
+            self._remember(key, entry)
+            db = self._db()
+            if db:
+                db.execute("INSERT OR REPLACE INTO completions (key, value, expires_at, latency) VALUES (?, ?, ?, ?)",
+                           (key, *entry))
+                db.commit()
+
+    async def get_async(self, key: str) -> Optional[str]:
+        """get 의 비동기 버전 (디스크 조회가 이벤트 루프를 막지 않도록 스레드에서)"""
+        return await asyncio.to_thread(self.get, key)
+
+    async def put_async(self, key: str, value: str, latency: float, ttl: Optional[float] = None):
+        """put 의 비동기 버전 (INSERT/커밋을 스레드에서)"""
+        await asyncio.to_thread(self.put, key, value, latency, ttl)
+
+    def purge_expired(self) -> int:
+        """만료된 항목 삭제 (삭제 건수 반환)"""
+        now = time.time()
+        with self._lock:
+            for key in [key for key, entry in self._memory.items() if entry[1] <= now]:
+                del self._memory[key]
+            db = self._db()
+            if not db:
+                return 0
+            deleted = db.execute("DELETE FROM completions WHERE expires_at <= ?", (now,)).rowcount
+            db.commit()
+            return deleted
+
+    def stats(self) -> Dict[str, Any]:
+        """적중률과 절약한 지연 시간"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "saved_seconds": self.saved_seconds,
+            "memory_entries": len(self._memory),
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_default_cache: Optional[CompletionCache] = None
+
+
+def get_completion_cache() -> CompletionCache:
+    """프로세스 전역에서 공유하는 응답 캐시"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = CompletionCache()
+    return _default_cache
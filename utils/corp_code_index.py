@@ -0,0 +1,239 @@
+import os
+import sys
+import mmap
+import struct
+import hashlib
+import tempfile
+import xml.etree.ElementTree as ET
+from typing import Dict, Any, Optional, List, Iterable
+
+CORPCODE_FILE = "CORPCODE.xml"
+CORPCODE_INDEX_FILE = "CORPCODE.idx"
+
+# 헤더: 매직, 전체 건수, 상장사 건수, 원본 XML mtime(ns), 크기, sha256
+_MAGIC = b"CORPIDX1"
+_HEADER = struct.Struct("<8sIIqQ32s")
+# 레코드: corp_code(8) + stock_code(6, 비상장은 공백) + 이름 오프셋 + 이름 길이
+_RECORD = struct.Struct("<8s6sIH")
+_STOCK_REF = struct.Struct("<I")
+_NO_STOCK_CODE = b" " * 6
+
+
+def iter_corp_code_entries(xml_path: str = CORPCODE_FILE) -> Iterable[Dict[str, str]]:
+    """CORPCODE.xml 의 list 항목을 스트리밍으로 읽기 (전체 트리를 만들지 않음)"""
+    if not os.path.exists(xml_path):
+        return
+    for _, elem in ET.iterparse(xml_path, events=("end",)):
+        if elem.tag != "list":
+            continue
+        yield {
+            "corp_code": (elem.findtext("corp_code") or "").strip(),
+            "corp_name": (elem.findtext("corp_name") or "").strip(),
+            "stock_code": (elem.findtext("stock_code") or "").strip(),
+            "modify_date": (elem.findtext("modify_date") or "").strip(),
+        }
+        elem.clear()
+
+
+def _file_sha256(path: str) -> bytes:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def build_corp_code_index(xml_path: str = CORPCODE_FILE, index_path: str = CORPCODE_INDEX_FILE) -> int:
+    """CORPCODE.xml 을 스트리밍 파싱해 메모리 매핑용 인덱스 파일 생성 (건수 반환)"""
+    entries = []
+    for corp in iter_corp_code_entries(xml_path):
+        if not corp["corp_code"] or not corp["corp_name"]:
+            continue
+        entries.append((corp["corp_name"].encode("utf-8"),
+                        corp["corp_code"].encode("ascii"),
+                        corp["stock_code"].encode("ascii")))
+
+    # 이름순 정렬 (같은 이름이면 상장사, corp_code 순)
+    entries.sort(key=lambda e: (e[0], not e[2], e[1]))
+
+    records = bytearray()
+    names = bytearray()
+    listed = []
+    for position, (name, corp_code, stock_code) in enumerate(entries):
+        records += _RECORD.pack(corp_code, stock_code or _NO_STOCK_CODE, len(names), len(name))
+        names += name
+        if stock_code:
+            listed.append((stock_code, position))
+    listed.sort()
+
+    stat = os.stat(xml_path)
+    header = _HEADER.pack(_MAGIC, len(entries), len(listed), stat.st_mtime_ns, stat.st_size,
+                          _file_sha256(xml_path))
+
+    # 프로세스마다 다른 임시 파일에 쓰고 교체 (동시에 다시 만들어도 서로의 임시 파일을 덮어쓰지 않음)
+    fd, tmp_path = tempfile.mkstemp(prefix=".corpcode-", suffix=".idx", dir=os.path.dirname(os.path.abspath(index_path)))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(records)
+            for _, position in listed:
+                f.write(_STOCK_REF.pack(position))
+            f.write(names)
+        os.replace(tmp_path, index_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return len(entries)
+
+
+class CorpCodeIndex:
+    """build_corp_code_index 로 만든 인덱스를 mmap 으로 열어 이진 탐색하는 조회기"""
+
+    def __init__(self, index_path: str = CORPCODE_INDEX_FILE):
+        self.index_path = index_path
+        with open(index_path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.count, self.listed_count, self.xml_mtime_ns, self.xml_size, self.xml_sha256 = \
+            _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"올바른 corp code 인덱스 파일이 아닙니다: {index_path}")
+
+        self._records_offset = _HEADER.size
+        self._stock_offset = self._records_offset + self.count * _RECORD.size
+        self._names_offset = self._stock_offset + self.listed_count * _STOCK_REF.size
+
+    def close(self):
+        self._mm.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _record(self, position: int) -> tuple:
+        return _RECORD.unpack_from(self._mm, self._records_offset + position * _RECORD.size)
+
+    def _name_bytes(self, record: tuple) -> bytes:
+        start = self._names_offset + record[2]
+        return self._mm[start:start + record[3]]
+
+    def _entry(self, position: int) -> Dict[str, Any]:
+        record = self._record(position)
+        stock_code = record[1].decode("ascii").strip()
+        return {
+            "corp_name": self._name_bytes(record).decode("utf-8"),
+            "corp_code": record[0].decode("ascii"),
+            "stock_code": stock_code or None,
+        }
+
+    def _lower_bound(self, name: bytes) -> int:
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            if self._name_bytes(self._record(mid)) < name:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def get(self, corp_name: str) -> Optional[str]:
+        """회사명으로 corp_code 조회 (동명 회사는 상장사 우선)"""
+        name = corp_name.strip().encode("utf-8")
+        position = self._lower_bound(name)
+        if position < self.count and self._name_bytes(self._record(position)) == name:
+            return self._record(position)[0].decode("ascii")
+        return None
+
+    def find_all(self, corp_name: str) -> List[Dict[str, Any]]:
+        """같은 이름의 모든 회사"""
+        name = corp_name.strip().encode("utf-8")
+        results = []
+        position = self._lower_bound(name)
+        while position < self.count and self._name_bytes(self._record(position)) == name:
+            results.append(self._entry(position))
+            position += 1
+        return results
+
+    def find_prefix(self, prefix: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """이름이 prefix 로 시작하는 회사 (이름순)"""
+        encoded = prefix.strip().encode("utf-8")
+        results = []
+        position = self._lower_bound(encoded)
+        while position < self.count and len(results) < limit:
+            if not self._name_bytes(self._record(position)).startswith(encoded):
+                break
+            results.append(self._entry(position))
+            position += 1
+        return results
+
+    def get_by_stock_code(self, stock_code: str) -> Optional[Dict[str, Any]]:
+        """종목코드로 회사 조회"""
+        code = stock_code.strip().encode("ascii")
+        low, high = 0, self.listed_count
+        while low < high:
+            mid = (low + high) // 2
+            position = _STOCK_REF.unpack_from(self._mm, self._stock_offset + mid * _STOCK_REF.size)[0]
+            mid_code = self._record(position)[1]
+            if mid_code < code:
+                low = mid + 1
+            elif mid_code > code:
+                high = mid
+            else:
+                return self._entry(position)
+        return None
+
+    def __iter__(self) -> Iterable[Dict[str, Any]]:
+        for position in range(self.count):
+            yield self._entry(position)
+
+    def as_dict(self) -> Dict[str, str]:
+        """기존 corp_dict 형식 {회사명: corp_code}"""
+        corp_dict = {}
+        for entry in self:
+            corp_dict.setdefault(entry["corp_name"], entry["corp_code"])
+        return corp_dict
+
+
+def _is_index_current(index_path: str, xml_path: str) -> bool:
+    """인덱스가 원본 XML 과 일치하는지 확인 (mtime/크기 → 다르면 해시 비교)"""
+    with open(index_path, "rb") as f:
+        header = f.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        return False
+    magic, count, listed_count, mtime_ns, size, sha256 = _HEADER.unpack(header)
+    if magic != _MAGIC:
+        return False
+
+    stat = os.stat(xml_path)
+    if stat.st_mtime_ns == mtime_ns and stat.st_size == size:
+        return True
+    if stat.st_size != size or _file_sha256(xml_path) != sha256:
+        return False
+
+    # 내용은 같고 mtime 만 바뀐 경우 헤더만 갱신해 다음 확인을 빠르게
+    with open(index_path, "r+b") as f:
+        f.write(_HEADER.pack(magic, count, listed_count, stat.st_mtime_ns, size, sha256))
+    return True
+
+
+def load_corp_code_index(xml_path: str = CORPCODE_FILE,
+                         index_path: Optional[str] = None) -> Optional[CorpCodeIndex]:
+    """인덱스를 열고, 없거나 XML 이 바뀌었으면 다시 생성 (둘 다 없으면 None)"""
+    if index_path is None:
+        index_path = os.path.splitext(xml_path)[0] + ".idx"
+
+    xml_exists = os.path.exists(xml_path)
+    if not os.path.exists(index_path):
+        if not xml_exists:
+            return None
+        build_corp_code_index(xml_path, index_path)
+    elif xml_exists and not _is_index_current(index_path, xml_path):
+        build_corp_code_index(xml_path, index_path)
+
+    return CorpCodeIndex(index_path)
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else CORPCODE_FILE
+    target = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(source)[0] + ".idx"
+    total = build_corp_code_index(source, target)
+    print(f"[INFO] {target} 생성 완료 ({total:,}건)")
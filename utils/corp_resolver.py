@@ -0,0 +1,215 @@
+import os
+import re
+import csv
+from collections import deque
+from typing import Dict, Any, Optional, List, Iterable, Tuple
+from utils.corp_code_index import load_corp_code_index
+
+KIND_CSV_FILE = "KIND_corp_list.csv"
+CORPCODE_FILE = "CORPCODE.xml"
+
+# 회사명에서 제거해 짧은 이름(약칭)을 만드는 표기들
+_CORP_AFFIXES = ["주식회사", "(주)", "㈜"]
+
+# 회사명 바로 뒤에 붙을 수 있는 조사 (예: "레몬의 주가", "삼성전자에서")
+_PARTICLES = set("의은는이가을를도만과와에랑")
+_MULTI_PARTICLES = ("에서", "으로", "보다", "까지", "부터", "하고", "이랑")
+
+# 회사명 뒤에 붙으면 보통주가 아니라 우선주 (예: "삼성전자우", "현대차2우B", "삼성전자 우선주")
+_PREFERRED_SUFFIX = re.compile(r"(?:\d?우B?|\s*우선주)(?![0-9A-Za-z가-힣])")
+
+# 영문 대소문자만 치환 (str.upper 와 달리 문자열 길이가 바뀌지 않음)
+_ASCII_UPPER = str.maketrans("abcdefghijklmnopqrstuvwxyz", "ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum()
+
+
+def _name_variants(name: str) -> List[str]:
+    """회사명과 약칭 변형 목록 (법인 표기 제거, 공백 제거)"""
+    variants = [name]
+    short = name
+    for affix in _CORP_AFFIXES:
+        short = short.replace(affix, "")
+    short = short.strip()
+    if short and short != name:
+        variants.append(short)
+    for variant in list(variants):
+        compact = variant.replace(" ", "")
+        if compact != variant:
+            variants.append(compact)
+    return variants
+
+
+class AhoCorasick:
+    """다중 문자열 검색 오토마톤 (입력 길이에 선형 시간)"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.outputs: List[List[int]] = [[]]
+        self.patterns: List[str] = []
+
+        for pattern in patterns:
+            self._add(pattern)
+        self._build_links()
+
+    def _add(self, pattern: str):
+        node = 0
+        for ch in pattern:
+            next_node = self.goto[node].get(ch)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][ch] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+            node = next_node
+        self.outputs[node].append(len(self.patterns))
+        self.patterns.append(pattern)
+
+    def _build_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and ch not in self.goto[state]:
+                    state = self.fail[state]
+                fail_state = self.goto[state].get(ch, 0)
+                self.fail[child] = fail_state if fail_state != child else 0
+                # 접미사 상태의 출력까지 합쳐 두면 검색 시 링크를 따라갈 필요가 없다
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+
+    def iter_matches(self, text: str) -> Iterable[Tuple[int, int, int]]:
+        """(시작 위치, 끝 위치, 패턴 번호) 를 순서대로 반환"""
+        goto, fail, outputs, patterns = self.goto, self.fail, self.outputs, self.patterns
+        node = 0
+        for end, ch in enumerate(text, 1):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for pattern_id in outputs[node]:
+                yield end - len(patterns[pattern_id]), end, pattern_id
+
+
+class CompanyResolver:
+    """KIND 상장법인 목록과 DART 고유번호 목록 기반 회사명 인식기
+
+    회사명, 약칭, 6자리 종목코드를 하나의 Aho-Corasick 오토마톤으로 만들어
+    쿼리에서 가장 긴 회사 언급을 찾고 종목코드/corp_code 를 함께 돌려준다.
+    KIND CSV 에는 시장 구분이 없어 yfinance 티커(.KS/.KQ)는 만들지 않는다.
+    """
+
+    def __init__(self, companies: List[Dict[str, Any]]):
+        self.companies = companies
+        self._pattern_targets: List[int] = []
+        self._by_key: Dict[str, int] = {}
+
+        for index, company in enumerate(companies):
+            keys = _name_variants(company["name"])
+            if company.get("stock_code"):
+                keys.append(company["stock_code"])
+            for key in keys:
+                key = key.translate(_ASCII_UPPER)
+                # 같은 이름이 여러 번 나오면 먼저 등록된(상장) 회사를 우선
+                if len(key) >= 2 and key not in self._by_key:
+                    self._by_key[key] = index
+
+        keys = list(self._by_key)
+        self._automaton = AhoCorasick(keys)
+        self._pattern_targets = [self._by_key[key] for key in keys]
+
+    @classmethod
+    def from_files(cls, kind_csv: str = KIND_CSV_FILE, corpcode_xml: str = CORPCODE_FILE,
+                   include_unlisted: bool = False) -> "CompanyResolver":
+        """KIND CSV 와 CORPCODE.xml 로 인식기 생성 (없는 파일은 건너뜀)"""
+        companies: List[Dict[str, Any]] = []
+        by_stock_code: Dict[str, Dict[str, Any]] = {}
+
+        if os.path.exists(kind_csv):
+            with open(kind_csv, encoding="utf-8-sig", newline="") as f:
+                for row in csv.DictReader(f):
+                    stock_code = (row.get("종목코드") or "").strip().zfill(6)
+                    company = {
+                        "name": row["회사명"].strip(),
+                        "stock_code": stock_code,
+                        "corp_code": None,
+                    }
+                    companies.append(company)
+                    by_stock_code[stock_code] = company
+
+        corp_index = load_corp_code_index(corpcode_xml)
+        for corp in (corp_index if corp_index is not None else []):
+            company = by_stock_code.get(corp["stock_code"]) if corp["stock_code"] else None
+            if company is not None:
+                company["corp_code"] = corp["corp_code"]
+                if corp["corp_name"] != company["name"]:
+                    companies.append(dict(company, name=corp["corp_name"]))
+            elif corp["stock_code"] or include_unlisted:
+                companies.append({
+                    "name": corp["corp_name"],
+                    "stock_code": corp["stock_code"] or None,
+                    "corp_code": corp["corp_code"],
+                })
+
+        if corp_index is not None:
+            corp_index.close()
+        return cls(companies)
+
+    def _is_valid_mention(self, text: str, start: int, end: int) -> bool:
+        """회사명이나 종목코드가 다른 단어 일부로 매칭된 경우 제외
+
+        오른쪽은 길이와 관계없이 문자열 끝, 단어가 아닌 문자, 조사 중 하나여야 한다
+        ("카카오뱅크" 안의 "카카오" 제외). 뒤에 우/우선주가 붙으면 보통주가 아니므로 제외.
+        """
+        if text[start:end].isdigit():
+            before = text[start - 1] if start > 0 else ""
+            after = text[end] if end < len(text) else ""
+            return not before.isdigit() and not after.isdigit()
+        if start > 0 and _is_word_char(text[start - 1]) and end - start < 3:
+            return False
+        if _PREFERRED_SUFFIX.match(text, end):
+            return False
+        if end == len(text) or not _is_word_char(text[end]):
+            return True
+        return text[end] in _PARTICLES or text.startswith(_MULTI_PARTICLES, end)
+
+    def find_all(self, text: str) -> List[Dict[str, Any]]:
+        """쿼리 내 모든 회사 언급 (시작 위치 순)"""
+        normalized = text.translate(_ASCII_UPPER)
+        mentions = []
+        for start, end, pattern_id in self._automaton.iter_matches(normalized):
+            if not self._is_valid_mention(normalized, start, end):
+                continue
+            company = self.companies[self._pattern_targets[pattern_id]]
+            mentions.append(dict(company, matched=text[start:end], start=start, end=end))
+        mentions.sort(key=lambda m: (m["start"], -(m["end"] - m["start"])))
+        return mentions
+
+    def find(self, text: str) -> Optional[Dict[str, Any]]:
+        """쿼리에서 가장 긴 회사 언급 하나 (길이가 같으면 앞쪽 우선)"""
+        best = None
+        for mention in self.find_all(text):
+            length = mention["end"] - mention["start"]
+            if best is None or length > best["end"] - best["start"]:
+                best = mention
+        return best
+
+    def lookup(self, name_or_code: str) -> Optional[Dict[str, Any]]:
+        """회사명/약칭/종목코드 정확히 일치 조회"""
+        index = self._by_key.get(name_or_code.strip().translate(_ASCII_UPPER))
+        return dict(self.companies[index]) if index is not None else None
+
+
+_default_resolver: Optional[CompanyResolver] = None
+
+
+def get_company_resolver() -> CompanyResolver:
+    """프로세스 전역에서 공유하는 회사명 인식기 (최초 호출 시 한 번만 생성)"""
+    global _default_resolver
+    if _default_resolver is None:
+        _default_resolver = CompanyResolver.from_files()
+    return _default_resolver
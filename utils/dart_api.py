@@ -1,9 +1,12 @@
 # 실제 서비스에서는 get_corp_code()를 OpenDART의 corpCode.xml을 파싱하여 구현하거나 DB에 저장해 둬야 합니다.
 
-import requests
 import xml.etree.ElementTree as ET
+from utils.http_client import get_http_client, get_async_client
+from utils.rate_limiter import get_rate_limiter
+from utils.tracing import span
 
 DART_API_KEY = "YOUR_DART_API_KEY"
+FINANCIAL_REPORT_URL = "https://opendart.fss.or.kr/api/fnlttSinglAcnt.json"
 
 def get_corp_code(company_name: str) -> str:
     # 사전에 내려받은 corpCode.xml 파싱하거나 캐시 API 사용
@@ -13,12 +16,8 @@ def get_corp_code(company_name: str) -> str:
     }
     return dummy_map.get(company_name)
 
-def fetch_financial_report(corp_code: str, year: str, field: str) -> str:
-    """
-    DART XBRL 공시 텍스트 기반으로 간단히 '영업이익' 등을 추출하는 예시
-    """
-    url = "https://opendart.fss.or.kr/api/fnlttSinglAcnt.json"
-    params = {
+def _financial_report_params(corp_code: str, year: str) -> dict:
+    return {
         "crtfc_key": DART_API_KEY,
         "corp_code": corp_code,
         "bsns_year": year,
@@ -26,9 +25,7 @@ def fetch_financial_report(corp_code: str, year: str, field: str) -> str:
         "fs_div": "CFS"
     }
 
-    response = requests.get(url, params=params)
-    json_data = response.json()
-
+def _extract_financial_field(json_data: dict, year: str, field: str) -> str:
     if "list" not in json_data:
         return f"{year}년 재무제표 조회 실패"
 
@@ -36,4 +33,22 @@ def fetch_financial_report(corp_code: str, year: str, field: str) -> str:
         if field in item.get("account_nm", ""):
             return item.get("thstrm_amount")
 
-    return f"{field} 항목을 찾을 수 없음"
\ No newline at end of file
+    return f"{field} 항목을 찾을 수 없음"
+
+def fetch_financial_report(corp_code: str, year: str, field: str) -> str:
+    """
+    DART XBRL 공시 텍스트 기반으로 간단히 '영업이익' 등을 추출하는 예시
+    """
+    get_rate_limiter("dart").acquire()
+    client = get_http_client(FINANCIAL_REPORT_URL)
+    with span("upstream", service="dart"):
+        response = client.get(FINANCIAL_REPORT_URL, params=_financial_report_params(corp_code, year))
+    return _extract_financial_field(response.json(), year, field)
+
+async def fetch_financial_report_async(corp_code: str, year: str, field: str) -> str:
+    """fetch_financial_report 의 비동기 버전 (공유 AsyncClient 사용)"""
+    await get_rate_limiter("dart").acquire_async()
+    client = get_async_client(FINANCIAL_REPORT_URL)
+    with span("upstream", service="dart"):
+        response = await client.get(FINANCIAL_REPORT_URL, params=_financial_report_params(corp_code, year))
+    return _extract_financial_field(response.json(), year, field)
@@ -7,7 +7,7 @@ def handle_errors(fn):
         try:
             return await fn(*args, **kwargs)
         except Exception as e:
-            logger.error(f"Unhandled error in {fn.__name__}: {e}")
+            logger.error("Unhandled error in %s: %s", fn.__name__, e)
             raise
         return wrapper
     
\ No newline at end of file
@@ -0,0 +1,443 @@
+import os
+import json
+import time
+import base64
+import random
+import asyncio
+import hashlib
+import threading
+from datetime import datetime, timezone
+from urllib.parse import urlsplit, parse_qsl, urlencode
+from typing import Dict, Any, Optional, Callable, Tuple
+
+import httpx
+
+from utils import http_client
+
+# record: 실제 업스트림을 호출하고 응답을 카세트로 저장, replay: 카세트만으로 응답 (네트워크 없음)
+CASSETTE_MODE = os.getenv("HTTP_CASSETTE_MODE", "").lower()
+CASSETTE_DIR = os.getenv("HTTP_CASSETTE_DIR", "cassettes")
+# 재생 지연: "recorded"(녹화 당시 지연), "recorded:0.5"(배율), "0", "fixed:50", "uniform:20,80", "lognormal:50,0.6"
+# 호스트별 지정: "opendart.fss.or.kr=lognormal:120,0.5;default=fixed:20"
+REPLAY_LATENCY = os.getenv("HTTP_REPLAY_LATENCY", "recorded")
+REPLAY_ERROR_RATE = float(os.getenv("HTTP_REPLAY_ERROR_RATE", "0"))
+# 주입한 오류의 응답 코드 (0 이면 응답 대신 연결 오류)
+REPLAY_ERROR_STATUS = int(os.getenv("HTTP_REPLAY_ERROR_STATUS", "503"))
+REPLAY_SEED = os.getenv("HTTP_REPLAY_SEED")
+
+# 카세트 키와 저장 URL 에서 빼는 인증 파라미터 (다른 키로 녹화해도 같은 카세트로 재생)
+SECRET_PARAMS = {"crtfc_key", "apikey", "api_key", "servicekey"}
+# 본문을 다시 만들어 돌려주므로 전송 관련 헤더는 저장하지 않음
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+
+
+class CassetteMiss(httpx.TransportError):
+    """재생 모드에서 녹화된 응답이 없음"""
+
+
+def _canonical_url(url: str) -> str:
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if k.lower() not in SECRET_PARAMS)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}" + (f"?{urlencode(query)}" if query else "")
+
+
+def _canonical_body(body: bytes) -> bytes:
+    """JSON 본문은 키 순서와 공백에 상관없이 같은 키가 되도록 정규화"""
+    if not body:
+        return b""
+    try:
+        return json.dumps(json.loads(body), sort_keys=True, ensure_ascii=False).encode("utf-8")
+    except ValueError:
+        return body
+
+
+def cassette_key(method: str, url: str, body: bytes = b"") -> str:
+    """메서드 + 인증 파라미터를 뺀 정렬된 URL + 본문의 sha256 (헤더는 요청 ID 등이 매번 달라 제외)"""
+    digest = hashlib.sha256(f"{method.upper()} {_canonical_url(url)}\n".encode("utf-8"))
+    digest.update(_canonical_body(body))
+    return digest.hexdigest()
+
+
+def _encode_body(content: bytes) -> Dict[str, str]:
+    try:
+        return {"text": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"base64": base64.b64encode(content).decode("ascii")}
+
+
+def _decode_body(body: Dict[str, str]) -> bytes:
+    if "base64" in body:
+        return base64.b64decode(body["base64"])
+    return body.get("text", "").encode("utf-8")
+
+
+class CassetteStore:
+    """호스트별 디렉터리에 요청 하나당 JSON 파일 하나로 저장하는 카세트 저장소
+
+    {root}/{host}/{key}.json = {"request": {...}, "response": {"status", "headers", "body", "elapsed_ms"}}
+    읽은 카세트는 메모리에 캐시해 재생 중 디스크 읽기가 측정값에 섞이지 않게 한다.
+    """
+
+    def __init__(self, root: str = CASSETTE_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+        self._cache: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = {}
+
+    def _path(self, host: str, key: str) -> str:
+        return os.path.join(self.root, host.replace(":", "_"), key + ".json")
+
+    def load(self, host: str, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if (host, key) not in self._cache:
+                path = self._path(host, key)
+                entry = None
+                if os.path.exists(path):
+                    with open(path, encoding="utf-8") as f:
+                        entry = json.load(f)
+                self._cache[(host, key)] = entry
+            return self._cache[(host, key)]
+
+    def save(self, host: str, key: str, entry: Dict[str, Any]):
+        path = self._path(host, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False, indent=1)
+        os.replace(path + ".tmp", path)
+        with self._lock:
+            self._cache[(host, key)] = entry
+
+    def __len__(self) -> int:
+        if not os.path.isdir(self.root):
+            return 0
+        return sum(len([name for name in files if name.endswith(".json")]) for _, _, files in os.walk(self.root))
+
+
+class LatencyModel:
+    """재생 지연 분포 (spec 형식은 REPLAY_LATENCY 주석 참고)"""
+
+    def __init__(self, spec: str = "recorded"):
+        self.spec = spec.strip() or "0"
+        kind, _, args = self.spec.partition(":")
+        self.kind = kind.lower()
+        self.args = [float(value) for value in args.split(",") if value.strip()]
+        if self.kind not in ("recorded", "fixed", "uniform", "lognormal"):
+            self.args = [float(self.kind)]  # 숫자만 쓰면 고정 ms
+            self.kind = "fixed"
+
+    def sample_ms(self, rng: random.Random, recorded_ms: float) -> float:
+        if self.kind == "recorded":
+            return recorded_ms * (self.args[0] if self.args else 1.0)
+        if self.kind == "fixed":
+            return self.args[0]
+        if self.kind == "uniform":
+            return rng.uniform(self.args[0], self.args[1])
+        # lognormal:중앙값ms,sigma
+        median, sigma = self.args[0], self.args[1] if len(self.args) > 1 else 0.5
+        return median * rng.lognormvariate(0.0, sigma)
+
+
+def parse_latency_spec(spec: str) -> Dict[str, LatencyModel]:
+    """"host=spec;default=spec" 또는 "spec" → {호스트 | "default": LatencyModel}"""
+    models: Dict[str, LatencyModel] = {}
+    for part in filter(None, (part.strip() for part in spec.split(";"))):
+        host, sep, model = part.partition("=")
+        if sep:
+            models[host.strip()] = LatencyModel(model)
+        else:
+            models["default"] = LatencyModel(part)
+    models.setdefault("default", LatencyModel("recorded"))
+    return models
+
+
+class ReplayPolicy:
+    """재생 응답마다 지연과 오류를 정함 (seed 를 주면 같은 순서의 요청에 같은 지연/오류)"""
+
+    def __init__(self, latency: Optional[Dict[str, LatencyModel]] = None, error_rate: float = 0.0,
+                 error_status: int = REPLAY_ERROR_STATUS, seed: Optional[int] = None):
+        self.latency = latency or {"default": LatencyModel("recorded")}
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def decide(self, host: str, recorded_ms: float) -> Tuple[float, bool]:
+        """(지연 초, 오류 주입 여부)"""
+        model = self.latency.get(host) or self.latency["default"]
+        with self._lock:
+            delay_ms = model.sample_ms(self._rng, recorded_ms)
+            failed = self.error_rate > 0 and self._rng.random() < self.error_rate
+        return max(delay_ms, 0.0) / 1000, failed
+
+
+class CassetteStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {"recorded": 0, "replayed": 0, "misses": 0, "injected_errors": 0}
+
+    def add(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counters)
+
+
+def _host(url) -> str:
+    return urlsplit(str(url)).netloc
+
+
+def _request_key(request: httpx.Request) -> str:
+    return cassette_key(request.method, str(request.url), request.content)
+
+
+def _entry(request: httpx.Request, response: httpx.Response, content: bytes, elapsed: float) -> Dict[str, Any]:
+    return {
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "request": {"method": request.method, "url": _canonical_url(str(request.url))},
+        "response": {
+            "status": response.status_code,
+            "headers": [[k, v] for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS],
+            "body": _encode_body(content),
+            "elapsed_ms": round(elapsed * 1000, 3),
+        },
+    }
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """실제 전송 계층으로 보내고 응답 전체를 카세트로 저장 (스트리밍 응답도 다 받은 뒤 돌려줌)"""
+
+    def __init__(self, store: CassetteStore, stats: CassetteStats, inner: Optional[httpx.BaseTransport] = None):
+        self.store = store
+        self.stats = stats
+        self.inner = inner or httpx.HTTPTransport(limits=http_client.pool_limits(), http2=http_client.HTTP2_ENABLED)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        response = self.inner.handle_request(request)
+        try:
+            content = response.read()
+        finally:
+            response.close()
+        entry = _entry(request, response, content, time.perf_counter() - started)
+        self.store.save(_host(request.url), _request_key(request), entry)
+        self.stats.add("recorded")
+        return httpx.Response(response.status_code, headers=entry["response"]["headers"], content=content)
+
+    def close(self):
+        self.inner.close()
+
+
+class AsyncRecordingTransport(httpx.AsyncBaseTransport):
+    """RecordingTransport 의 비동기 버전"""
+
+    def __init__(self, store: CassetteStore, stats: CassetteStats, inner: Optional[httpx.AsyncBaseTransport] = None):
+        self.store = store
+        self.stats = stats
+        self.inner = inner or httpx.AsyncHTTPTransport(limits=http_client.pool_limits(), http2=http_client.HTTP2_ENABLED)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self.inner.handle_async_request(request)
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+        entry = _entry(request, response, content, time.perf_counter() - started)
+        self.store.save(_host(request.url), _request_key(request), entry)
+        self.stats.add("recorded")
+        return httpx.Response(response.status_code, headers=entry["response"]["headers"], content=content)
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+class _Replayer:
+    """카세트 조회 + 지연/오류 결정 (동기/비동기 전송 계층 공통)"""
+
+    def __init__(self, store: CassetteStore, policy: ReplayPolicy, stats: CassetteStats):
+        self.store = store
+        self.policy = policy
+        self.stats = stats
+
+    def plan(self, request: httpx.Request) -> Tuple[float, Optional[httpx.Response]]:
+        """(기다릴 초, 돌려줄 응답) - 응답이 None 이면 연결 오류를 주입"""
+        host = _host(request.url)
+        entry = self.store.load(host, _request_key(request))
+        if entry is None:
+            self.stats.add("misses")
+            raise CassetteMiss(f"녹화된 응답이 없습니다: {request.method} {_canonical_url(str(request.url))}",
+                               request=request)
+
+        recorded = entry["response"]
+        delay, failed = self.policy.decide(host, recorded.get("elapsed_ms", 0.0))
+        if failed:
+            self.stats.add("injected_errors")
+            if not self.policy.error_status:
+                return delay, None
+            return delay, httpx.Response(self.policy.error_status, json={"error": "injected by replay"}, request=request)
+
+        self.stats.add("replayed")
+        return delay, httpx.Response(recorded["status"], headers=recorded["headers"],
+                                     content=_decode_body(recorded["body"]), request=request)
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """카세트에서 응답을 돌려주는 전송 계층 (네트워크 없음, 지연/오류 주입)"""
+
+    def __init__(self, store: CassetteStore, policy: Optional[ReplayPolicy] = None,
+                 stats: Optional[CassetteStats] = None):
+        self._replayer = _Replayer(store, policy or ReplayPolicy(), stats or CassetteStats())
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        delay, response = self._replayer.plan(request)
+        time.sleep(delay)
+        if response is None:
+            raise httpx.ConnectError("injected by replay", request=request)
+        return response
+
+
+class AsyncReplayTransport(httpx.AsyncBaseTransport):
+    """ReplayTransport 의 비동기 버전 (지연 중 이벤트 루프를 막지 않음)"""
+
+    def __init__(self, store: CassetteStore, policy: Optional[ReplayPolicy] = None,
+                 stats: Optional[CassetteStats] = None):
+        self._replayer = _Replayer(store, policy or ReplayPolicy(), stats or CassetteStats())
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        delay, response = self._replayer.plan(request)
+        await asyncio.sleep(delay)
+        if response is None:
+            raise httpx.ConnectError("injected by replay", request=request)
+        return response
+
+
+class CassetteSession:
+    """현재 녹화/재생 설정 (mode, 저장소, 재생 정책, 통계)"""
+
+    def __init__(self, mode: str, store: CassetteStore, policy: ReplayPolicy):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"알 수 없는 카세트 모드: {mode}")
+        self.mode = mode
+        self.store = store
+        self.policy = policy
+        self.stats = CassetteStats()
+
+    def transport(self, is_async: bool):
+        if self.mode == "record":
+            return AsyncRecordingTransport(self.store, self.stats) if is_async else RecordingTransport(self.store, self.stats)
+        if is_async:
+            return AsyncReplayTransport(self.store, self.policy, self.stats)
+        return ReplayTransport(self.store, self.policy, self.stats)
+
+
+_session: Optional[CassetteSession] = None
+
+
+def use_cassettes(mode: Optional[str], root: str = CASSETTE_DIR, latency: str = REPLAY_LATENCY,
+                  error_rate: float = REPLAY_ERROR_RATE, error_status: int = REPLAY_ERROR_STATUS,
+                  seed: Optional[int] = None) -> Optional[CassetteSession]:
+    """공유 HTTP 클라이언트와 yfinance 조회를 녹화/재생으로 전환 (mode 가 None/"" 이면 해제)"""
+    global _session
+    if not mode:
+        _session = None
+        http_client.set_transport_factory(None)
+        return None
+
+    _session = CassetteSession(mode, CassetteStore(root),
+                               ReplayPolicy(parse_latency_spec(latency), error_rate, error_status, seed))
+    http_client.set_transport_factory(_session.transport)
+    return _session
+
+
+def use_cassettes_from_env() -> Optional[CassetteSession]:
+    """HTTP_CASSETTE_* / HTTP_REPLAY_* 환경변수로 설정 (HTTP_CASSETTE_MODE 가 비어 있으면 아무것도 안 함)"""
+    if not CASSETTE_MODE:
+        return None
+    return use_cassettes(CASSETTE_MODE, seed=int(REPLAY_SEED) if REPLAY_SEED else None)
+
+
+def cassette_stats() -> Dict[str, Any]:
+    """녹화/재생 현황 (꺼져 있으면 mode 만)"""
+    if _session is None:
+        return {"mode": "off"}
+    return {"mode": _session.mode, **_session.stats.snapshot()}
+
+
+def _through_cassette(session: CassetteSession, key: str, label: str, request: Dict[str, Any],
+                      fetch: Callable[[], Any], encode: Callable[[Any], Any], decode: Callable[[Any], Any]):
+    """HTTP 가 아닌 조회 한 번을 "yfinance" 호스트 카세트로 녹화하거나 재생"""
+    if session.mode == "replay":
+        entry = session.store.load("yfinance", key)
+        if entry is None:
+            session.stats.add("misses")
+            raise CassetteMiss(f"녹화된 응답이 없습니다: yfinance {label}")
+        delay, failed = session.policy.decide("yfinance", entry["response"].get("elapsed_ms", 0.0))
+        time.sleep(delay)
+        if failed:
+            session.stats.add("injected_errors")
+            raise ConnectionError("injected by replay")
+        session.stats.add("replayed")
+        return decode(entry["response"]["rows"])
+
+    started = time.perf_counter()
+    result = fetch()
+    session.store.save("yfinance", key, {
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "request": request,
+        "response": {"rows": encode(result), "elapsed_ms": round((time.perf_counter() - started) * 1000, 3)},
+    })
+    session.stats.add("recorded")
+    return result
+
+
+def cassette_fetcher(fetcher: Callable) -> Callable:
+    """PriceStore 의 fetcher(ticker, start, end) 를 녹화/재생으로 감쌈
+
+    yfinance 는 자체 HTTP 세션을 쓰므로 전송 계층 대신 변환된 일봉 배열을 "yfinance" 호스트 카세트로 저장한다.
+    호출할 때마다 현재 모드를 확인하므로 use_cassettes 를 나중에 불러도 적용된다.
+    """
+    def fetch(ticker: str, start, end):
+        session = _session
+        if session is None:
+            return fetcher(ticker, start, end)
+
+        import numpy as np
+        from utils.price_store import OHLCV_DTYPE
+
+        key = cassette_key("GET", f"yfinance://download/{ticker}?start={start.isoformat()}&end={end.isoformat()}")
+        return _through_cassette(
+            session, key, f"{ticker} {start}~{end}",
+            {"ticker": ticker, "start": start.isoformat(), "end": end.isoformat()},
+            lambda: fetcher(ticker, start, end),
+            lambda rows: rows.tolist(),
+            lambda rows: np.array([tuple(row) for row in rows], dtype=OHLCV_DTYPE))
+
+    return fetch
+
+
+def cassette_bars_download(download: Callable) -> Callable:
+    """전 종목 스냅샷의 download(symbols) → {종목: (종가 배열, 거래량 배열)} 를 녹화/재생으로 감쌈
+
+    요청한 종목 목록(정렬)이 키이므로 첫 갱신(.KS/.KQ 모두)과 이후 갱신(시장을 알아낸 코드만)이 각각 녹화된다.
+    """
+    def fetch(symbols):
+        session = _session
+        if session is None:
+            return download(symbols)
+
+        import numpy as np
+
+        symbols = sorted(symbols)
+        key = cassette_key("POST", "yfinance://download?period=5d&interval=1d",
+                           json.dumps(symbols).encode("utf-8"))
+        return _through_cassette(
+            session, key, f"전 종목 {len(symbols)}개",
+            {"symbols": len(symbols), "period": "5d", "interval": "1d"},
+            lambda: download(symbols),
+            lambda bars: {symbol: [closes.tolist(), volumes.tolist()] for symbol, (closes, volumes) in bars.items()},
+            lambda rows: {symbol: (np.array(closes, dtype="f8"), np.array(volumes, dtype="i8"))
+                          for symbol, (closes, volumes) in rows.items()})
+
+    return fetch
@@ -0,0 +1,192 @@
+import os
+import asyncio
+import weakref
+import threading
+import importlib.util
+from urllib.parse import urlsplit
+from typing import Dict, Any, Optional, Callable
+
+import httpx
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+# 호스트별 커넥션 풀 설정 (환경변수로 조정)
+POOL_MAX_CONNECTIONS = _env_int("HTTP_POOL_MAX_CONNECTIONS", 20)
+POOL_MAX_KEEPALIVE = _env_int("HTTP_POOL_MAX_KEEPALIVE", 10)
+POOL_KEEPALIVE_EXPIRY = _env_float("HTTP_POOL_KEEPALIVE_EXPIRY", 30.0)
+
+# h2 패키지가 있을 때만 HTTP/2 사용 (HTTP_ENABLE_HTTP2=0 으로 끌 수 있음)
+HTTP2_ENABLED = os.getenv("HTTP_ENABLE_HTTP2", "1") != "0" and importlib.util.find_spec("h2") is not None
+
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+
+_DEFAULT_ORIGIN = "*"
+
+
+def _origin(url: Optional[str]) -> str:
+    """scheme://host[:port] (풀 구분 키)"""
+    if not url:
+        return _DEFAULT_ORIGIN
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def pool_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=POOL_MAX_KEEPALIVE,
+        keepalive_expiry=POOL_KEEPALIVE_EXPIRY,
+    )
+
+
+class PoolStats:
+    """호스트별 요청 수, 커넥션 재사용(hit)/신규 연결(miss) 카운터"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def record(self, origin: str, reused: bool):
+        with self._lock:
+            counters = self._counters.setdefault(origin, {"requests": 0, "hits": 0, "misses": 0})
+            counters["requests"] += 1
+            counters["hits" if reused else "misses"] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                origin: dict(counters, hit_rate=counters["hits"] / counters["requests"])
+                for origin, counters in self._counters.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+
+
+_pool_stats = PoolStats()
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """호스트별 커넥션 풀 hit/miss 현황"""
+    return _pool_stats.snapshot()
+
+
+def _sync_event_hooks() -> Dict[str, list]:
+    """요청마다 trace 확장을 달아 새 TCP 연결 여부를 기록"""
+    def on_request(request: httpx.Request):
+        state = {"connected": False}
+
+        def trace(event: str, info: dict):
+            if event == "connection.connect_tcp.started":
+                state["connected"] = True
+
+        request.extensions["trace"] = trace
+        request.extensions["pool_state"] = state
+
+    def on_response(response: httpx.Response):
+        state = response.request.extensions.get("pool_state")
+        if state is not None:
+            _pool_stats.record(_origin(str(response.request.url)), reused=not state["connected"])
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+def _async_event_hooks() -> Dict[str, list]:
+    """_sync_event_hooks 의 비동기 클라이언트 버전"""
+    async def on_request(request: httpx.Request):
+        state = {"connected": False}
+
+        async def trace(event: str, info: dict):
+            if event == "connection.connect_tcp.started":
+                state["connected"] = True
+
+        request.extensions["trace"] = trace
+        request.extensions["pool_state"] = state
+
+    async def on_response(response: httpx.Response):
+        state = response.request.extensions.get("pool_state")
+        if state is not None:
+            _pool_stats.record(_origin(str(response.request.url)), reused=not state["connected"])
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+_clients: Dict[str, httpx.Client] = {}
+_clients_lock = threading.Lock()
+
+# 전송 계층 교체 (녹화/재생 등, utils.http_cassette.use_cassettes 가 설정) - 인자는 비동기 여부
+_transport_factory: Optional[Callable[[bool], Any]] = None
+
+
+def set_transport_factory(factory: Optional[Callable[[bool], Any]]):
+    """이후 만드는 공유 클라이언트의 transport 생성 함수 지정 (None 이면 기본 커넥션 풀)
+
+    이미 만든 동기 클라이언트는 닫고, 비동기 클라이언트는 루프에 묶여 있어 참조만 버린다.
+    """
+    global _transport_factory
+    _transport_factory = factory
+    close_http_clients()
+    _async_clients.clear()
+
+
+def _transport(is_async: bool):
+    return _transport_factory(is_async) if _transport_factory is not None else None
+
+
+def get_http_client(url: Optional[str] = None) -> httpx.Client:
+    """url 의 호스트 전용 keep-alive 클라이언트 반환 (프로세스 전역 공유, 스레드 안전)"""
+    origin = _origin(url)
+    client = _clients.get(origin)
+    if client is not None and not client.is_closed:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(origin)
+        if client is None or client.is_closed:
+            client = httpx.Client(timeout=DEFAULT_TIMEOUT, limits=pool_limits(), http2=HTTP2_ENABLED,
+                                  event_hooks=_sync_event_hooks(), transport=_transport(False))
+            _clients[origin] = client
+        return client
+
+
+def close_http_clients():
+    """공유 동기 클라이언트 모두 종료"""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+
+# 이벤트 루프별 공유 AsyncClient (클라이언트의 커넥션은 생성한 루프에 묶여 있음)
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = \
+    weakref.WeakKeyDictionary()
+
+
+def get_async_client(url: Optional[str] = None) -> httpx.AsyncClient:
+    """현재 이벤트 루프에서 url 호스트 전용으로 공유하는 httpx.AsyncClient 반환"""
+    loop = asyncio.get_running_loop()
+    clients = _async_clients.setdefault(loop, {})
+    origin = _origin(url)
+    client = clients.get(origin)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(timeout=DEFAULT_TIMEOUT, limits=pool_limits(), http2=HTTP2_ENABLED,
+                                   event_hooks=_async_event_hooks(), transport=_transport(True))
+        clients[origin] = client
+    return client
+
+
+async def close_async_client():
+    """현재 이벤트 루프의 공유 클라이언트 종료 (서비스/배치 종료 시 호출)"""
+    clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
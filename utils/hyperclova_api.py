@@ -1,14 +1,23 @@
 import os
 import json
+import time
 import uuid
-import requests
+import logging
 from dotenv import load_dotenv
+from typing import Iterator
+from utils.http_client import get_http_client, get_async_client
+from utils.sse import iter_sse_events, iter_clova_tokens
+from utils.circuit_breaker import get_circuit_breaker
+from utils.rate_limiter import get_rate_limiter
+from utils.tracing import span
+
+logger = logging.getLogger("HyperCLOVA")
 
 load_dotenv()
 CLOVA_API_KEY = os.getenv("CLOVA_API_KEY")
 CLOVA_API_URL = "https://clovastudio.stream.ntruss.com/testapp/v1/chat-completions/HCX-003"
 
-def generate_answer(prompt: str) -> str:
+def _build_request(prompt: str):
     headers = {
         "Content-Type": "application/json",
         "Authorization": f"Bearer {CLOVA_API_KEY}",
@@ -24,16 +33,81 @@ def generate_answer(prompt: str) -> str:
         "temperature": 0.2,
         "max_tokens": 800
     }
+    return headers, body
+
+def _answer_content(res) -> str:
+    logger.debug("응답코드: %s", res.status_code)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("응답본문: %s", res.text)
+    res.raise_for_status()
+
+    response_json = res.json()
+    return response_json["result"]["message"]["content"]
+
+def generate_answer(prompt: str) -> str:
+    headers, body = _build_request(prompt)
+
+    try:
+        # 차단 중이면 CircuitOpenError 로 바로 실패 응답 (타임아웃은 LLM_TIMEOUT 과 요청 마감 중 짧은 쪽)
+        # 분당 호출 한도는 차단기를 통과한 뒤에만 소모
+        with span("upstream", service="hyperclova"):
+            return get_circuit_breaker("hyperclova").call(lambda timeout: _answer_content(
+                get_http_client(CLOVA_API_URL).post(CLOVA_API_URL, headers=headers, content=json.dumps(body), timeout=timeout)),
+                acquire=get_rate_limiter("hyperclova").acquire)
+
+    except Exception as e:
+        logger.warning("API 호출 실패: %s", e)
+        return "API 호출 중 오류 발생"
+
+async def generate_answer_async(prompt: str) -> str:
+    """generate_answer 의 비동기 버전 (공유 AsyncClient 사용)"""
+    headers, body = _build_request(prompt)
+
+    async def post(timeout: float) -> str:
+        res = await get_async_client(CLOVA_API_URL).post(CLOVA_API_URL, headers=headers, content=json.dumps(body), timeout=timeout)
+        return _answer_content(res)
+
+    try:
+        with span("upstream", service="hyperclova"):
+            return await get_circuit_breaker("hyperclova").call_async(post, acquire=get_rate_limiter("hyperclova").acquire_async)
+
+    except Exception as e:
+        logger.warning("API 호출 실패: %s", e)
+        return "API 호출 중 오류 발생"
+
+def generate_answer_stream(prompt: str, url: str = CLOVA_API_URL) -> Iterator[str]:
+    """generate_answer 의 스트리밍 버전 (토큰이 도착하는 대로 내보냄)"""
+    headers, body = _build_request(prompt)
+    headers["Accept"] = "text/event-stream"
 
+    breaker = get_circuit_breaker("hyperclova")
+    sent = False
     try:
-        res = requests.post(CLOVA_API_URL, headers=headers, data=json.dumps(body))
-        print(f"[DEBUG] 응답코드: {res.status_code}")
-        print(f"[DEBUG] 응답본문: {res.text}")
-        res.raise_for_status()
-        
-        response_json = res.json()
-        return response_json["result"]["message"]["content"]
+        timeout = breaker.admit(get_rate_limiter("hyperclova").acquire)
+        started = time.monotonic()
+        recorded = False
+        try:
+            with get_http_client(url).stream("POST", url, headers=headers, content=json.dumps(body), timeout=timeout) as res:
+                logger.debug("응답코드: %s", res.status_code)
+                res.raise_for_status()
+                for token in iter_clova_tokens(iter_sse_events(res.iter_lines())):
+                    if not recorded:
+                        # 스트림은 답변 길이만큼 길어지므로 첫 토큰까지의 지연으로 판단
+                        breaker.record(time.monotonic() - started, True)
+                        recorded = True
+                    sent = True
+                    yield token
+        except Exception:
+            if not recorded:
+                breaker.record(time.monotonic() - started, False)
+                recorded = True
+            raise
+        finally:
+            if not recorded:
+                breaker.record(time.monotonic() - started, True)
 
     except Exception as e:
-        print(f"API 호출 실패: {e}")
-        return "API 호출 중 오류 발생"
\ No newline at end of file
+        logger.warning("API 호출 실패: %s", e)
+        # 이미 답변 일부를 보냈으면 오류 문구를 이어 붙이지 않고 여기서 끝냄
+        if not sent:
+            yield "API 호출 중 오류 발생"
@@ -0,0 +1,137 @@
+import os
+import csv
+import heapq
+from typing import Dict, Any, Optional, List, Iterable, Set
+
+KIND_CSV_FILE = "KIND_corp_list.csv"
+
+# 검색 대상 필드 (앞에 있을수록 순위가 높음)
+SEARCH_FIELDS = ("회사명", "주요제품", "업종")
+
+_MAX_GRAM = 3
+
+
+def _normalize(text: str) -> str:
+    return (text or "").strip().lower()
+
+
+def _grams(text: str, size: int) -> Set[str]:
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class KindSearchIndex:
+    """KIND 상장법인 목록의 문자 n-gram(1~3) 역색인
+
+    회사명/주요제품/업종에 대한 부분 문자열 검색과 여러 단어 AND 검색을 지원한다.
+    검색은 행 번호만 다루고, 레코드 dict 는 상위 N 건에 대해서만 만든다.
+    """
+
+    def __init__(self, columns: Dict[str, List[str]], fields: Iterable[str] = SEARCH_FIELDS):
+        self.columns = columns
+        self.fields = [field for field in fields if field in columns]
+        self.size = len(next(iter(columns.values()))) if columns else 0
+
+        # field → 정규화된 텍스트 목록, field → {gram: {row_id, ...}}
+        self._texts: Dict[str, List[str]] = {}
+        self._postings: Dict[str, Dict[str, Set[int]]] = {}
+
+        for field in self.fields:
+            texts = [_normalize(value) for value in columns[field]]
+            postings: Dict[str, Set[int]] = {}
+            for row_id, text in enumerate(texts):
+                for size in range(1, _MAX_GRAM + 1):
+                    for gram in _grams(text, size):
+                        postings.setdefault(gram, set()).add(row_id)
+            self._texts[field] = texts
+            self._postings[field] = postings
+
+    @classmethod
+    def from_csv(cls, path: str = KIND_CSV_FILE) -> "KindSearchIndex":
+        """KIND CSV 파일로 색인 생성"""
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"KIND CSV 파일이 없습니다: {path}")
+
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            reader = csv.reader(f)
+            header = [name.strip() for name in next(reader)]
+            columns: Dict[str, List[str]] = {name: [] for name in header}
+            for row in reader:
+                for name, value in zip(header, row):
+                    columns[name].append(value)
+        return cls(columns)
+
+    @classmethod
+    def from_dataframe(cls, df) -> "KindSearchIndex":
+        """KINDDataAgent.corp_df 같은 DataFrame 으로 색인 생성"""
+        return cls({str(col).strip(): df[col].fillna("").astype(str).tolist() for col in df.columns})
+
+    def _match_term(self, term: str, field: str) -> Set[int]:
+        """한 필드에서 term 을 부분 문자열로 포함하는 행 번호"""
+        postings = self._postings[field]
+        if len(term) <= _MAX_GRAM:
+            # n-gram 자체가 term 이므로 검증 불필요
+            return postings.get(term, set())
+
+        grams = sorted((postings.get(gram, set()) for gram in _grams(term, _MAX_GRAM)), key=len)
+        if not grams[0]:
+            return set()
+        candidates = grams[0].intersection(*grams[1:])
+        texts = self._texts[field]
+        return {row_id for row_id in candidates if term in texts[row_id]}
+
+    def search_ids(self, query: str, fields: Optional[Iterable[str]] = None,
+                   limit: Optional[int] = None) -> List[int]:
+        """공백으로 나눈 모든 단어를 포함하는 행 번호 (순위순)"""
+        terms = [_normalize(term) for term in query.split()]
+        terms = [term for term in terms if term]
+        if not terms:
+            return []
+        search_fields = [field for field in (fields or self.fields) if field in self._postings]
+
+        matched: Optional[Set[int]] = None
+        for term in terms:
+            term_rows: Set[int] = set()
+            for field in search_fields:
+                term_rows |= self._match_term(term, field)
+            matched = term_rows if matched is None else matched & term_rows
+            if not matched:
+                return []
+
+        scored = ((self._rank(row_id, terms, search_fields), row_id) for row_id in matched)
+        if limit is None:
+            return [row_id for _, row_id in sorted(scored)]
+        return [row_id for _, row_id in heapq.nsmallest(limit, scored)]
+
+    def _rank(self, row_id: int, terms: List[str], fields: List[str]) -> tuple:
+        """정렬 키: 회사명 완전일치 → 회사명 시작 → 회사명 포함 → 주요제품 → 업종"""
+        if "회사명" in self._texts:
+            name = self._texts["회사명"][row_id]
+            joined = " ".join(terms)
+            if name == joined:
+                return (0,)
+            if name.startswith(terms[0]):
+                return (1,)
+        for position, field in enumerate(fields):
+            text = self._texts[field][row_id]
+            if all(term in text for term in terms):
+                return (2 + position,)
+        return (2 + len(fields),)
+
+    def record(self, row_id: int) -> Dict[str, Any]:
+        """행 번호의 레코드 (원본 값)"""
+        return {name: values[row_id] for name, values in self.columns.items()}
+
+    def search(self, query: str, limit: int = 10, fields: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """상위 limit 건의 레코드만 만들어 반환"""
+        return [self.record(row_id) for row_id in self.search_ids(query, fields, limit)]
+
+
+_default_index: Optional[KindSearchIndex] = None
+
+
+def get_kind_index() -> KindSearchIndex:
+    """프로세스 전역에서 공유하는 KIND 색인 (최초 호출 시 한 번만 생성)"""
+    global _default_index
+    if _default_index is None:
+        _default_index = KindSearchIndex.from_csv()
+    return _default_index
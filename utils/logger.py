@@ -1,8 +1,193 @@
+import os
+import sys
+import json
+import queue
+import atexit
+import random
+import zlib
 import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, List
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-)
+LOG_FILE = os.getenv("LOG_FILE", "financial_agent.log")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# DEBUG 로그는 요청 단위로 이 비율만 남김 (같은 요청의 DEBUG 줄은 함께 남거나 함께 빠짐)
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0.1"))
+# 로그 큐가 가득 차면 (쓰기가 밀리면) 요청을 막지 않고 버림
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
 
-logger = logging.getLogger("agent-system")
\ No newline at end of file
+logger = logging.getLogger("agent-system")
+
+_request_id: contextvars.ContextVar = contextvars.ContextVar("log_request_id", default=None)
+
+
+def current_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+@contextmanager
+def request_context(request_id: Optional[str]):
+    """이 블록(과 여기서 만든 asyncio 태스크, to_thread 호출) 안의 로그에 request_id 를 붙임"""
+    token = _request_id.set(None if request_id is None else str(request_id))
+    try:
+        yield
+    finally:
+        _request_id.reset(token)
+
+
+def set_request_id(request_id: Optional[str]):
+    """현재 컨텍스트(태스크)의 request_id 설정"""
+    _request_id.set(None if request_id is None else str(request_id))
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄에 JSON 객체 하나 (ts, level, logger, agent, request_id, message[, exc])"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "agent": getattr(record, "agent", None),
+            "request_id": getattr(record, "request_id", None),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """콘솔용 사람이 읽는 형식 ([에이전트] 메시지)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        agent = getattr(record, "agent", None)
+        message = record.getMessage()
+        if agent:
+            message = f"[{agent}] {message}"
+        if record.levelno >= logging.ERROR:
+            message = f"{message} ({record.levelname})"
+        if record.exc_info:
+            message = f"{message}\n{self.formatException(record.exc_info)}"
+        return message
+
+
+class DebugSampler(logging.Filter):
+    """DEBUG 로그를 sample_rate 비율만 통과 (request_id 가 있으면 요청 단위로 결정)"""
+
+    def __init__(self, sample_rate: float = LOG_DEBUG_SAMPLE_RATE):
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.sample_rate >= 1:
+            return True
+        # 필터는 호출한 스레드에서 실행되므로 컨텍스트의 request_id 를 바로 읽을 수 있음
+        request_id = getattr(record, "request_id", None) or _request_id.get()
+        if request_id is None:
+            return random.random() < self.sample_rate
+        return zlib.crc32(request_id.encode("utf-8")) % 10000 < self.sample_rate * 10000
+
+
+class AsyncQueueHandler(QueueHandler):
+    """호출한 스레드에서는 request_id 만 붙여 큐에 넣고, 메시지 포맷과 파일/콘솔 쓰기는 리스너 스레드에서
+
+    표준 QueueHandler.prepare 는 호출 스레드에서 메시지를 포맷하므로 재정의해 포맷을 미룬다.
+    큐가 가득 차면 기다리지 않고 버린 개수만 센다.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if not hasattr(record, "request_id"):
+            record.request_id = _request_id.get()
+        # 콘솔 출력 여부는 기록한 시점 기준 (리스너가 처리할 때 스위치가 바뀌었어도)
+        record.console = _console_switch.enabled
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _ConsoleSwitch(logging.Filter):
+    def __init__(self, enabled: bool):
+        super().__init__()
+        self.enabled = enabled
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return getattr(record, "console", self.enabled)
+
+
+_lock = threading.Lock()
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[AsyncQueueHandler] = None
+_console_switch = _ConsoleSwitch(True)
+
+
+def setup_logging(log_file: Optional[str] = LOG_FILE, level: str = LOG_LEVEL, console: bool = True,
+                  debug_sample_rate: float = LOG_DEBUG_SAMPLE_RATE,
+                  extra_handlers: Optional[List[logging.Handler]] = None) -> AsyncQueueHandler:
+    """루트 로거를 큐 기반 비동기 파이프라인으로 설정 (다시 호출하면 이전 설정을 정리하고 교체)
+
+    log_file 에는 JSON 줄로, console 이 켜져 있으면 표준 에러로 사람이 읽는 형식을 쓴다.
+    """
+    global _listener, _queue_handler
+
+    handlers: List[logging.Handler] = []
+    if log_file:
+        file_handler = logging.FileHandler(log_file, encoding="utf-8")
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+    console_handler = logging.StreamHandler(sys.stderr)
+    console_handler.setFormatter(ConsoleFormatter())
+    console_handler.addFilter(_console_switch)
+    handlers.append(console_handler)
+    handlers.extend(extra_handlers or [])
+
+    with _lock:
+        _shutdown()
+        _console_switch.enabled = console
+        root = logging.getLogger()
+        root.setLevel(level)
+
+        _queue_handler = AsyncQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+        _queue_handler.addFilter(DebugSampler(debug_sample_rate))
+        root.addHandler(_queue_handler)
+        _listener = QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        return _queue_handler
+
+
+def set_console_echo(enabled: bool):
+    """콘솔 출력 켜기/끄기 (서비스/배치 모드에서는 끄고 파일에만 남김)"""
+    _console_switch.enabled = enabled
+
+
+def _shutdown():
+    global _listener, _queue_handler
+    if _listener is not None:
+        _listener.stop()  # 큐에 남은 로그를 모두 쓰고 멈춤
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+
+
+def shutdown_logging():
+    """남은 로그를 모두 쓰고 리스너 스레드 종료"""
+    with _lock:
+        _shutdown()
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,220 @@
+import os
+import json
+import tempfile
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, Optional, List, Tuple, Callable
+
+import numpy as np
+
+from utils.tracing import span
+from utils.http_cassette import cassette_fetcher
+
+PRICE_STORE_DIR = os.getenv("PRICE_STORE_DIR", "price_store")
+PRICE_STORE_OFFLINE = os.getenv("PRICE_STORE_OFFLINE", "0") == "1"
+
+# 종목당 한 파일: 날짜(yyyymmdd) 순으로 정렬된 OHLCV 레코드 (np.load(mmap_mode="r") 로 읽음)
+OHLCV_DTYPE = np.dtype([
+    ("date", "<i4"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<i8"),
+])
+
+# 질의의 가격 종류 → 컬럼
+PRICE_FIELDS = {"시가": "open", "종가": "close", "고가": "high", "저가": "low", "거래량": "volume"}
+
+Fetcher = Callable[[str, date, date], np.ndarray]
+
+
+def _to_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value), "%Y-%m-%d").date()
+
+
+def _date_key(day: date) -> int:
+    return day.year * 10000 + day.month * 100 + day.day
+
+
+def _key_to_iso(key: int) -> str:
+    return f"{key // 10000:04d}-{key // 100 % 100:02d}-{key % 100:02d}"
+
+
+def missing_ranges(coverage: List[Tuple[date, date]], start: date, end: date) -> List[Tuple[date, date]]:
+    """[start, end] 중 이미 받아 둔 구간(coverage)에 없는 날짜 구간"""
+    gaps = []
+    cursor = start
+    for covered_start, covered_end in sorted(coverage):
+        if covered_end < cursor:
+            continue
+        if covered_start > end:
+            break
+        if covered_start > cursor:
+            gaps.append((cursor, covered_start - timedelta(days=1)))
+        cursor = max(cursor, covered_end + timedelta(days=1))
+        if cursor > end:
+            return gaps
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def merge_ranges(ranges: List[Tuple[date, date]]) -> List[Tuple[date, date]]:
+    """겹치거나 맞닿은 구간 병합"""
+    merged: List[Tuple[date, date]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def yfinance_fetcher(ticker: str, start: date, end: date) -> np.ndarray:
+    """yfinance 에서 [start, end] 일봉을 받아 OHLCV 레코드로 변환"""
+    import yfinance as yf
+
+    df = yf.download(ticker, start=start.isoformat(), end=(end + timedelta(days=1)).isoformat(),
+                     progress=False, auto_adjust=False)
+    if df is None or df.empty:
+        return np.empty(0, dtype=OHLCV_DTYPE)
+    if getattr(df.columns, "nlevels", 1) > 1:
+        df = df.xs(ticker, axis=1, level=-1) if ticker in df.columns.get_level_values(-1) else df.droplevel(-1, axis=1)
+
+    rows = np.empty(len(df), dtype=OHLCV_DTYPE)
+    rows["date"] = [_date_key(index.date()) for index in df.index]
+    for column, name in (("open", "Open"), ("high", "High"), ("low", "Low"), ("close", "Close")):
+        rows[column] = df[name].to_numpy(dtype="f8")
+    rows["volume"] = df["Volume"].fillna(0).to_numpy(dtype="i8")
+    return rows
+
+
+class PriceStore:
+    """종목별 일봉 로컬 저장소
+
+    요청 구간 중 받아 두지 않은 날짜만 upstream(fetcher)에서 가져와 합치고,
+    받아 둔 구간은 휴장일까지 포함해 coverage 사이드카에 기록해 다시 요청하지 않는다.
+    offline 이면 upstream 을 호출하지 않고 디스크에 있는 데이터만 사용한다.
+    """
+
+    def __init__(self, root: str = PRICE_STORE_DIR, fetcher: Optional[Fetcher] = None,
+                 offline: bool = PRICE_STORE_OFFLINE):
+        self.root = root
+        self.fetcher = fetcher or yfinance_fetcher
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._arrays: Dict[str, np.ndarray] = {}
+        self.upstream_calls = 0
+
+    def _path(self, ticker: str, suffix: str) -> str:
+        return os.path.join(self.root, ticker.replace("/", "_") + suffix)
+
+    def _load(self, ticker: str) -> np.ndarray:
+        if ticker not in self._arrays:
+            path = self._path(ticker, ".npy")
+            self._arrays[ticker] = (np.load(path, mmap_mode="r") if os.path.exists(path)
+                                    else np.empty(0, dtype=OHLCV_DTYPE))
+        return self._arrays[ticker]
+
+    def coverage(self, ticker: str) -> List[Tuple[date, date]]:
+        """받아 둔 날짜 구간 목록"""
+        path = self._path(ticker, ".coverage.json")
+        if not os.path.exists(path):
+            return []
+        with open(path, encoding="utf-8") as f:
+            return [(_to_date(start), _to_date(end)) for start, end in json.load(f)]
+
+    def _replace(self, path: str, mode: str, write: Callable[[Any], None], **open_kwargs):
+        """같은 디렉터리의 고유한 임시 파일에 쓰고 교체 (같은 저장소를 쓰는 다른 프로세스와 임시 파일이 겹치지 않음)"""
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=self.root)
+        try:
+            with os.fdopen(fd, mode, **open_kwargs) as f:
+                write(f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _save(self, ticker: str, rows: np.ndarray, coverage: List[Tuple[date, date]]):
+        os.makedirs(self.root, exist_ok=True)
+        self._arrays.pop(ticker, None)  # 교체 전에 기존 mmap 해제
+        self._replace(self._path(ticker, ".npy"), "wb", lambda f: np.save(f, rows))
+        self._replace(self._path(ticker, ".coverage.json"), "w",
+                      lambda f: json.dump([[start.isoformat(), end.isoformat()] for start, end in coverage], f),
+                      encoding="utf-8")
+
+    def ensure(self, ticker: str, start, end) -> int:
+        """[start, end] 중 빠진 구간만 받아 저장 (받아 온 레코드 수 반환)"""
+        start, end = _to_date(start), _to_date(end)
+        if self.offline:
+            return 0
+
+        with self._lock:
+            coverage = self.coverage(ticker)
+            gaps = missing_ranges(coverage, start, end)
+            if not gaps:
+                return 0
+
+            with span("upstream", service="yfinance"):
+                fetched = [self.fetcher(ticker, gap_start, gap_end) for gap_start, gap_end in gaps]
+            self.upstream_calls += len(gaps)
+            new_rows = np.concatenate(fetched) if fetched else np.empty(0, dtype=OHLCV_DTYPE)
+
+            # 기존 레코드와 합치고 같은 날짜는 새로 받은 값 사용
+            rows = np.concatenate([new_rows, np.asarray(self._load(ticker))])
+            _, unique = np.unique(rows["date"], return_index=True)
+            rows = rows[unique]
+
+            # 오늘은 장중에 값이 바뀌므로 받은 구간으로 기록하지 않음
+            yesterday = date.today() - timedelta(days=1)
+            covered = [(gap_start, min(gap_end, yesterday)) for gap_start, gap_end in gaps if gap_start <= yesterday]
+            self._save(ticker, rows, merge_ranges(coverage + covered))
+            return len(new_rows)
+
+    def get_range(self, ticker: str, start, end) -> np.ndarray:
+        """[start, end] 일봉 (빠진 구간은 먼저 받아 옴)"""
+        start, end = _to_date(start), _to_date(end)
+        self.ensure(ticker, start, end)
+        rows = self._load(ticker)
+        dates = rows["date"]
+        low = np.searchsorted(dates, _date_key(start), side="left")
+        high = np.searchsorted(dates, _date_key(end), side="right")
+        return rows[low:high]
+
+    def get_price(self, ticker: str, day) -> Optional[Dict[str, Any]]:
+        """하루치 시가/종가/고가/저가/거래량 (YFinanceDataAgent.fetch_data 와 같은 형식, 휴장일은 None)"""
+        rows = self.get_range(ticker, day, day)
+        if len(rows) == 0:
+            return None
+        row = rows[0]
+        return {
+            "date": _key_to_iso(int(row["date"])),
+            "open": float(row["open"]),
+            "close": float(row["close"]),
+            "high": float(row["high"]),
+            "low": float(row["low"]),
+            "volume": int(row["volume"]),
+        }
+
+    def lookup(self, ticker: str, day, price_type: str = "종가") -> Optional[float]:
+        """'시가/종가/고가/저가/거래량' 중 하나의 값"""
+        price = self.get_price(ticker, day)
+        if price is None:
+            return None
+        return price[PRICE_FIELDS.get(price_type, price_type)]
+
+
+_default_store: Optional[PriceStore] = None
+
+
+def get_price_store() -> PriceStore:
+    """프로세스 전역에서 공유하는 가격 저장소"""
+    global _default_store
+    if _default_store is None:
+        _default_store = PriceStore(fetcher=cassette_fetcher(yfinance_fetcher))
+    return _default_store
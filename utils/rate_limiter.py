@@ -0,0 +1,307 @@
+import os
+import time
+import uuid
+import sqlite3
+import asyncio
+import threading
+import contextvars
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Optional, Tuple, Callable
+
+from utils.circuit_breaker import time_remaining
+
+RATE_LIMIT_FILE = os.getenv("RATE_LIMIT_FILE", "rate_limits.sqlite3")
+
+# OpenDART 는 하루 요청 수, HyperCLOVA 는 분당 요청 수 제한
+DART_DAILY_QUOTA = int(os.getenv("DART_DAILY_QUOTA", "20000"))
+HYPERCLOVA_PER_MINUTE = int(os.getenv("HYPERCLOVA_PER_MINUTE", "60"))
+
+# OpenDART 일일 한도는 한국 시간 자정에 초기화
+KST = timezone(timedelta(hours=9))
+
+# 우선순위: 대화형 요청이 배치보다 먼저
+INTERACTIVE = 0
+BATCH = 1
+
+# 배치 요청은 남은 토큰이 용량의 이 비율 아래면 쓰지 않음 (대화형 요청 몫으로 남겨둠)
+BATCH_RESERVE_RATIO = float(os.getenv("RATE_LIMIT_BATCH_RESERVE", "0.2"))
+# 토큰이 모자랄 때 기다리는 최대 시간 (넘으면 즉시 거절)
+MAX_WAIT = {INTERACTIVE: 10.0, BATCH: 60.0}
+# 대화형 요청이 토큰을 기다리는 동안 배치 요청이 다시 확인하는 간격
+PRIORITY_POLL_SECONDS = 0.05
+
+_priority: contextvars.ContextVar = contextvars.ContextVar("rate_limit_priority", default=INTERACTIVE)
+
+
+def current_priority() -> int:
+    return _priority.get()
+
+
+@contextmanager
+def priority(level: int):
+    """이 블록(과 여기서 만든 asyncio 태스크) 안의 호출 우선순위 지정"""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def set_priority(level: int):
+    """현재 컨텍스트의 우선순위 설정 (태스크 하나 전체에 적용할 때)"""
+    _priority.set(level)
+
+
+class RateLimitExceeded(Exception):
+    """할당량이 부족해 호출을 거절함"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} 호출 한도를 초과했습니다 ({retry_after:.1f}초 후 재시도)")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class SharedLimiter(ABC):
+    """SQLite 파일에 상태를 두어 여러 프로세스가 함께 쓰는 호출 한도 (공통 부분)
+
+    BEGIN IMMEDIATE 트랜잭션 안에서 확인 → 차감을 하므로 워커 프로세스가 몇 개든 합계가 한도를 넘지 않는다.
+    대화형 요청이 토큰을 기다리는 중이면 (다른 프로세스여도) 배치 요청은 토큰을 받지 못하고 기다린다.
+    """
+
+    def __init__(self, name: str, capacity: float, path: str = RATE_LIMIT_FILE,
+                 reserve_ratio: float = BATCH_RESERVE_RATIO, clock: Callable[[], float] = time.time):
+        self.name = name
+        self.capacity = float(capacity)
+        self.reserve_ratio = reserve_ratio
+        self.acquired = 0
+        self.rejected = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        # 호출마다 커밋하므로 WAL + synchronous=NORMAL 로 fsync 비용을 줄임
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS waiters (id TEXT PRIMARY KEY, name TEXT NOT NULL, expires REAL NOT NULL)")
+        self._init_schema()
+
+    @abstractmethod
+    def _init_schema(self):
+        """한도별 상태 테이블 생성"""
+        pass
+
+    @abstractmethod
+    def _take(self, tokens: float, reserve: float, now: float) -> Tuple[bool, float]:
+        """트랜잭션 안에서 토큰 차감 시도 → (성공 여부, 실패 시 다시 시도할 때까지 초)"""
+        pass
+
+    @abstractmethod
+    def _available(self, now: float) -> float:
+        """지금 남은 토큰 수"""
+        pass
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _interactive_waiting(self, now: float) -> bool:
+        return self._conn.execute("SELECT 1 FROM waiters WHERE name = ? AND expires > ? LIMIT 1",
+                                  (self.name, now)).fetchone() is not None
+
+    def try_acquire(self, tokens: float = 1, level: Optional[int] = None) -> Tuple[bool, float]:
+        """토큰을 바로 얻을 수 있으면 (True, 0), 아니면 (False, 다시 시도할 때까지 초)"""
+        level = current_priority() if level is None else level
+        reserve = self.capacity * self.reserve_ratio if level == BATCH else 0.0
+
+        with self._lock:
+            now = self._clock()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if level == BATCH and self._interactive_waiting(now):
+                    result = (False, PRIORITY_POLL_SECONDS)
+                else:
+                    result = self._take(tokens, reserve, now)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return result
+
+    def _set_waiter(self, waiter_id: str, expires: Optional[float]):
+        """대화형 대기 등록 (expires 까지, 프로세스가 죽어도 그 뒤엔 무시) / None 이면 해제"""
+        with self._lock:
+            if expires is None:
+                self._conn.execute("DELETE FROM waiters WHERE id = ?", (waiter_id,))
+            else:
+                self._conn.execute("INSERT OR REPLACE INTO waiters VALUES (?, ?, ?)", (waiter_id, self.name, expires))
+
+    @staticmethod
+    def _wait_until(level: int, max_wait: Optional[float]) -> float:
+        """대기 마감 시각 (우선순위별 MAX_WAIT 또는 max_wait, 요청 마감이 더 이르면 그쪽)"""
+        limit = MAX_WAIT.get(level, 0.0) if max_wait is None else max_wait
+        remaining = time_remaining()
+        if remaining is not None:
+            limit = min(limit, remaining)
+        return time.monotonic() + limit
+
+    def _deadline_check(self, wait: float, deadline: float):
+        if time.monotonic() + wait > deadline:
+            self.rejected += 1
+            raise RateLimitExceeded(self.name, wait)
+
+    def acquire(self, tokens: float = 1, max_wait: Optional[float] = None):
+        """토큰을 얻을 때까지 대기 (max_wait 안에 못 얻으면 RateLimitExceeded)"""
+        level = current_priority()
+        deadline = self._wait_until(level, max_wait)
+        waiter_id = None
+        try:
+            while True:
+                granted, wait = self.try_acquire(tokens, level)
+                if granted:
+                    self.acquired += 1
+                    return
+                self._deadline_check(wait, deadline)
+                if level == INTERACTIVE and waiter_id is None:
+                    waiter_id = uuid.uuid4().hex
+                    self._set_waiter(waiter_id, self._clock() + deadline - time.monotonic())
+                time.sleep(min(wait, 1.0))
+        finally:
+            if waiter_id is not None:
+                self._set_waiter(waiter_id, None)
+
+    async def acquire_async(self, tokens: float = 1, max_wait: Optional[float] = None):
+        """acquire 의 비동기 버전 (SQLite 접근은 스레드에서, 기다리는 동안 이벤트 루프를 막지 않음)"""
+        level = current_priority()
+        deadline = self._wait_until(level, max_wait)
+        waiter_id = None
+        try:
+            while True:
+                granted, wait = await asyncio.to_thread(self.try_acquire, tokens, level)
+                if granted:
+                    self.acquired += 1
+                    return
+                self._deadline_check(wait, deadline)
+                if level == INTERACTIVE and waiter_id is None:
+                    waiter_id = uuid.uuid4().hex
+                    await asyncio.to_thread(self._set_waiter, waiter_id, self._clock() + deadline - time.monotonic())
+                await asyncio.sleep(min(wait, 1.0))
+        finally:
+            if waiter_id is not None:
+                self._set_waiter(waiter_id, None)
+
+    def remaining(self) -> float:
+        """지금 남은 토큰 수 (모든 프로세스 합산)"""
+        with self._lock:
+            return self._available(self._clock())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "remaining": round(self.remaining(), 2),
+            "capacity": self.capacity,
+            "acquired": self.acquired,
+            "rejected": self.rejected,
+        }
+
+
+class TokenBucket(SharedLimiter):
+    """연속 충전 토큰 버킷 (분당 호출 수 같은 짧은 구간 한도)
+
+    토큰 수와 마지막 갱신 시각을 한 행에 저장하고 경과 시간만큼 충전한 뒤 차감한다.
+    """
+
+    def __init__(self, name: str, capacity: float, refill_per_second: float,
+                 path: str = RATE_LIMIT_FILE, reserve_ratio: float = BATCH_RESERVE_RATIO,
+                 clock: Callable[[], float] = time.time):
+        self.refill_per_second = float(refill_per_second)
+        super().__init__(name, capacity, path, reserve_ratio, clock)
+
+    def _init_schema(self):
+        self._conn.execute("CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)")
+        self._conn.execute("INSERT OR IGNORE INTO buckets VALUES (?, ?, ?)", (self.name, self.capacity, self._clock()))
+
+    def _refilled(self, tokens: float, updated: float, now: float) -> float:
+        return min(self.capacity, tokens + max(now - updated, 0.0) * self.refill_per_second)
+
+    def _take(self, tokens: float, reserve: float, now: float) -> Tuple[bool, float]:
+        available, updated = self._conn.execute(
+            "SELECT tokens, updated FROM buckets WHERE name = ?", (self.name,)).fetchone()
+        available = self._refilled(available, updated, now)
+        granted = available - tokens >= reserve
+        if granted:
+            available -= tokens
+        self._conn.execute("UPDATE buckets SET tokens = ?, updated = ? WHERE name = ?", (available, now, self.name))
+
+        if granted:
+            return True, 0.0
+        if self.refill_per_second <= 0:
+            return False, float("inf")
+        return False, (tokens + reserve - available) / self.refill_per_second
+
+    def _available(self, now: float) -> float:
+        available, updated = self._conn.execute(
+            "SELECT tokens, updated FROM buckets WHERE name = ?", (self.name,)).fetchone()
+        return self._refilled(available, updated, now)
+
+
+def _kst_day(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, KST).date().isoformat()
+
+
+def _seconds_to_kst_midnight(timestamp: float) -> float:
+    now = datetime.fromtimestamp(timestamp, KST)
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), KST)
+    return (midnight - now).total_seconds()
+
+
+class DailyQuota(SharedLimiter):
+    """한국 시간 하루 단위 호출 수 한도 (자정에 사용량 0 으로 초기화)
+
+    연속 충전 버킷은 가득 찬 상태에서 시작해 하루 동안 다시 채워지므로 하루에 한도의 약 두 배를 허용한다.
+    OpenDART 처럼 날짜별로 세는 한도는 이 카운터를 쓴다.
+    """
+
+    def _init_schema(self):
+        self._conn.execute("CREATE TABLE IF NOT EXISTS daily_quota (name TEXT PRIMARY KEY, day TEXT NOT NULL, used REAL NOT NULL)")
+        self._conn.execute("INSERT OR IGNORE INTO daily_quota VALUES (?, ?, 0)", (self.name, _kst_day(self._clock())))
+
+    def _used(self, now: float) -> float:
+        day, used = self._conn.execute("SELECT day, used FROM daily_quota WHERE name = ?", (self.name,)).fetchone()
+        return used if day == _kst_day(now) else 0.0
+
+    def _take(self, tokens: float, reserve: float, now: float) -> Tuple[bool, float]:
+        used = self._used(now)
+        if self.capacity - used - tokens < reserve:
+            return False, _seconds_to_kst_midnight(now)
+        self._conn.execute("UPDATE daily_quota SET day = ?, used = ? WHERE name = ?",
+                           (_kst_day(now), used + tokens, self.name))
+        return True, 0.0
+
+    def _available(self, now: float) -> float:
+        return self.capacity - self._used(now)
+
+
+# 이름 → 한도 생성 함수
+RATE_LIMITS: Dict[str, Callable[[], SharedLimiter]] = {
+    "dart": lambda: DailyQuota("dart", DART_DAILY_QUOTA),
+    "hyperclova": lambda: TokenBucket("hyperclova", HYPERCLOVA_PER_MINUTE, HYPERCLOVA_PER_MINUTE / 60),
+}
+
+
+_limiters: Dict[str, SharedLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str) -> SharedLimiter:
+    """RATE_LIMITS 설정으로 만든 프로세스 전역 호출 한도"""
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = _limiters[name] = RATE_LIMITS[name]()
+        return limiter
+
+
+def rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    """지금까지 사용한 버킷의 남은 할당량/획득/거절 수"""
+    with _limiters_lock:
+        return {name: limiter.stats() for name, limiter in _limiters.items()}
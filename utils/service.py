@@ -0,0 +1,317 @@
+import os
+import copy
+import json
+import time
+import uuid
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from typing import Dict, Any, Optional, Tuple, Union
+from urllib.parse import parse_qs
+
+from agents.orchestrator import new_context
+from utils.batch_runner import percentile
+from utils.circuit_breaker import deadline
+from utils.tracing import tracer
+from utils.logger import request_context
+
+logger = logging.getLogger("FinancialService")
+
+# 동시에 처리하는 질문 수, 그 뒤에 줄 세울 수 있는 질문 수 (넘으면 503 으로 거절)
+SERVICE_MAX_IN_FLIGHT = int(os.getenv("SERVICE_MAX_IN_FLIGHT", "32"))
+SERVICE_MAX_QUEUE = int(os.getenv("SERVICE_MAX_QUEUE", "64"))
+SERVICE_REQUEST_TIMEOUT = float(os.getenv("SERVICE_REQUEST_TIMEOUT", "30"))
+SESSION_TTL = float(os.getenv("SERVICE_SESSION_TTL", "1800"))
+MAX_SESSIONS = int(os.getenv("SERVICE_MAX_SESSIONS", "10000"))
+
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+KEEPALIVE_TIMEOUT = 15.0
+LATENCY_WINDOW = 1024
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable", 504: "Gateway Timeout"}
+
+
+class Session:
+    """세션 하나의 대화 컨텍스트 (같은 세션 질문은 순서대로 처리)"""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.context = new_context()
+        self.lock = asyncio.Lock()
+        self.last_seen = time.monotonic()
+
+
+class SessionStore:
+    """세션 id → Session (오래 안 쓴 세션은 TTL/개수 제한으로 정리)"""
+
+    def __init__(self, ttl: float = SESSION_TTL, max_sessions: int = MAX_SESSIONS):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, session_id: Optional[str] = None) -> Session:
+        """세션 조회 (없거나 만료됐으면 새로 생성, id 가 없으면 새 id 발급)"""
+        now = time.monotonic()
+        self.expire(now)
+
+        session_id = session_id or uuid.uuid4().hex
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = Session(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session_id)
+        session.last_seen = now
+        return session
+
+    def expire(self, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_seen <= self.ttl:
+                break
+            self._sessions.popitem(last=False)
+
+
+class Backpressure:
+    """동시 처리 수 제한 + 대기열 길이 제한 (대기열이 차면 즉시 거절)"""
+
+    def __init__(self, max_in_flight: int = SERVICE_MAX_IN_FLIGHT, max_queue: int = SERVICE_MAX_QUEUE):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self.in_flight = 0
+        self.waiting = 0
+
+    def saturated(self) -> bool:
+        return self.in_flight + self.waiting >= self.max_in_flight + self.max_queue
+
+    async def __aenter__(self):
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+
+class FinancialService:
+    """질문/헬스/메트릭 HTTP 엔드포인트
+
+    오케스트레이터(회사명 색인, 캐시, HTTP 풀 등 읽기 전용 자원)는 모든 요청이 공유하고
+    대화 컨텍스트만 세션별로 분리한다.
+
+    POST /query   {"query": "...", "session_id": "...", "request_id": "..."} → {"session_id", "request_id", "status", "response" | "message"}
+    GET  /health  상태와 처리 중/대기 중 요청 수
+    GET  /metrics 요청 수, 거절/오류 수, 지연 시간 백분위수, HTTP 풀 통계, 단계별 지연 히스토그램
+                  (?format=prometheus 이면 지연 히스토그램을 Prometheus 텍스트로)
+    """
+
+    def __init__(self, orchestrator=None, max_in_flight: int = SERVICE_MAX_IN_FLIGHT,
+                 max_queue: int = SERVICE_MAX_QUEUE, request_timeout: float = SERVICE_REQUEST_TIMEOUT,
+                 sessions: Optional[SessionStore] = None):
+        if orchestrator is None:
+            from agents.orchestrator import OrchestratorAgent
+            orchestrator = OrchestratorAgent()
+        self.orchestrator = orchestrator
+        self.backpressure = Backpressure(max_in_flight, max_queue)
+        self.request_timeout = request_timeout
+        self.sessions = sessions or SessionStore()
+        self.started_at = time.time()
+        self.counters = {"requests": 0, "queries": 0, "rejected": 0, "errors": 0, "timeouts": 0}
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def handle_query(self, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        query = payload.get("query")
+        if not isinstance(query, str) or not query.strip():
+            return 400, {"status": "error", "message": "query 필드가 필요합니다."}
+
+        if self.backpressure.saturated():
+            self.counters["rejected"] += 1
+            return 503, {"status": "error", "message": "요청이 많아 잠시 후 다시 시도해주세요."}
+
+        session = self.sessions.get(payload.get("session_id"))
+        request_id = str(payload.get("request_id") or uuid.uuid4().hex[:16])
+        self.counters["queries"] += 1
+        start = time.perf_counter()
+        try:
+            # LLM 호출은 요청 마감까지 남은 시간 안에서만 기다림, 이 요청의 로그에는 request_id 를 붙임
+            async with self.backpressure, session.lock:
+                # 시간 초과로 코루틴을 취소해도 to_thread 작업은 계속 돌 수 있으므로 복사본에서 처리하고
+                # 끝난 요청의 컨텍스트만 세션에 반영 (늦게 끝난 작업은 버려진 복사본만 고침)
+                context = copy.deepcopy(session.context)
+                with deadline(self.request_timeout), request_context(request_id):
+                    result = await asyncio.wait_for(
+                        self.orchestrator.process_async({"query": query, "context": context}),
+                        self.request_timeout)
+                session.context = context
+        except asyncio.TimeoutError:
+            self.counters["timeouts"] += 1
+            return 504, {"session_id": session.session_id, "request_id": request_id, "status": "error",
+                         "message": "처리 시간이 초과되었습니다."}
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+        if result.get("status") != "success":
+            self.counters["errors"] += 1
+        return 200, {"session_id": session.session_id, "request_id": request_id, **result}
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            "status": "ok",
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "in_flight": self.backpressure.in_flight,
+            "waiting": self.backpressure.waiting,
+            "sessions": len(self.sessions),
+        }
+
+    def metrics(self) -> Dict[str, Any]:
+        from utils.http_client import pool_stats
+        from utils.single_flight import single_flight_stats
+        from utils.rate_limiter import rate_limit_stats
+        from utils.circuit_breaker import circuit_breaker_stats
+        from utils.http_cassette import cassette_stats
+
+        latencies = sorted(self.latencies)
+        return {
+            **self.counters,
+            "in_flight": self.backpressure.in_flight,
+            "waiting": self.backpressure.waiting,
+            "max_in_flight": self.backpressure.max_in_flight,
+            "max_queue": self.backpressure.max_queue,
+            "sessions": len(self.sessions),
+            "latency_ms": {f"p{p}": round(percentile(latencies, p) * 1000, 2) for p in (50, 95, 99)},
+            "http_pool": pool_stats(),
+            "single_flight": single_flight_stats(),
+            "rate_limits": rate_limit_stats(),
+            "circuit_breakers": circuit_breaker_stats(),
+            "latency_histograms": tracer.to_json(),
+            "cassettes": cassette_stats(),
+        }
+
+    async def route(self, method: str, path: str, body: bytes) -> Tuple[int, Union[Dict[str, Any], str]]:
+        path, _, query_string = path.partition("?")
+        if path == "/health":
+            return (200, self.health()) if method == "GET" else (405, {"status": "error", "message": "GET 만 지원합니다."})
+        if path == "/metrics":
+            if method != "GET":
+                return 405, {"status": "error", "message": "GET 만 지원합니다."}
+            if parse_qs(query_string).get("format") == ["prometheus"]:
+                return 200, tracer.to_prometheus()
+            return 200, self.metrics()
+        if path == "/query":
+            if method != "POST":
+                return 405, {"status": "error", "message": "POST 만 지원합니다."}
+            try:
+                payload = json.loads(body or b"{}")
+            except ValueError:
+                return 400, {"status": "error", "message": "JSON 본문이 필요합니다."}
+            if not isinstance(payload, dict):
+                return 400, {"status": "error", "message": "JSON 객체가 필요합니다."}
+            return await self.handle_query(payload)
+        return 404, {"status": "error", "message": f"없는 경로입니다: {path}"}
+
+    @staticmethod
+    def _write_response(writer: asyncio.StreamWriter, status: int, payload: Union[Dict[str, Any], str], keep_alive: bool):
+        if isinstance(payload, str):
+            body, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            body, content_type = json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8"
+        headers = [
+            f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if status == 503:
+            headers.append("Retry-After: 1")
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """HTTP/1.1 연결 하나 처리 (keep-alive 지원)"""
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    break
+                except asyncio.LimitOverrunError:
+                    self._write_response(writer, 413, {"status": "error", "message": "헤더가 너무 큽니다."}, False)
+                    break
+
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, path, version = lines[0].split(" ", 2)
+                except ValueError:
+                    self._write_response(writer, 400, {"status": "error", "message": "잘못된 요청입니다."}, False)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                raw_length = headers.get("content-length", "0") or "0"
+                # 숫자만 허용 (int() 가 받아 주는 부호, 밑줄, 공백 등도 거절)
+                length = int(raw_length) if raw_length.isascii() and raw_length.isdigit() else -1
+                if length < 0:
+                    # 본문 경계를 알 수 없으므로 응답 후 연결을 닫음
+                    self._write_response(writer, 400, {"status": "error", "message": "Content-Length 가 올바르지 않습니다."}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    self._write_response(writer, 413, {"status": "error", "message": "본문이 너무 큽니다."}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+                self.counters["requests"] += 1
+                try:
+                    status, payload = await self.route(method.upper(), path, body)
+                except Exception as e:
+                    logger.error("[FinancialService] 요청 처리 실패: %s", e)
+                    self.counters["errors"] += 1
+                    status, payload = 500, {"status": "error", "message": str(e)}
+
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8000) -> asyncio.AbstractServer:
+        self._server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_HEADER_BYTES)
+        return self._server
+
+    @property
+    def port(self) -> Optional[int]:
+        if self._server is None or not self._server.sockets:
+            return None
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8000):
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
@@ -0,0 +1,149 @@
+import json
+import asyncio
+import threading
+from typing import Dict, Any, Callable, Awaitable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    """진행 중인 업스트림 호출 하나 (스레드 대기자와 결과 공유)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _AsyncCall:
+    """진행 중인 비동기 업스트림 호출 하나 (별도 태스크와 그 결과를 기다리는 호출자 수)"""
+
+    def __init__(self):
+        self.task: "asyncio.Task" = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 호출을 하나의 업스트림 호출로 합침
+
+    먼저 들어온 호출이 실제로 실행하고, 끝나기 전에 같은 키로 들어온 호출은 그 결과(또는 예외)를
+    그대로 받는다. 완료된 결과는 보관하지 않으므로 캐시가 아니라 중복 호출 제거만 한다.
+    공유된 결과 객체는 여러 호출자가 같이 받으므로 수정하지 말 것.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[Hashable, _AsyncCall] = {}
+        self.calls = 0
+        self.executions = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """key 로 fn 실행 (같은 키가 실행 중이면 기다렸다가 그 결과 사용)"""
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self.shared += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """do 의 비동기 버전 (같은 이벤트 루프 안에서 합침)
+
+        fn 은 별도 태스크에서 실행되고 먼저 온 호출자를 포함한 모두가 shield 로 기다리므로,
+        어느 호출자가 취소돼도 나머지는 결과를 받는다. 기다리는 호출자가 하나도 남지 않으면 태스크를 취소한다.
+        """
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+        with self._lock:
+            self.calls += 1
+            call = self._async_calls.get(loop_key)
+            if call is not None:
+                self.shared += 1
+            else:
+                call = self._async_calls[loop_key] = _AsyncCall()
+                call.task = loop.create_task(self._run_async(loop_key, call, fn))
+                self.executions += 1
+            call.waiters += 1
+
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            with self._lock:
+                call.waiters -= 1
+                abandoned = call.waiters == 0 and not call.task.done()
+                if abandoned and self._async_calls.get(loop_key) is call:
+                    del self._async_calls[loop_key]
+            if abandoned:
+                call.task.cancel()
+
+    async def _run_async(self, loop_key: Hashable, call: _AsyncCall, fn: Callable[[], Awaitable[T]]) -> T:
+        """공유 태스크 본체 (끝나면 바로 합침 대상에서 뺌)"""
+        try:
+            return await fn()
+        finally:
+            with self._lock:
+                if self._async_calls.get(loop_key) is call:
+                    del self._async_calls[loop_key]
+
+    def stats(self) -> Dict[str, Any]:
+        """호출 수, 실제 업스트림 실행 수, 합쳐져 절약된 호출 수"""
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "saved": self.shared,
+            "in_flight": len(self._calls) + len(self._async_calls),
+        }
+
+
+_flights: Dict[str, SingleFlight] = {}
+_flights_lock = threading.Lock()
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """이름별로 프로세스 전역에서 공유하는 SingleFlight"""
+    with _flights_lock:
+        flight = _flights.get(name)
+        if flight is None:
+            flight = _flights[name] = SingleFlight(name)
+        return flight
+
+
+def single_flight_stats() -> Dict[str, Dict[str, Any]]:
+    """모든 SingleFlight 의 통계"""
+    with _flights_lock:
+        return {name: flight.stats() for name, flight in _flights.items()}
+
+
+def request_key(request: Dict[str, Any]) -> str:
+    """데이터 수집기 요청의 합침 키
+
+    주가 조회는 종목(종목코드 우선)+날짜+가격 타입만 보고, 나머지 유형은 요청 전체를 정규화해 쓴다.
+    """
+    parameters = request.get("parameters", {})
+    if request.get("type") == "stock_price":
+        symbol = parameters.get("stock_code") or parameters.get("ticker") or parameters.get("symbol")
+        return f"stock_price|{symbol}|{parameters.get('date') or ''}|{parameters.get('price_type') or 'current'}"
+    return json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
@@ -0,0 +1,62 @@
+import json
+from typing import Dict, Any, Iterable, Iterator, Optional
+
+
+class SSEError(Exception):
+    """스트림 중 서버가 error 이벤트를 보낸 경우"""
+
+
+def iter_sse_events(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """text/event-stream 줄 단위 입력을 {"event", "data", "id"} 이벤트로 변환
+
+    여러 줄 data 는 줄바꿈으로 잇고, 빈 줄에서 이벤트 하나를 내보낸다.
+    """
+    event: Optional[str] = None
+    event_id: Optional[str] = None
+    data = []
+
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line:
+            if data:
+                yield {"event": event or "message", "data": "\n".join(data), "id": event_id}
+            event, event_id, data = None, None, []
+            continue
+        if line.startswith(":"):
+            continue  # 주석(keep-alive)
+
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "event":
+            event = value
+        elif field == "data":
+            data.append(value)
+        elif field == "id":
+            event_id = value
+
+    if data:
+        yield {"event": event or "message", "data": "\n".join(data), "id": event_id}
+
+
+def iter_clova_tokens(events: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """HyperCLOVA chat-completions 스트림 이벤트에서 토큰 문자열만 추출
+
+    token 이벤트마다 message.content 조각을 내보내고, result 또는 [DONE] 신호에서 끝낸다.
+    """
+    for event in events:
+        name, data = event["event"], event["data"]
+        if data == "[DONE]":
+            return
+        if name == "error":
+            raise SSEError(data)
+        if name == "result":
+            return
+        if name == "signal":
+            if json.loads(data).get("data") == "[DONE]":
+                return
+            continue
+        if name in ("token", "message"):
+            content = json.loads(data).get("message", {}).get("content", "")
+            if content:
+                yield content
@@ -0,0 +1,82 @@
+import os
+import sys
+import json
+import subprocess
+import unicodedata
+from typing import Dict, Any, List, Optional, Tuple
+
+# (표시 이름, 모듈, 생성할 클래스/함수) — 생성 대상이 None 이면 import 만 측정
+STARTUP_TARGETS: List[Tuple[str, str, Optional[str]]] = [
+    ("main (REPL 시작)", "main", None),
+    ("OrchestratorAgent", "agents.orchestrator", "OrchestratorAgent"),
+    ("QueryUnderstander", "agents.interpreter.query_understander_agent", "QueryUnderstander"),
+    ("DataGathererAgent", "agents.datagatherer.DataGathererAgent", "DataGathererAgent"),
+    ("DARTDataAgent", "agents.datagatherer.dart_data_agent", "DARTDataAgent"),
+    ("KINDDataAgent", "agents.datagatherer.kind_data_agent", "KINDDataAgent"),
+    ("YFinanceDataAgent", "agents.datagatherer.yfinance_data_agent", "YFinanceDataAgent"),
+    ("ReasonerAgent", "agents.decisionmaker.reasoner_agent", "ReasonerAgent"),
+    ("SummarizerAgent", "agents.responder.summarizer_agent", "SummarizerAgent"),
+    ("회사명 인식기", "utils.corp_resolver", "get_company_resolver"),
+    ("KIND 검색 색인", "utils.kind_index", "get_kind_index"),
+    ("DART corp code 인덱스", "utils.corp_code_index", "load_corp_code_index"),
+]
+
+# 새 인터프리터에서 import/생성 시간을 재서 JSON 한 줄로 출력하는 측정 스크립트
+_PROBE = """
+import sys, json, time, importlib
+sys.path.insert(0, {root!r})
+module_name, target = {module!r}, {target!r}
+result = {{"import_ms": None, "init_ms": None, "error": None}}
+try:
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    result["import_ms"] = (time.perf_counter() - start) * 1000
+    if target:
+        start = time.perf_counter()
+        getattr(module, target)()
+        result["init_ms"] = (time.perf_counter() - start) * 1000
+except BaseException as e:
+    result["error"] = f"{{type(e).__name__}}: {{e}}"
+print("__STARTUP__" + json.dumps(result))
+"""
+
+
+def profile_target(module: str, target: Optional[str], root: str) -> Dict[str, Any]:
+    """별도 프로세스에서 한 에이전트의 import/초기화 시간 측정 (다른 모듈 캐시 영향 제거)"""
+    script = _PROBE.format(root=root, module=module, target=target)
+    completed = subprocess.run([sys.executable, "-c", script], cwd=root,
+                               capture_output=True, text=True, timeout=120)
+    for line in completed.stdout.splitlines():
+        if line.startswith("__STARTUP__"):
+            return json.loads(line[len("__STARTUP__"):])
+    return {"import_ms": None, "init_ms": None,
+            "error": (completed.stderr.strip().splitlines() or ["측정 실패"])[-1]}
+
+
+def profile_startup(root: Optional[str] = None,
+                    targets: List[Tuple[str, str, Optional[str]]] = STARTUP_TARGETS) -> List[Dict[str, Any]]:
+    """에이전트별 시작 비용 측정 결과 목록"""
+    root = root or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = []
+    for label, module, target in targets:
+        measured = profile_target(module, target, root)
+        results.append(dict(measured, label=label, module=module))
+    return results
+
+
+def _pad(text: str, width: int) -> str:
+    """한글(전각) 문자를 2칸으로 계산해 왼쪽 정렬"""
+    display = sum(2 if unicodedata.east_asian_width(ch) in ("W", "F") else 1 for ch in text)
+    return text + " " * max(width - display, 0)
+
+
+def format_startup_report(results: List[Dict[str, Any]]) -> str:
+    """측정 결과를 표 형태 문자열로 변환"""
+    def ms(value):
+        return f"{value:9.1f}" if value is not None else f"{'-':>9}"
+
+    lines = [f"{_pad('에이전트', 24)}{'import(ms)':>11}{'init(ms)':>11}  비고", "-" * 60]
+    for result in results:
+        note = result["error"] or ""
+        lines.append(f"{_pad(result['label'], 24)}{ms(result['import_ms']):>11}{ms(result['init_ms']):>11}  {note}")
+    return "\n".join(lines)
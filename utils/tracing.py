@@ -0,0 +1,182 @@
+import time
+import inspect
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, List, Tuple, Callable
+
+# 2의 거듭제곱 구간마다 2^(SUB_BUCKET_BITS-1) 개 하위 구간 → 상대 오차 약 3%
+SUB_BUCKET_BITS = 5
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+_HALF = _SUB_BUCKETS >> 1
+
+EXPORT_QUANTILES = (0.5, 0.9, 0.99)
+METRIC_PREFIX = "finance_agent"
+
+
+def _bucket_index(value: int) -> int:
+    if value < _SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return _SUB_BUCKETS + (shift - 1) * _HALF + (value >> shift) - _HALF
+
+
+def _bucket_upper(index: int) -> int:
+    if index < _SUB_BUCKETS:
+        return index
+    shift, offset = divmod(index - _SUB_BUCKETS, _HALF)
+    shift += 1
+    return ((offset + _HALF + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """HDR 방식(로그 구간 + 선형 하위 구간) 지연 시간 히스토그램
+
+    마이크로초 단위로 기록하며 메모리는 값의 범위(자릿수)에만 비례한다.
+    백분위수는 해당 구간의 상한값(관측 최댓값 이하)으로 보고한다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        micros = max(int(seconds * 1_000_000), 0)
+        index = _bucket_index(micros)
+        with self._lock:
+            self._counts[index] = self._counts.get(index, 0) + 1
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+
+    def percentile(self, p: float) -> float:
+        """p(0~100) 백분위수 (초)"""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            target = max(int(self.count * p / 100 + 0.999999), 1)
+            seen = 0
+            for index in sorted(self._counts):
+                seen += self._counts[index]
+                if seen >= target:
+                    return min(_bucket_upper(index) / 1_000_000, self.max)
+            return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) * 1000, 3),
+            "p90_ms": round(self.percentile(90) * 1000, 3),
+            "p99_ms": round(self.percentile(99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class Tracer:
+    """이름 + 라벨별 지연 시간 히스토그램 모음
+
+    agent   : BaseAgent.process / process_async 호출 (agent 라벨)
+    query   : 질문 유형별 전체 처리 시간 (type 라벨)
+    stage   : 파싱/데이터 수집/요약/포맷 단계 (stage 라벨)
+    upstream: DART, yfinance, HyperCLOVA 등 외부 호출 (service 라벨)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], LatencyHistogram] = {}
+
+    def histogram(self, name: str, **labels) -> LatencyHistogram:
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+        return histogram
+
+    def observe(self, name: str, seconds: float, **labels):
+        self.histogram(name, **labels).record(seconds)
+
+    @contextmanager
+    def span(self, name: str, **labels):
+        """블록 실행 시간을 기록 (예외가 나도 기록)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def _items(self):
+        with self._lock:
+            return sorted(self._histograms.items())
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def to_json(self) -> Dict[str, List[Dict[str, Any]]]:
+        """{이름: [{"labels": {...}, count, mean_ms, p50_ms, ...}]}"""
+        result: Dict[str, List[Dict[str, Any]]] = {}
+        for (name, labels), histogram in self._items():
+            result.setdefault(name, []).append({"labels": dict(labels), **histogram.snapshot()})
+        return result
+
+    def to_prometheus(self) -> str:
+        """Prometheus 텍스트 형식 (summary 타입)"""
+        lines = []
+        by_name: Dict[str, list] = {}
+        for (name, labels), histogram in self._items():
+            by_name.setdefault(name, []).append((labels, histogram))
+
+        for name, entries in by_name.items():
+            metric = f"{METRIC_PREFIX}_{name}_latency_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            for labels, histogram in entries:
+                base = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                for quantile in EXPORT_QUANTILES:
+                    label_text = f'{base},quantile="{quantile}"' if base else f'quantile="{quantile}"'
+                    lines.append(f"{metric}{{{label_text}}} {histogram.percentile(quantile * 100):.6f}")
+                suffix = f"{{{base}}}" if base else ""
+                lines.append(f"{metric}_sum{suffix} {histogram.total:.6f}")
+                lines.append(f"{metric}_count{suffix} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+tracer = Tracer()
+
+
+def span(name: str, **labels):
+    """전역 tracer 의 span"""
+    return tracer.span(name, **labels)
+
+
+def traced_process(method: Callable) -> Callable:
+    """BaseAgent.process / process_async 를 agent 히스토그램에 기록하도록 감쌈"""
+    if getattr(method, "_traced", False):
+        return method
+
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            with tracer.span("agent", agent=self.name):
+                return await method(self, *args, **kwargs)
+    else:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with tracer.span("agent", agent=self.name):
+                return method(self, *args, **kwargs)
+
+    wrapper._traced = True
+    return wrapper
+
+
+def latency_summary(name: str, label: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """REPL 상태 출력용 [(라벨 값, snapshot)]"""
+    return [(entry["labels"].get(label, ""), entry) for entry in tracer.to_json().get(name, [])]